@@ -5,6 +5,7 @@ import fastapi.responses
 import sqlalchemy.ext.asyncio
 
 import app.auth.dependencies
+import app.core.http_cache
 import app.core.security
 import app.db.session
 import app.domains.commerce.models as models
@@ -67,15 +68,24 @@ async def download_book_one_pdf(
         app.auth.dependencies.require_owner
     ),
     session: sqlalchemy.ext.asyncio.AsyncSession = fastapi.Depends(app.db.session.get_session),
-) -> fastapi.responses.FileResponse:
+) -> fastapi.Response:
     if not await service.has_entitlement(session, owner):
         raise fastapi.HTTPException(status_code=403, detail="Purchase required.")
     path = service.pdf_path()
     if not path.is_file():
         raise fastapi.HTTPException(status_code=503, detail="Digital edition is unavailable.")
+    # The browser may keep its copy but must ask again, so the entitlement is
+    # checked on every read; a current copy costs a 304. FileResponse serves
+    # Range and If-Range against the same content-hash ETag.
+    headers: dict[str, str] = {
+        "ETag": await service.pdf_etag(path),
+        "Cache-Control": "private, no-cache",
+    }
+    if app.core.http_cache.etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return fastapi.Response(status_code=304, headers=headers)
     return fastapi.responses.FileResponse(
         path,
         media_type="application/pdf",
         filename="Digital-Organism-Theory-Book-One-Digital-Edition.pdf",
-        headers={"Cache-Control": "private, no-store"},
+        headers=headers,
     )
@@ -1,14 +1,19 @@
+import collections.abc
+import json
 import typing
 from datetime import datetime
 
 import fastapi
 import sqlalchemy.ext.asyncio
+from fastapi.responses import StreamingResponse
 
 import app.auth.dependencies
+import app.core.http_cache
 import app.db.session
 import app.domains.graph.profile
 import app.domains.graph.schemas
 import app.domains.graph.service
+import app.domains.graph.traversal
 from app.db.models import FootprintAccount, FootprintEdge, FootprintImport, FootprintNode
 
 router = fastapi.APIRouter(
@@ -25,12 +30,18 @@ public_router = fastapi.APIRouter(prefix="/v1/graph", tags=["graph"])
 
 @public_router.get("/profile", response_model=app.domains.graph.schemas.ProfileGraphRead)
 async def get_profile_graph(
+    request: fastapi.Request,
     owner_id: typing.Annotated[str, fastapi.Query(min_length=1, max_length=128)],
     session: sqlalchemy.ext.asyncio.AsyncSession = fastapi.Depends(app.db.session.get_session),
-) -> app.domains.graph.schemas.ProfileGraphRead:
-    graph, updated_at = await app.domains.graph.profile.read_profile_graph(session, owner_id)
-    return app.domains.graph.schemas.ProfileGraphRead(
-        owner_id=owner_id, graph=graph, updated_at=updated_at
+) -> fastapi.Response:
+    document = await app.domains.graph.profile.read_profile_document(session, owner_id)
+    # Edits should show within a minute; the ETag makes each revalidation cheap.
+    return app.core.http_cache.conditional_response(
+        request,
+        document.body,
+        etag=document.etag,
+        media_type="application/json",
+        cache_control="public, max-age=60, stale-while-revalidate=300",
     )
 
 
@@ -87,6 +98,36 @@ async def create_node(
     return await app.domains.graph.service.create_node(session, owner, payload)
 
 
+@router.get(
+    "/nodes/{node_id}/neighbourhood",
+    response_model=app.domains.graph.schemas.FootprintNeighbourhood,
+)
+async def get_neighbourhood(
+    node_id: str,
+    depth: typing.Annotated[int, fastapi.Query(ge=1, le=app.domains.graph.traversal.MAX_DEPTH)] = 2,
+    direction: app.domains.graph.traversal.Direction = "both",
+    relation: typing.Annotated[list[str] | None, fastapi.Query(max_length=16)] = None,
+    visibility: typing.Annotated[list[str] | None, fastapi.Query(max_length=8)] = None,
+    node_limit: typing.Annotated[
+        int, fastapi.Query(ge=1, le=app.domains.graph.traversal.MAX_NODES)
+    ] = 200,
+    owner: app.auth.dependencies.OwnerContext = fastapi.Depends(
+        app.auth.dependencies.require_owner
+    ),
+    session: sqlalchemy.ext.asyncio.AsyncSession = fastapi.Depends(app.db.session.get_session),
+) -> app.domains.graph.schemas.FootprintNeighbourhood:
+    return await app.domains.graph.service.get_neighbourhood(
+        session,
+        owner,
+        node_id,
+        depth=depth,
+        direction=direction,
+        relations=relation or (),
+        visibilities=visibility or (),
+        node_limit=node_limit,
+    )
+
+
 @router.post("/edges", response_model=app.domains.graph.schemas.FootprintEdgeRead, status_code=201)
 async def create_edge(
     payload: app.domains.graph.schemas.FootprintEdgeCreate,
@@ -173,8 +214,8 @@ async def get_snapshot(
     platform: typing.Annotated[str | None, fastapi.Query(max_length=64)] = None,
     kind: typing.Annotated[str | None, fastapi.Query(max_length=64)] = None,
     relation: typing.Annotated[str | None, fastapi.Query(max_length=64)] = None,
+    cursor: typing.Annotated[str | None, fastapi.Query(max_length=512)] = None,
     node_limit: typing.Annotated[int, fastapi.Query(ge=1, le=1000)] = 250,
-    edge_limit: typing.Annotated[int, fastapi.Query(ge=1, le=2000)] = 500,
     owner: app.auth.dependencies.OwnerContext = fastapi.Depends(
         app.auth.dependencies.require_owner
     ),
@@ -186,6 +227,45 @@ async def get_snapshot(
         platform=platform,
         kind=kind,
         relation=relation,
+        cursor=cursor,
         node_limit=node_limit,
-        edge_limit=edge_limit,
     )
+
+
+@router.get("/snapshot/stream")
+async def stream_snapshot(
+    platform: typing.Annotated[str | None, fastapi.Query(max_length=64)] = None,
+    kind: typing.Annotated[str | None, fastapi.Query(max_length=64)] = None,
+    relation: typing.Annotated[str | None, fastapi.Query(max_length=64)] = None,
+    owner: app.auth.dependencies.OwnerContext = fastapi.Depends(
+        app.auth.dependencies.require_owner
+    ),
+    session: sqlalchemy.ext.asyncio.AsyncSession = fastapi.Depends(app.db.session.get_session),
+) -> StreamingResponse:
+    """The whole graph as NDJSON, one record per line, read a page at a time.
+
+    Lines are `{"type": "account" | "node" | "edge", "data": {...}}`, in page
+    order, then `{"type": "end", "nodes": n, "edges": m}`. A stream without the
+    end line was cut short.
+
+    The generator reads through the request's session after this returns; it
+    stays open until the body is sent (FastAPI 0.118+, see requirements.txt).
+    """
+
+    async def lines() -> collections.abc.AsyncIterator[str]:
+        counts: dict[str, int] = {"nodes": 0, "edges": 0}
+        async for page in app.domains.graph.service.iter_snapshot(
+            session, owner, platform=platform, kind=kind, relation=relation
+        ):
+            for record_type, records in (
+                ("account", page.accounts),
+                ("node", page.nodes),
+                ("edge", page.edges),
+            ):
+                for record in records:
+                    yield f'{{"type":"{record_type}","data":{record.model_dump_json()}}}\n'
+            counts["nodes"] += len(page.nodes)
+            counts["edges"] += len(page.edges)
+        yield json.dumps({"type": "end", **counts}) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
@@ -0,0 +1,14 @@
+from app.core.metrics import create_metrics_router
+from app.db.session import engine
+from app.settings import get_settings
+
+#: Environments where `/metrics` may be scraped without METRICS_TOKEN.
+LOCAL_ENVIRONMENTS: frozenset[str] = frozenset({"development", "local"})
+
+settings = get_settings()
+router = create_metrics_router(
+    pool=lambda: engine.pool,
+    redis_url=settings.REDIS_URL,
+    token=settings.METRICS_TOKEN,
+    open_without_token=settings.ENVIRONMENT in LOCAL_ENVIRONMENTS,
+)
@@ -1,19 +1,19 @@
-import json as _json
+import collections.abc
 import typing
-import xml.etree.ElementTree as _ET
 
 import fastapi
 import fastapi.responses
 import sqlalchemy.ext.asyncio
 
 import app.auth.dependencies
-import app.core.config
+import app.core.http_cache
 import app.core.security
 import app.db.models
 import app.db.session
 import app.domains.publication
 import app.domains.publication.schemas
 import app.domains.publication.service
+import app.domains.publication.sitemap
 import app.integrations.object_store
 
 router = fastapi.APIRouter(
@@ -40,68 +40,184 @@ async def get_public_delivery_manifest(
     version: typing.Annotated[int | None, fastapi.Query(ge=1)] = None,
     session: sqlalchemy.ext.asyncio.AsyncSession = fastapi.Depends(app.db.session.get_session),
 ) -> fastapi.Response:
-    data: dict[
-        str, typing.Any
-    ] = await app.domains.publication.service.get_public_delivery_manifest(
+    manifest = await app.domains.publication.service.get_public_delivery_manifest(
         session, owner_id, project_slug, version
     )
-    # Immutable manifests are versioned; cache 1 h at edge, 24 h in CDN.
-    cache = "public, max-age=3600, s-maxage=86400, stale-while-revalidate=3600"
-    return fastapi.Response(
-        content=_json.dumps(data),
+    # A pinned version never changes; "latest" moves when the member releases.
+    cache: str = (
+        "public, max-age=86400, immutable"
+        if version is not None
+        else "public, max-age=300, s-maxage=3600, stale-while-revalidate=3600"
+    )
+    return app.core.http_cache.conditional_response(
+        request,
+        manifest.body,
+        etag=manifest.etag,
         media_type="application/json",
-        headers={"Cache-Control": cache, "Vary": "Accept-Encoding"},
+        cache_control=cache,
+        headers={"Vary": "Accept-Encoding"},
     )
 
 
+def _release_body_etag(body_key: str, coding: str | None = None) -> str:
+    """Release objects never change, so the tag needs no read of the bytes.
+
+    A blob's key is its content hash; an older per-release key is hashed
+    itself, which is as stable. Each coding is its own representation.
+    """
+
+    tag: str = (
+        body_key.removeprefix("releases/blobs/").removesuffix(".md")
+        if body_key.startswith("releases/blobs/")
+        else app.core.http_cache.strong_etag(body_key.encode()).strip('"')
+    )
+    return f'"{tag}-{coding}"' if coding else f'"{tag}"'
+
+
+async def _opened(
+    chunks: collections.abc.AsyncIterator[bytes],
+) -> collections.abc.AsyncIterator[bytes]:
+    """Read the first chunk now, so a missing object is a 404, not a cut stream."""
+
+    first: bytes = await anext(chunks, b"")
+
+    async def rest() -> collections.abc.AsyncIterator[bytes]:
+        yield first
+        async for chunk in chunks:
+            yield chunk
+
+    return rest()
+
+
 @public_router.get("/delivery/body/{body_key:path}", include_in_schema=False)
 @_limiter.limit("120/minute")
 async def get_public_section_body(
     request: fastapi.Request,
     body_key: str,
 ) -> fastapi.Response:
+    """Stream a released body: revalidated without a read, ranged, or precompressed.
+
+    A conditional request is answered from the key alone. A range is served
+    from the original bytes; otherwise the best stored coding the client
+    accepts is sent, falling back to the original when a release predates them.
+    """
+
     # Only serve keys under the releases/ namespace to prevent path traversal.
-    if not body_key.startswith("releases/") or ".." in body_key:
+    if (
+        not body_key.startswith("releases/")
+        or ".." in body_key
+        or body_key.endswith(tuple(app.core.http_cache.ENCODING_SUFFIXES.values()))
+    ):
         raise fastapi.HTTPException(status_code=404, detail="Not found.")
+    etag: str = _release_body_etag(body_key)
+    headers: dict[str, str] = {
+        "Cache-Control": "public, max-age=86400, immutable",
+        "Accept-Ranges": "bytes",
+        "Vary": "Accept-Encoding",
+    }
+    range_header: str | None = request.headers.get("range")
+    if_range: str | None = request.headers.get("if-range")
+    if if_range is not None and if_range.strip() != etag:
+        range_header = None
+    codings: list[str] = (
+        []
+        if range_header
+        else app.core.http_cache.accepted_encodings(request.headers.get("accept-encoding"))
+    )
+
+    if_none_match: str | None = request.headers.get("if-none-match")
+    for tag in [etag, *(_release_body_etag(body_key, coding) for coding in codings)]:
+        if app.core.http_cache.etag_matches(if_none_match, tag):
+            return fastapi.Response(status_code=304, headers={**headers, "ETag": tag})
+
+    store = app.integrations.object_store.get_object_store()
+    media_type: str = "text/plain; charset=utf-8"
     try:
-        text: str = await app.integrations.object_store.get_object_store().get_text(body_key)
+        for coding in codings:
+            try:
+                chunks = await _opened(
+                    store.get_stream(body_key + app.core.http_cache.ENCODING_SUFFIXES[coding])
+                )
+            except app.integrations.object_store.ObjectNotFoundError:
+                continue
+            return fastapi.responses.StreamingResponse(
+                chunks,
+                media_type=media_type,
+                headers={
+                    **headers,
+                    "ETag": _release_body_etag(body_key, coding),
+                    "Content-Encoding": coding,
+                },
+            )
+        if range_header:
+            size: int = await store.size(body_key)
+            try:
+                span = app.core.http_cache.byte_range(range_header, size)
+            except app.core.http_cache.RangeNotSatisfiableError:
+                return fastapi.Response(
+                    status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"}
+                )
+            if span is not None:
+                first, last = span
+                return fastapi.responses.StreamingResponse(
+                    await _opened(
+                        store.get_stream(body_key, offset=first, length=last - first + 1)
+                    ),
+                    status_code=206,
+                    media_type=media_type,
+                    headers={
+                        **headers,
+                        "ETag": etag,
+                        "Content-Range": f"bytes {first}-{last}/{size}",
+                        "Content-Length": str(last - first + 1),
+                    },
+                )
+        return fastapi.responses.StreamingResponse(
+            await _opened(store.get_stream(body_key)),
+            media_type=media_type,
+            headers={**headers, "ETag": etag},
+        )
     except app.integrations.object_store.ObjectNotFoundError:
         raise fastapi.HTTPException(status_code=404, detail="Body not found.") from None
     except app.integrations.object_store.ObjectStoreError as exc:
         raise fastapi.HTTPException(status_code=503, detail="Body could not be read.") from exc
-    return fastapi.Response(
-        content=text,
-        media_type="text/plain; charset=utf-8",
-        headers={"Cache-Control": "public, max-age=86400, immutable"},
+
+
+async def _sitemap_response(request: fastapi.Request, key: str) -> fastapi.Response:
+    """The stored sitemap document, gzipped for crawlers that accept it."""
+
+    headers: dict[str, str] = {"Vary": "Accept-Encoding"}
+    document: app.domains.publication.sitemap.SitemapDocument | None = None
+    if "gzip" in app.core.http_cache.accepted_encodings(request.headers.get("accept-encoding")):
+        document = await app.domains.publication.sitemap.read(key, "gzip")
+        if document is not None:
+            headers["Content-Encoding"] = "gzip"
+    if document is None:
+        document = await app.domains.publication.sitemap.read(key)
+    if document is None:
+        if key != app.domains.publication.sitemap.SITEMAP_KEY:
+            raise fastapi.HTTPException(status_code=404, detail="Not found.")
+        document = app.domains.publication.sitemap.empty()
+    return app.core.http_cache.conditional_response(
+        request,
+        document.body,
+        etag=document.etag,
+        media_type="application/xml",
+        cache_control="public, max-age=3600, s-maxage=86400",
+        headers=headers,
     )
 
 
 @public_router.get("/sitemap.xml", include_in_schema=False)
-async def sitemap(
-    session: sqlalchemy.ext.asyncio.AsyncSession = fastapi.Depends(app.db.session.get_session),
-    settings: app.core.config.Settings = fastapi.Depends(app.core.config.get_settings),
+async def sitemap(request: fastapi.Request) -> fastapi.Response:
+    return await _sitemap_response(request, app.domains.publication.sitemap.SITEMAP_KEY)
+
+
+@public_router.get("/sitemap-{number}.xml", include_in_schema=False)
+async def sitemap_shard(
+    request: fastapi.Request, number: typing.Annotated[int, fastapi.Path(ge=1)]
 ) -> fastapi.Response:
-    rows: list[
-        tuple[app.db.models.PublicationProject, app.db.models.PublicationRelease]
-    ] = await app.domains.publication.service.list_public_releases(session)
-    urlset: _ET.Element = _ET.Element("urlset", xmlns="http://www.sitemaps.org/schemas/sitemap/0.9")
-    base: str = settings.FRONTEND_URL.rstrip("/")
-    for project, release in rows:
-        url: _ET.Element = _ET.SubElement(urlset, "url")
-        _ET.SubElement(url, "loc").text = f"{base}/read/{project.owner_id}/{project.slug}"
-        if release.published_at:
-            _ET.SubElement(url, "lastmod").text = release.published_at.strftime("%Y-%m-%d")
-        _ET.SubElement(url, "changefreq").text = "monthly"
-        _ET.SubElement(url, "priority").text = "0.8"
-    xml_bytes: bytes = (
-        b'<?xml version="1.0" encoding="UTF-8"?>\n'
-        + _ET.tostring(urlset, encoding="unicode").encode()
-    )
-    return fastapi.Response(
-        content=xml_bytes,
-        media_type="application/xml",
-        headers={"Cache-Control": "public, max-age=3600, s-maxage=86400"},
-    )
+    return await _sitemap_response(request, app.domains.publication.sitemap.shard_key(number))
 
 
 @router.post(
@@ -4,6 +4,7 @@ import fastapi
 import sqlalchemy.ext.asyncio
 
 import app.auth.dependencies
+import app.core.http_cache
 import app.core.security
 import app.db.session
 import app.domains.sitecontent.schemas as schemas
@@ -40,8 +41,16 @@ async def require_steward(
 async def get_published_content(
     request: fastapi.Request,
     session: sqlalchemy.ext.asyncio.AsyncSession = fastapi.Depends(app.db.session.get_session),
-) -> schemas.SiteContentPublic:
-    return schemas.SiteContentPublic(blocks=await sitecontent_service.published_blocks(session))
+) -> fastapi.Response:
+    # A cached read never uses the session, and an unused session never connects.
+    document = await sitecontent_service.published_document(session)
+    return app.core.http_cache.conditional_response(
+        request,
+        document.body,
+        etag=document.etag,
+        media_type="application/json",
+        cache_control="public, max-age=60, stale-while-revalidate=300",
+    )
 
 
 @router.get("/drafts", response_model=schemas.SiteContentDrafts)
@@ -1,3 +1,5 @@
+import collections.abc
+import hashlib
 import re
 import typing
 import uuid
@@ -34,6 +36,12 @@ class UploadUrlRequest(pydantic.BaseModel):
 class UploadUrlResponse(pydantic.BaseModel):
     url: str
     key: str
+    #: Headers the PUT should carry. A presigned URL signs its content type.
+    headers: dict[str, str] = {}
+
+
+class UploadTooLargeError(Exception):
+    """The body streamed past `MAX_UPLOAD_BYTES`."""
 
 
 def _vault_prefix(owner_id: str) -> str:
@@ -64,9 +72,35 @@ async def generate_upload_url(
     file_id: str = uuid.uuid4().hex
     key: str = f"{_vault_prefix(owner.owner_id)}{file_id}" + (f".{ext}" if ext else "")
 
-    # Filesystem store has no presigned URLs, so uploads proxy back through this
-    # service. The S3 path should be swapped for a real presigned PUT.
-    return UploadUrlResponse(url=f"/api/v1/vault/upload/{key}", key=key)
+    # On S3 the bytes go straight to the bucket. The filesystem store has no
+    # URLs of its own, so there uploads stream back through this service.
+    store = app.integrations.object_store.get_object_store()
+    presigned: str | None = await store.presigned_put_url(
+        key, content_type=payload.content_type, size=payload.size
+    )
+    if presigned is not None:
+        return UploadUrlResponse(
+            url=presigned, key=key, headers={"Content-Type": payload.content_type}
+        )
+    return UploadUrlResponse(
+        url=f"/api/v1/vault/upload/{key}",
+        key=key,
+        headers={"Content-Type": "application/octet-stream"},
+    )
+
+
+async def _metered(
+    chunks: collections.abc.AsyncIterable[bytes], digest: typing.Any
+) -> collections.abc.AsyncIterator[bytes]:
+    """Pass chunks through, hashing them and stopping at the size cap."""
+
+    size: int = 0
+    async for chunk in chunks:
+        size += len(chunk)
+        if size > MAX_UPLOAD_BYTES:
+            raise UploadTooLargeError
+        digest.update(chunk)
+        yield chunk
 
 
 @router.put("/upload/{key:path}")
@@ -76,7 +110,14 @@ async def upload_file(
     owner: app.auth.dependencies.OwnerContext = fastapi.Depends(
         app.auth.dependencies.require_owner
     ),
+    session: sqlalchemy.ext.asyncio.AsyncSession = fastapi.Depends(app.db.session.get_session),
 ) -> dict[str, str]:
+    """Stream the body into the store, never holding more than a chunk of it.
+
+    The cap is enforced as bytes arrive, since a chunked body declares no
+    length, and the SHA-256 taken on the way is kept for ingest.
+    """
+
     app.auth.dependencies.ensure_write_scope(owner)
     safe_key: str = _require_own_key(key, owner)
 
@@ -84,16 +125,32 @@ async def upload_file(
     if declared.isdigit() and int(declared) > MAX_UPLOAD_BYTES:
         raise fastapi.HTTPException(status_code=413, detail="Upload exceeds the size limit.")
 
-    body: bytes = await request.body()
-    if len(body) > MAX_UPLOAD_BYTES:
-        raise fastapi.HTTPException(status_code=413, detail="Upload exceeds the size limit.")
-
     store: (
         app.integrations.object_store.FilesystemObjectStore
         | app.integrations.object_store.S3ObjectStore
     ) = app.integrations.object_store.get_object_store()
-    await store.put_bytes(safe_key, body)
-    return {"key": safe_key}
+    digest = hashlib.sha256()
+    content_type: str = request.headers.get("content-type", "")
+    try:
+        size: int = await store.put_stream(
+            safe_key,
+            _metered(request.stream(), digest),
+            content_type=content_type or "application/octet-stream",
+        )
+    except UploadTooLargeError as exc:
+        raise fastapi.HTTPException(
+            status_code=413, detail="Upload exceeds the size limit."
+        ) from exc
+
+    await app.domains.knowledge.service.record_upload(
+        session,
+        owner,
+        object_store_key=safe_key,
+        size_bytes=size,
+        upload_sha256=digest.hexdigest(),
+    )
+    await session.commit()
+    return {"key": safe_key, "sha256": digest.hexdigest()}
 
 
 class RegisterNodeRequest(pydantic.BaseModel):
@@ -6,8 +6,7 @@ from typing import Any
 from fastapi import FastAPI, Request, status
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
-from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 logger = logging.getLogger("dot_orchestrator.errors")
 
@@ -86,23 +85,41 @@ def _serialisable_errors(errors: list[Any]) -> list[dict[str, Any]]:
     return cleaned
 
 
-class UnhandledExceptionMiddleware(BaseHTTPMiddleware):
-    """Return a stable response before outer CORS and header middleware run."""
+class UnhandledExceptionMiddleware:
+    """Return a stable response before outer CORS and header middleware run.
+
+    Once a response has started — a stream that fails midway — its status is
+    already on the wire, so the error is logged and re-raised to end it.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app: ASGIApp = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started: bool = False
+
+        async def send_tracking_start(message: Message) -> None:
+            nonlocal started
+            if message["type"] == "http.response.start":
+                started = True
+            await send(message)
 
-    async def dispatch(
-        self,
-        request: Request,
-        call_next: RequestResponseEndpoint,
-    ) -> Response:
         try:
-            return await call_next(request)
+            await self.app(scope, receive, send_tracking_start)
         except Exception:
-            logger.exception("Unhandled request error", extra={"path": request.url.path})
-            return _error_json(
+            logger.exception("Unhandled request error", extra={"path": scope.get("path", "")})
+            if started:
+                raise
+            response: JSONResponse = _error_json(
                 status.HTTP_500_INTERNAL_SERVER_ERROR,
                 "INTERNAL_ERROR",
                 "An unexpected error occurred",
             )
+            await response(scope, receive, send)
 
 
 def install_error_handlers(app: FastAPI) -> None:
@@ -0,0 +1,130 @@
+"""Validators for public responses that are read far more often than they change.
+
+Such bodies are kept serialized, and their ETag is a hash of those bytes: two
+processes holding the same content agree on the tag without coordinating, and
+changed content can never keep an old one. A client that already has the
+current body gets a bodiless 304.
+
+Immutable objects served from the object store also get their compressed
+codings stored beside them (`precompress`), so no request pays for
+compression, and a byte range so an interrupted read resumes where it stopped.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+
+import fastapi
+
+try:  # pragma: no cover - exercised only when the optional dependency is installed
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None  # type: ignore[assignment]
+
+#: Codings stored beside an original, keyed by the suffix added to its key, in
+#: order of preference when a client accepts several.
+ENCODING_SUFFIXES: dict[str, str] = {"br": ".br", "gzip": ".gz"}
+
+
+class RangeNotSatisfiableError(ValueError):
+    """The requested range starts past the end of the body."""
+
+
+def strong_etag(body: bytes) -> str:
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """`If-None-Match` uses the weak comparison (RFC 9110 §13.1.2)."""
+
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        candidate.strip().removeprefix("W/") == etag for candidate in if_none_match.split(",")
+    )
+
+
+def conditional_response(
+    request: fastapi.Request,
+    body: bytes,
+    *,
+    etag: str,
+    media_type: str,
+    cache_control: str,
+    headers: dict[str, str] | None = None,
+) -> fastapi.Response:
+    """The body, or a 304 when the client's copy is current. Both carry the validators."""
+
+    validators: dict[str, str] = {"ETag": etag, "Cache-Control": cache_control, **(headers or {})}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return fastapi.Response(status_code=304, headers=validators)
+    return fastapi.Response(content=body, media_type=media_type, headers=validators)
+
+
+def precompress(body: bytes) -> dict[str, bytes]:
+    """Every stored coding of `body` this process can produce, at full effort.
+
+    Done once per immutable object, so the slowest, smallest settings pay off.
+    Brotli is optional; without it only gzip is stored.
+    """
+
+    encoded: dict[str, bytes] = {"gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        encoded["br"] = brotli.compress(body, quality=11)
+    return encoded
+
+
+def accepted_encodings(accept_encoding: str | None) -> list[str]:
+    """Stored codings the client accepts, best first: its weights, then ours."""
+
+    weights: dict[str, float] = {}
+    for entry in (accept_encoding or "").split(","):
+        coding, _, params = entry.strip().partition(";")
+        weight: float = 1.0
+        name, _, value = params.strip().partition("=")
+        if name.strip().lower() == "q":
+            try:
+                weight = float(value)
+            except ValueError:
+                continue
+        weights[coding.strip().lower()] = weight
+    preference: list[str] = list(ENCODING_SUFFIXES)
+    accepted: list[str] = [
+        coding for coding in preference if weights.get(coding, weights.get("*", 0.0)) > 0
+    ]
+    return sorted(
+        accepted,
+        key=lambda coding: (-weights.get(coding, weights.get("*", 0.0)), preference.index(coding)),
+    )
+
+
+def byte_range(range_header: str | None, size: int) -> tuple[int, int] | None:
+    """The one `bytes=` range asked for, as (first, last) inclusive, or None for all.
+
+    Several ranges, other units and malformed headers get the whole body, which
+    RFC 9110 §14.2 allows; a range starting past the end cannot be served.
+    """
+
+    if not range_header or not range_header.startswith("bytes=") or "," in range_header:
+        return None
+    first_text, separator, last_text = range_header.removeprefix("bytes=").strip().partition("-")
+    if not separator or not (first_text or last_text):
+        return None
+    if not (first_text or "0").isdigit() or not (last_text or "0").isdigit():
+        return None
+    if not first_text:
+        # A suffix: the last N bytes.
+        suffix: int = int(last_text)
+        if suffix == 0 or size == 0:
+            raise RangeNotSatisfiableError(range_header)
+        return max(size - suffix, 0), size - 1
+    first: int = int(first_text)
+    last: int = min(int(last_text), size - 1) if last_text else size - 1
+    if first >= size:
+        raise RangeNotSatisfiableError(range_header)
+    if last < first:
+        return None
+    return first, last
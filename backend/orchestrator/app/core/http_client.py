@@ -2,11 +2,15 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import random
+import socket
 import time
+from collections.abc import Awaitable, Callable
 from enum import Enum
 from typing import Any
 from urllib.parse import urlparse
 
+import httpcore
 import httpx
 
 logger = logging.getLogger("dot_orchestrator.http")
@@ -60,12 +64,128 @@ _breakers: dict[str, CircuitBreaker] = {}
 _RETRYABLE_STATUS_CODES = {429, 502, 503, 504}
 
 
+AddrInfo = list[tuple[Any, ...]]
+Resolver = Callable[[str, int], Awaitable[AddrInfo]]
+
+
+class BlockedAddressError(Exception):
+    def __init__(self, host: str) -> None:
+        super().__init__(f"{host} resolves to a blocked address")
+        self.host = host
+
+
+async def _getaddrinfo(host: str, port: int) -> AddrInfo:
+    return await asyncio.to_thread(socket.getaddrinfo, host, port, type=socket.SOCK_STREAM)
+
+
+class DnsCache:
+    """Vetted resolutions, reused for `ttl` seconds.
+
+    A host is rejected when any address it resolves to fails `allow`, so the
+    answer cached is always one that passed. Failures are not cached. The cache
+    holds no loop-bound state and can be shared by every client in the process.
+    """
+
+    def __init__(
+        self,
+        allow: Callable[[str], bool],
+        *,
+        ttl: float = 60.0,
+        max_entries: int = 1024,
+        resolver: Resolver = _getaddrinfo,
+    ) -> None:
+        self.allow = allow
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.resolver = resolver
+        self._entries: dict[tuple[str, int], tuple[float, tuple[str, ...]]] = {}
+
+    async def resolve(self, host: str, port: int) -> tuple[str, ...]:
+        key = (host.lower(), port)
+        cached = self._entries.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+
+        addresses = tuple(dict.fromkeys(info[4][0] for info in await self.resolver(host, port)))
+        if not addresses or not all(self.allow(address) for address in addresses):
+            raise BlockedAddressError(host)
+        if len(self._entries) >= self.max_entries:
+            self._entries.pop(next(iter(self._entries)))
+        self._entries[key] = (time.monotonic() + self.ttl, addresses)
+        return addresses
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class _PinnedBackend(httpcore.AsyncNetworkBackend):
+    """Connects to the addresses `DnsCache` vetted, never to a fresh lookup.
+
+    TLS still runs against the hostname, and the pool is still keyed by it, so
+    certificates and keep-alive behave as they would without pinning.
+    """
+
+    def __init__(self, dns: DnsCache) -> None:
+        self._dns = dns
+        self._backend = httpcore.AnyIOBackend()
+
+    async def connect_tcp(
+        self,
+        host: str,
+        port: int,
+        timeout: float | None = None,
+        local_address: str | None = None,
+        socket_options: Any = None,
+    ) -> httpcore.AsyncNetworkStream:
+        try:
+            addresses = await self._dns.resolve(host, port)
+        except socket.gaierror as exc:
+            raise httpcore.ConnectError(str(exc)) from exc
+        last_exc: Exception | None = None
+        for address in addresses:
+            try:
+                return await self._backend.connect_tcp(
+                    address,
+                    port,
+                    timeout=timeout,
+                    local_address=local_address,
+                    socket_options=socket_options,
+                )
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as exc:
+                last_exc = exc
+        assert last_exc is not None
+        raise last_exc
+
+    async def connect_unix_socket(self, *args: Any, **kwargs: Any) -> httpcore.AsyncNetworkStream:
+        raise httpcore.ConnectError("Pinned clients do not open unix sockets.")
+
+    async def sleep(self, seconds: float) -> None:
+        await self._backend.sleep(seconds)
+
+
+class PinnedTransport(httpx.AsyncHTTPTransport):
+    """An HTTP transport whose connections go only to `DnsCache`-vetted addresses."""
+
+    def __init__(self, dns: DnsCache, *, limits: httpx.Limits) -> None:
+        super().__init__(limits=limits, trust_env=False)
+        # httpx has no hook for the network backend, so the pool it built is
+        # replaced with an identical one that connects through the cache.
+        self._pool = httpcore.AsyncConnectionPool(
+            ssl_context=httpx.create_ssl_context(),
+            max_connections=limits.max_connections,
+            max_keepalive_connections=limits.max_keepalive_connections,
+            keepalive_expiry=limits.keepalive_expiry,
+            network_backend=_PinnedBackend(dns),
+        )
+
+
 def create_service_client(
     service_name: str,
     *,
     base_url: str | None = None,
     timeout: float = 30.0,
     max_connections: int = 100,
+    transport: httpx.AsyncBaseTransport | None = None,
 ) -> httpx.AsyncClient:
     headers = {"User-Agent": f"{service_name}/0.1.0"}
     return httpx.AsyncClient(
@@ -73,10 +193,13 @@ def create_service_client(
         timeout=timeout,
         limits=httpx.Limits(max_connections=max_connections),
         headers=headers,
+        transport=transport,
     )
 
 
-def _extract_host(url: str) -> str:
+def extract_host(url: str) -> str:
+    """The key breakers are held under, and that per-host limits elsewhere share."""
+
     parsed = urlparse(url)
     return parsed.netloc or parsed.hostname or url
 
@@ -87,6 +210,20 @@ def _breaker_for(host: str) -> CircuitBreaker:
     return _breakers[host]
 
 
+def breaker_counts() -> dict[CircuitState, int]:
+    """How many breakers are in each state, without saying which hosts they guard."""
+
+    counts: dict[CircuitState, int] = dict.fromkeys(CircuitState, 0)
+    for breaker in _breakers.values():
+        counts[breaker.state] += 1
+    return counts
+
+
+def _backoff(attempt: int, base: float, cap: float) -> float:
+    # Full jitter: clients that failed together do not retry together.
+    return random.uniform(0, min(base * (2**attempt), cap))
+
+
 async def resilient_request(
     client: httpx.AsyncClient,
     method: str,
@@ -95,9 +232,16 @@ async def resilient_request(
     max_retries: int = 3,
     backoff_base: float = 0.5,
     backoff_max: float = 8.0,
+    stream: bool = False,
     **kwargs: Any,
 ) -> httpx.Response:
-    host = _extract_host(url)
+    """Send with retries and a per-host breaker.
+
+    With `stream=True` the body is left unread and the caller must close the
+    response; retried responses are closed here.
+    """
+
+    host = extract_host(url)
     breaker = _breaker_for(host)
     if not breaker.allow_request:
         raise CircuitOpenError(host)
@@ -105,11 +249,12 @@ async def resilient_request(
     last_exc: Exception | None = None
     for attempt in range(max_retries + 1):
         try:
-            response = await client.request(method, url, **kwargs)
+            response = await client.send(client.build_request(method, url, **kwargs), stream=stream)
             if response.status_code in _RETRYABLE_STATUS_CODES:
                 breaker.record_failure()
                 if attempt < max_retries:
-                    await asyncio.sleep(min(backoff_base * (2**attempt), backoff_max))
+                    await response.aclose()
+                    await asyncio.sleep(_backoff(attempt, backoff_base, backoff_max))
                     continue
             else:
                 breaker.record_success()
@@ -118,7 +263,7 @@ async def resilient_request(
             breaker.record_failure()
             last_exc = exc
             if attempt < max_retries:
-                await asyncio.sleep(min(backoff_base * (2**attempt), backoff_max))
+                await asyncio.sleep(_backoff(attempt, backoff_base, backoff_max))
                 continue
             raise
 
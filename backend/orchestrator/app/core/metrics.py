@@ -0,0 +1,238 @@
+"""Prometheus metrics for capacity planning.
+
+Per-request cost is one histogram observation. Everything that describes state
+rather than events — the database pool, worker queue depth, circuit breakers —
+is read when `/metrics` is scraped, so it costs nothing between scrapes.
+
+Labels are route templates, codes, and outcome names only. No owner id, path
+parameter, or content ever becomes a label value (HKI-6).
+"""
+
+from __future__ import annotations
+
+import collections.abc
+import functools
+import hmac
+import logging
+import time
+import typing
+
+import prometheus_client
+import redis.asyncio
+from fastapi import APIRouter, Request, Response, status
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+import app.core.http_client
+
+logger = logging.getLogger("dot_orchestrator.metrics")
+
+#: A registry of our own, so rebuilding the app in tests never re-registers.
+REGISTRY = prometheus_client.CollectorRegistry(auto_describe=True)
+
+#: Dramatiq queues the workers consume. Depth is pending plus in-flight.
+WORKER_QUEUES: tuple[str, ...] = (
+    "footprint-imports",
+    "feed-scheduler",
+    "support-maintenance",
+    "publication-maintenance",
+    "orchestrator-smoke",
+)
+_QUEUE_NAMESPACE = "dramatiq"
+
+HTTP_REQUEST_SECONDS = prometheus_client.Histogram(
+    "dot_http_request_duration_seconds",
+    "Request latency by route template.",
+    ("method", "route", "status"),
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+    registry=REGISTRY,
+)
+TWIN_REFUSALS = prometheus_client.Counter(
+    "dot_twin_refusals_total",
+    "Twin answers refused, by refusal code.",
+    ("refusal_code",),
+    registry=REGISTRY,
+)
+CACHE_LOOKUPS = prometheus_client.Counter(
+    "dot_cache_lookups_total",
+    "In-process cache lookups. Hit ratio is hit / (hit + miss) per cache.",
+    ("cache", "result"),
+    registry=REGISTRY,
+)
+EMBEDDING_BATCH_SECONDS = prometheus_client.Histogram(
+    "dot_embedding_batch_duration_seconds",
+    "Latency of one embedding request, however many texts it carries.",
+    ("outcome",),
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+    registry=REGISTRY,
+)
+FOOTPRINT_IMPORT_SECONDS = prometheus_client.Histogram(
+    "dot_footprint_import_duration_seconds",
+    "Feed import processing time, from fetch to commit.",
+    ("outcome",),
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0),
+    registry=REGISTRY,
+)
+FEED_SYNC_LAG_SECONDS = prometheus_client.Histogram(
+    "dot_feed_sync_lag_seconds",
+    "How long a scheduled feed sync waited past its due time before it was enqueued.",
+    buckets=(1.0, 5.0, 15.0, 60.0, 300.0, 900.0, 1800.0, 3600.0, 7200.0),
+    registry=REGISTRY,
+)
+DB_POOL_CONNECTIONS = prometheus_client.Gauge(
+    "dot_db_pool_connections",
+    "Database pool connections by state, sampled at scrape time.",
+    ("state",),
+    registry=REGISTRY,
+)
+WORKER_QUEUE_DEPTH = prometheus_client.Gauge(
+    "dot_worker_queue_depth",
+    "Messages pending or in flight per worker queue, sampled at scrape time.",
+    ("queue",),
+    registry=REGISTRY,
+)
+# Breakers are keyed by member-supplied feed hosts, so they are counted by
+# state: a host label would be content, and unbounded.
+CIRCUIT_BREAKERS = prometheus_client.Gauge(
+    "dot_http_circuit_breakers",
+    "Outbound circuit breakers by state, sampled at scrape time.",
+    ("state",),
+    registry=REGISTRY,
+)
+
+_F = typing.TypeVar(
+    "_F", bound=collections.abc.Callable[..., collections.abc.Awaitable[typing.Any]]
+)
+
+
+def timed(histogram: prometheus_client.Histogram) -> collections.abc.Callable[[_F], _F]:
+    """Observe an async call's duration, labelled `ok` or `error` by outcome."""
+
+    def decorate(fn: _F) -> _F:
+        @functools.wraps(fn)
+        async def wrapper(*args: typing.Any, **kwargs: typing.Any) -> typing.Any:
+            started: float = time.perf_counter()
+            outcome: str = "error"
+            try:
+                result: typing.Any = await fn(*args, **kwargs)
+                outcome = "ok"
+                return result
+            finally:
+                histogram.labels(outcome).observe(time.perf_counter() - started)
+
+        return typing.cast(_F, wrapper)
+
+    return decorate
+
+
+def cache_lookup(cache: str, hit: bool) -> None:
+    CACHE_LOOKUPS.labels(cache, "hit" if hit else "miss").inc()
+
+
+def _status_class(code: int) -> str:
+    return f"{code // 100}xx" if code else "none"
+
+
+class MetricsMiddleware:
+    """Observe request latency per route template and status class."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app: ASGIApp = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code: int = 0
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        started: float = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route: typing.Any = scope.get("route")
+            # Unmatched paths collapse to one series so scanners cannot inflate
+            # cardinality with arbitrary URLs.
+            HTTP_REQUEST_SECONDS.labels(
+                scope.get("method", ""),
+                getattr(route, "path", None) or "unmatched",
+                _status_class(status_code),
+            ).observe(time.perf_counter() - started)
+
+
+def sample_pool(pool: typing.Any) -> None:
+    """Read pool occupancy. Pools without counters (SQLite's) report nothing."""
+
+    for state, reader in (
+        ("size", "size"),
+        ("checked_in", "checkedin"),
+        ("checked_out", "checkedout"),
+        ("overflow", "overflow"),
+    ):
+        method: typing.Any = getattr(pool, reader, None)
+        if callable(method):
+            DB_POOL_CONNECTIONS.labels(state).set(method())
+
+
+def sample_breakers() -> None:
+    for state, count in app.core.http_client.breaker_counts().items():
+        CIRCUIT_BREAKERS.labels(state.value).set(count)
+
+
+async def sample_queue_depth(redis_url: str) -> None:
+    """Depth per queue from the Dramatiq Redis layout. Skipped without Redis."""
+
+    if not redis_url.startswith(("redis://", "rediss://")):
+        return
+    client = redis.asyncio.Redis.from_url(redis_url, socket_timeout=1.0)
+    try:
+        for queue in WORKER_QUEUES:
+            depth: int = 0
+            for suffix in ("", ".DQ"):
+                depth += await client.hlen(f"{_QUEUE_NAMESPACE}:{queue}{suffix}.msgs")
+            WORKER_QUEUE_DEPTH.labels(queue).set(depth)
+    except (redis.RedisError, OSError):
+        # A scrape must not fail because the broker is briefly unreachable.
+        logger.warning("metrics.queue_depth_unavailable")
+    finally:
+        await client.aclose()
+
+
+def create_metrics_router(
+    *,
+    pool: collections.abc.Callable[[], typing.Any],
+    redis_url: str,
+    token: str = "",
+    open_without_token: bool = False,
+) -> APIRouter:
+    """Serve `/metrics` to holders of `token`.
+
+    Without a token the endpoint answers 404 unless `open_without_token` says
+    this is a local deployment, so a forgotten setting never publishes it.
+    """
+
+    router = APIRouter(tags=["health"])
+
+    @router.get("/metrics", include_in_schema=False)
+    async def metrics(request: Request) -> Response:
+        if token:
+            supplied: str = request.headers.get("authorization", "")
+            if not hmac.compare_digest(supplied, f"Bearer {token}"):
+                return Response(status_code=status.HTTP_401_UNAUTHORIZED)
+        elif not open_without_token:
+            return Response(status_code=status.HTTP_404_NOT_FOUND)
+
+        sample_pool(pool())
+        sample_breakers()
+        await sample_queue_depth(redis_url)
+        return Response(
+            prometheus_client.generate_latest(REGISTRY),
+            media_type=prometheus_client.CONTENT_TYPE_LATEST,
+        )
+
+    return router
@@ -2,11 +2,9 @@ from __future__ import annotations
 
 import contextvars
 import uuid
-from collections.abc import Callable
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 request_id_var: contextvars.ContextVar[str] = contextvars.ContextVar(
     "request_id",
@@ -16,15 +14,30 @@ request_id_var: contextvars.ContextVar[str] = contextvars.ContextVar(
 REQUEST_ID_HEADER = "X-Request-Id"
 
 
-class RequestIdMiddleware(BaseHTTPMiddleware):
-    """Propagate or generate a request ID for logs and client correlation."""
+class RequestIdMiddleware:
+    """Propagate or generate a request ID for logs and client correlation.
+
+    Pure ASGI, so the ID stays bound while a streaming body is still being
+    produced, and the response header is set on `http.response.start`.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app: ASGIApp = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id: str = Headers(scope=scope).get(REQUEST_ID_HEADER) or str(uuid.uuid4())
+
+        async def send_with_request_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)[REQUEST_ID_HEADER] = request_id
+            await send(message)
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        request_id = request.headers.get(REQUEST_ID_HEADER) or str(uuid.uuid4())
         token = request_id_var.set(request_id)
         try:
-            response: Response = await call_next(request)
+            await self.app(scope, receive, send_with_request_id)
         finally:
             request_id_var.reset(token)
-        response.headers[REQUEST_ID_HEADER] = request_id
-        return response
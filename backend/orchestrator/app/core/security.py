@@ -4,9 +4,8 @@ from __future__ import annotations
 
 import slowapi
 import slowapi.util
-import starlette.middleware.base
-import starlette.requests
-import starlette.responses
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 # ── Rate limiter (Redis-backed in prod; memory-backed in dev) ─────────────────
 
@@ -45,13 +44,22 @@ _SECURITY_HEADERS: dict[str, str] = {
 }
 
 
-class SecurityHeadersMiddleware(starlette.middleware.base.BaseHTTPMiddleware):
-    """Attach security headers to every response."""
+class SecurityHeadersMiddleware:
+    """Attach security headers to every response, streaming ones included."""
 
-    async def dispatch(
-        self, request: starlette.requests.Request, call_next: object
-    ) -> starlette.responses.Response:
-        response: starlette.responses.Response = await call_next(request)
-        for header, value in _SECURITY_HEADERS.items():
-            response.headers[header] = value
-        return response
+    def __init__(self, app: ASGIApp) -> None:
+        self.app: ASGIApp = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                for header, value in _SECURITY_HEADERS.items():
+                    headers[header] = value
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
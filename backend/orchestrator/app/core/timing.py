@@ -0,0 +1,195 @@
+"""Stage timings for the request pipeline.
+
+A request collects named durations as it runs; the middleware reports them once,
+as a `Server-Timing` header and one structured log line. Only stage names and
+milliseconds are recorded — never a question, a passage, or an id (HKI-6).
+
+Outside a request nothing collects, and `span` costs a context-variable lookup.
+When `OTEL_ENABLED` is set and OpenTelemetry is installed, each stage is also
+exported as a span under whatever trace is current.
+"""
+
+from __future__ import annotations
+
+import collections.abc
+import contextlib
+import contextvars
+import logging
+import re
+import time
+import typing
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:  # pragma: no cover - exercised only when the optional dep is installed
+    from opentelemetry import trace
+except ImportError:  # pragma: no cover
+    trace = None  # type: ignore[assignment]
+
+logger = logging.getLogger("dot_orchestrator.timing")
+
+SERVER_TIMING_HEADER = "Server-Timing"
+_TOKEN: re.Pattern[str] = re.compile(r"[^A-Za-z0-9_.-]")
+
+_tracer: typing.Any | None = None
+
+
+class Timings:
+    """Durations in milliseconds, summed per stage, in order of first completion."""
+
+    __slots__ = ("_stages",)
+
+    def __init__(self) -> None:
+        self._stages: dict[str, list[float]] = {}
+
+    def record(self, stage: str, elapsed_ms: float) -> None:
+        entry: list[float] | None = self._stages.get(stage)
+        if entry is None:
+            self._stages[stage] = [elapsed_ms, 1]
+        else:
+            entry[0] += elapsed_ms
+            entry[1] += 1
+
+    def __bool__(self) -> bool:
+        return bool(self._stages)
+
+    def durations(self) -> dict[str, float]:
+        return {stage: round(entry[0], 3) for stage, entry in self._stages.items()}
+
+    def counts(self) -> dict[str, int]:
+        return {stage: int(entry[1]) for stage, entry in self._stages.items()}
+
+    def header_value(self) -> str:
+        return ", ".join(
+            f"{_TOKEN.sub('_', stage)};dur={entry[0]:.1f}" for stage, entry in self._stages.items()
+        )
+
+
+_current: contextvars.ContextVar[Timings | None] = contextvars.ContextVar(
+    "stage_timings", default=None
+)
+
+
+def current() -> Timings | None:
+    return _current.get()
+
+
+@contextlib.contextmanager
+def collect() -> collections.abc.Iterator[Timings]:
+    """Collect spans recorded in this context. Used per request, and by benchmarks."""
+
+    timings = Timings()
+    token: contextvars.Token[Timings | None] = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        _current.reset(token)
+
+
+@contextlib.contextmanager
+def span(stage: str) -> collections.abc.Iterator[None]:
+    """Time one pipeline stage. Nested stages are each recorded in full."""
+
+    timings: Timings | None = _current.get()
+    if timings is None and _tracer is None:
+        yield
+        return
+
+    # Not made the current span: stages can straddle a `yield` in a streaming
+    # generator, and re-attaching OTel context across that boundary is fragile.
+    otel_span: typing.Any | None = _tracer.start_span(stage) if _tracer is not None else None
+    started: float = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed_ms: float = (time.perf_counter() - started) * 1000.0
+        if timings is not None:
+            timings.record(stage, elapsed_ms)
+        if otel_span is not None:
+            otel_span.end()
+
+
+def configure_tracing(enabled: bool, service_name: str) -> bool:
+    """Export stages as OpenTelemetry spans. Returns whether export is active.
+
+    The SDK and exporter are deployment choices; when they are installed an
+    OTLP exporter is registered here, and otherwise spans go to whatever tracer
+    provider the process was started with.
+    """
+
+    global _tracer
+    if not enabled:
+        _tracer = None
+        return False
+    if trace is None:
+        logger.warning("OTEL_ENABLED is set but opentelemetry is not installed")
+        _tracer = None
+        return False
+
+    try:  # pragma: no cover - depends on the deployment's optional packages
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+    except ImportError:
+        pass
+    else:  # pragma: no cover
+        if not isinstance(trace.get_tracer_provider(), TracerProvider):
+            provider = TracerProvider(resource=Resource.create({"service.name": service_name}))
+            provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+            trace.set_tracer_provider(provider)
+
+    _tracer = trace.get_tracer("dot_orchestrator.timing")
+    return True
+
+
+def _route_path(scope: Scope) -> str:
+    """The route template, never the concrete path, which can carry ids."""
+
+    route: typing.Any = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class ServerTimingMiddleware:
+    """Collect stage timings per request and report them without content.
+
+    Buffered responses carry a `Server-Timing` header. A streaming response has
+    already sent its headers when its stages run, so those timings reach the
+    log line only.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app: ASGIApp = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status: int = 0
+
+        async def send_with_timings(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if timings:
+                    MutableHeaders(scope=message).append(
+                        SERVER_TIMING_HEADER, timings.header_value()
+                    )
+            await send(message)
+
+        with collect() as timings:
+            try:
+                await self.app(scope, receive, send_with_timings)
+            finally:
+                if timings:
+                    logger.info(
+                        "request.timings",
+                        extra={
+                            "route": _route_path(scope),
+                            "method": scope.get("method", ""),
+                            "status": status,
+                            "timings_ms": timings.durations(),
+                        },
+                    )
@@ -292,6 +292,11 @@ class PublicationSection(Base, TimestampMixin):
     body_ref: sqlalchemy.orm.Mapped[str | None] = sqlalchemy.orm.mapped_column(
         sqlalchemy.String(512)
     )
+    #: Hash of the body at `body_ref` when the API stored it, so a release can
+    #: copy it to its content-addressed key without reading it back.
+    body_sha256: sqlalchemy.orm.Mapped[str | None] = sqlalchemy.orm.mapped_column(
+        sqlalchemy.String(64)
+    )
     status: sqlalchemy.orm.Mapped[str] = sqlalchemy.orm.mapped_column(
         sqlalchemy.String(32), index=True, nullable=False, default="draft"
     )
@@ -424,6 +429,8 @@ class FootprintNode(Base, TimestampMixin, TenantMixin):
     __tablename__ = "footprint_nodes"
     __table_args__ = (
         sqlalchemy.Index("ix_footprint_nodes_owner_shard", "owner_shard", "owner_id"),
+        # Snapshot pages resume after a (created_at, id) cursor.
+        sqlalchemy.Index("ix_footprint_nodes_owner_keyset", "owner_id", "created_at", "id"),
         sqlalchemy.UniqueConstraint(
             "owner_id",
             "platform",
@@ -483,6 +490,13 @@ class FootprintEdge(Base, TimestampMixin, TenantMixin):
     __tablename__ = "footprint_edges"
     __table_args__ = (
         sqlalchemy.Index("ix_footprint_edges_owner_shard", "owner_shard", "owner_id"),
+        # One traversal step in either direction (app.domains.graph.traversal).
+        sqlalchemy.Index(
+            "ix_footprint_edges_owner_source_relation", "owner_id", "source_node_id", "relation"
+        ),
+        sqlalchemy.Index(
+            "ix_footprint_edges_owner_target_relation", "owner_id", "target_node_id", "relation"
+        ),
         sqlalchemy.UniqueConstraint(
             "owner_id",
             "source_node_id",
@@ -582,6 +596,83 @@ class FootprintImport(Base, TenantMixin):
     run: sqlalchemy.orm.Mapped[OrchestratorRun | None] = sqlalchemy.orm.relationship()
 
 
+class FeedSyncSchedule(Base, TimestampMixin):
+    """When each synced feed is next due. Scheduling state, not member content.
+
+    Deliberately not a tenant table: the scheduler must see every due time to
+    fan out fairly, and RLS would hide them (ADR-0011). It holds ids, a host,
+    and times only; the sync itself runs in the owner's bound transaction.
+    """
+
+    __tablename__ = "feed_sync_schedules"
+    __table_args__ = (sqlalchemy.Index("ix_feed_sync_schedules_due", "next_sync_at"),)
+
+    account_id: sqlalchemy.orm.Mapped[str] = sqlalchemy.orm.mapped_column(
+        sqlalchemy.ForeignKey("footprint_accounts.id", ondelete="CASCADE"), primary_key=True
+    )
+    owner_id: sqlalchemy.orm.Mapped[str] = sqlalchemy.orm.mapped_column(
+        sqlalchemy.String(128), nullable=False
+    )
+    host: sqlalchemy.orm.Mapped[str] = sqlalchemy.orm.mapped_column(
+        sqlalchemy.String(255), index=True, nullable=False
+    )
+    interval_seconds: sqlalchemy.orm.Mapped[int] = sqlalchemy.orm.mapped_column(
+        sqlalchemy.Integer, nullable=False
+    )
+    next_sync_at: sqlalchemy.orm.Mapped[datetime.datetime] = sqlalchemy.orm.mapped_column(
+        sqlalchemy.DateTime(timezone=True), nullable=False
+    )
+    last_enqueued_at: sqlalchemy.orm.Mapped[datetime.datetime | None] = (
+        sqlalchemy.orm.mapped_column(sqlalchemy.DateTime(timezone=True))
+    )
+    last_lag_seconds: sqlalchemy.orm.Mapped[float | None] = sqlalchemy.orm.mapped_column(
+        sqlalchemy.Float
+    )
+
+
+class FeedHost(Base):
+    """Consecutive fetch failures per feed host, and when it may be tried again.
+
+    Circuit breakers live in each worker's memory; this is what the scheduler,
+    in another process, reads to leave a failing host alone. Not a tenant table,
+    like `FeedSyncSchedule`: it holds a host name and counters only.
+    """
+
+    __tablename__ = "feed_hosts"
+
+    host: sqlalchemy.orm.Mapped[str] = sqlalchemy.orm.mapped_column(
+        sqlalchemy.String(255), primary_key=True
+    )
+    consecutive_failures: sqlalchemy.orm.Mapped[int] = sqlalchemy.orm.mapped_column(
+        sqlalchemy.Integer, nullable=False, default=0, server_default="0"
+    )
+    retry_after: sqlalchemy.orm.Mapped[datetime.datetime | None] = sqlalchemy.orm.mapped_column(
+        sqlalchemy.DateTime(timezone=True)
+    )
+
+
+class SitemapEntry(Base):
+    """One public reader URL listed in the sitemap, by owner.
+
+    Not a tenant table, like `FeedSyncSchedule`: the sitemap is rendered from
+    every owner's entries at once, which RLS would hide. It holds only URLs that
+    are already public, each written from its owner's bound transaction.
+    """
+
+    __tablename__ = "sitemap_entries"
+
+    loc: sqlalchemy.orm.Mapped[str] = sqlalchemy.orm.mapped_column(
+        sqlalchemy.String(2048), primary_key=True
+    )
+    owner_id: sqlalchemy.orm.Mapped[str] = sqlalchemy.orm.mapped_column(
+        sqlalchemy.String(128), index=True, nullable=False
+    )
+    #: Date of the project's latest release, as the sitemap prints it.
+    lastmod: sqlalchemy.orm.Mapped[str] = sqlalchemy.orm.mapped_column(
+        sqlalchemy.String(10), nullable=False, default=""
+    )
+
+
 class SourceObject(Base, TimestampMixin, TenantMixin):
     __tablename__ = "source_objects"
     __table_args__ = (
@@ -616,6 +707,11 @@ class SourceObject(Base, TimestampMixin, TenantMixin):
     visibility: sqlalchemy.orm.Mapped[str] = sqlalchemy.orm.mapped_column(
         sqlalchemy.String(16), index=True, nullable=False, default="private"
     )
+    #: SHA-256 of the last upload streamed through the API, spent by the next
+    #: ingest so it need not read the bytes back. Null for presigned uploads.
+    upload_sha256: sqlalchemy.orm.Mapped[str | None] = sqlalchemy.orm.mapped_column(
+        sqlalchemy.String(64), nullable=True
+    )
 
     versions: sqlalchemy.orm.Mapped[list[SourceVersion]] = sqlalchemy.orm.relationship(
         back_populates="source_object",
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import asyncio
 import datetime
+import hashlib
 import pathlib
 import typing
 
@@ -43,6 +44,30 @@ def pdf_path() -> pathlib.Path:
     return pathlib.Path(app.core.config.get_settings().BOOK_ONE_PDF_PATH).resolve()
 
 
+# The PDF's content hash by (path, mtime, size): it is hashed once per file
+# version, not per download.
+_pdf_etags: dict[tuple[str, int, int], str] = {}
+
+
+def _file_sha256(path: pathlib.Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        while chunk := handle.read(1024 * 1024):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+async def pdf_etag(path: pathlib.Path) -> str:
+    stat = await asyncio.to_thread(path.stat)
+    version: tuple[str, int, int] = (str(path), stat.st_mtime_ns, stat.st_size)
+    etag: str | None = _pdf_etags.get(version)
+    if etag is None:
+        digest: str = await asyncio.to_thread(_file_sha256, path)
+        _pdf_etags.clear()
+        etag = _pdf_etags[version] = f'"{digest[:32]}"'
+    return etag
+
+
 def is_configured() -> bool:
     settings = app.core.config.get_settings()
     return bool(
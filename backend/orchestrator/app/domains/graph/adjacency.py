@@ -0,0 +1,166 @@
+"""Per-tenant adjacency lists for graph-aware retrieval.
+
+Retrieval expands its best hits along `footprint_edges`, a few hops at a time,
+for every question. Reading the edges each time would cost a query per hop, so
+the owner's edges are loaded once into undirected adjacency lists, with each
+endpoint's visibility, and kept in process for `CACHE_TTL_SECONDS`.
+
+A write invalidates the cache when its transaction commits. ORM changes to
+nodes and edges are noticed at flush; Core statements, which skip flush hooks,
+call `touch` themselves (`GraphWriter.write`, the profile editor). Another
+process's writes are only seen once the TTL lapses, which bounds how stale an
+expansion can be without a cross-process channel.
+"""
+
+from __future__ import annotations
+
+import collections.abc
+import dataclasses
+import time
+import typing
+
+import sqlalchemy
+import sqlalchemy.ext.asyncio
+import sqlalchemy.orm
+
+import app.core.metrics
+import app.db.models
+
+CACHE_TTL_SECONDS = 300
+MAX_CACHED_OWNERS = 256
+#: Edges loaded per owner, most recently seen first. Expansion is a ranking
+#: signal, so a very large graph loses its oldest edges rather than its answers.
+MAX_EDGES = 50_000
+#: Chance the walk returns to the seeds at each hop. Half keeps a seed ahead of
+#: any one neighbour while a node shared by several seeds can still overtake.
+RESTART = 0.5
+
+_CHANGED_OWNERS = "graph_adjacency_changed"
+
+
+@dataclasses.dataclass(frozen=True)
+class Adjacency:
+    """Each node's neighbours in both directions, with edge weights."""
+
+    neighbours: dict[str, tuple[tuple[str, float], ...]]
+    visibility: dict[str, str]
+
+
+_CACHE: dict[str, tuple[float, Adjacency]] = {}
+
+
+def invalidate(owner_id: str) -> None:
+    _CACHE.pop(owner_id, None)
+
+
+def touch(
+    session: sqlalchemy.ext.asyncio.AsyncSession | sqlalchemy.orm.Session, owner_id: str
+) -> None:
+    """Invalidate the owner's adjacency once this session commits."""
+
+    session.info.setdefault(_CHANGED_OWNERS, set()).add(owner_id)
+
+
+@sqlalchemy.event.listens_for(sqlalchemy.orm.Session, "before_flush")
+def _touch_changed_graph(
+    session: sqlalchemy.orm.Session,
+    flush_context: typing.Any,
+    instances: typing.Any,
+) -> None:
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, app.db.models.FootprintNode | app.db.models.FootprintEdge):
+            touch(session, obj.owner_id)
+
+
+@sqlalchemy.event.listens_for(sqlalchemy.orm.Session, "after_commit")
+def _invalidate_committed(session: sqlalchemy.orm.Session) -> None:
+    for owner_id in session.info.pop(_CHANGED_OWNERS, ()):
+        invalidate(owner_id)
+
+
+@sqlalchemy.event.listens_for(sqlalchemy.orm.Session, "after_rollback")
+def _forget_rolled_back(session: sqlalchemy.orm.Session) -> None:
+    session.info.pop(_CHANGED_OWNERS, None)
+
+
+async def load(session: sqlalchemy.ext.asyncio.AsyncSession, owner_id: str) -> Adjacency:
+    cached = _CACHE.get(owner_id)
+    if cached and time.monotonic() - cached[0] < CACHE_TTL_SECONDS:
+        app.core.metrics.cache_lookup("graph_adjacency", hit=True)
+        return cached[1]
+    app.core.metrics.cache_lookup("graph_adjacency", hit=False)
+
+    edge = app.db.models.FootprintEdge
+    source = sqlalchemy.orm.aliased(app.db.models.FootprintNode)
+    target = sqlalchemy.orm.aliased(app.db.models.FootprintNode)
+    result = await session.execute(
+        # Confidence, not `weight`: the profile editor stores sibling order there.
+        sqlalchemy.select(
+            edge.source_node_id,
+            edge.target_node_id,
+            edge.confidence,
+            source.visibility,
+            target.visibility,
+        )
+        .join(source, source.id == edge.source_node_id)
+        .join(target, target.id == edge.target_node_id)
+        .where(edge.owner_id == owner_id)
+        .order_by(edge.last_seen_at.desc().nullslast(), edge.id)
+        .limit(MAX_EDGES)
+    )
+    neighbours: dict[str, list[tuple[str, float]]] = {}
+    visibility: dict[str, str] = {}
+    for source_id, target_id, confidence, source_visibility, target_visibility in result:
+        neighbours.setdefault(source_id, []).append((target_id, confidence))
+        neighbours.setdefault(target_id, []).append((source_id, confidence))
+        visibility[source_id] = source_visibility
+        visibility[target_id] = target_visibility
+    adjacency = Adjacency(
+        neighbours={node_id: tuple(pairs) for node_id, pairs in neighbours.items()},
+        visibility=visibility,
+    )
+
+    if len(_CACHE) >= MAX_CACHED_OWNERS:
+        _CACHE.pop(next(iter(_CACHE)))
+    _CACHE[owner_id] = (time.monotonic(), adjacency)
+    return adjacency
+
+
+def personalized_pagerank(
+    adjacency: Adjacency,
+    seeds: collections.abc.Mapping[str, float],
+    *,
+    allowed: collections.abc.Collection[str],
+    hops: int = 2,
+    restart: float = RESTART,
+) -> dict[str, float]:
+    """Hop-bounded personalized PageRank from weighted seeds.
+
+    Sums the first `hops + 1` terms of the PageRank series restarted at the
+    seeds, so only nodes within `hops` of a seed are scored and the cost is the
+    edges around the seeds, not the graph. The walk never enters a node outside
+    `allowed` visibilities, so a hidden node cannot lend rank to a visible one.
+    """
+
+    total: float = sum(seeds.values())
+    if total <= 0:
+        return {}
+    mass: dict[str, float] = {node_id: score / total for node_id, score in seeds.items()}
+    ranks: dict[str, float] = {node_id: restart * share for node_id, share in mass.items()}
+    for _ in range(hops):
+        spread: dict[str, float] = {}
+        for node_id, share in mass.items():
+            reachable: list[tuple[str, float]] = [
+                (neighbour, weight)
+                for neighbour, weight in adjacency.neighbours.get(node_id, ())
+                if weight > 0 and adjacency.visibility.get(neighbour) in allowed
+            ]
+            out_weight: float = sum(weight for _, weight in reachable)
+            for neighbour, weight in reachable:
+                spread[neighbour] = (
+                    spread.get(neighbour, 0.0) + (1.0 - restart) * share * weight / out_weight
+                )
+        mass = spread
+        for node_id, share in mass.items():
+            ranks[node_id] = ranks.get(node_id, 0.0) + restart * share
+    return ranks
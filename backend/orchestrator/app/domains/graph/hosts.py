@@ -0,0 +1,217 @@
+"""Per-host fetch state shared by every process that syncs feeds.
+
+Circuit breakers are per process, and the scheduler runs in a different one
+from the workers that fetch, so two things are shared here instead:
+
+- Backoff. A failed fetch counts against its host in `feed_hosts`; from
+  `FAILURE_THRESHOLD` failures on, the host is left alone for a backoff that
+  doubles with each further failure. A successful fetch clears it. The
+  scheduler reads `retry_after` to defer the host's due feeds.
+- Concurrency. A fetch holds one of `PER_HOST_LIMIT` slots for its host. Slots
+  are leases in a Redis sorted set, scored by expiry, so a worker that dies
+  holding one frees it after `LEASE_SECONDS`. Without Redis (``memory://``, the
+  single-instance deployment), or while it is unreachable, slots are counted in
+  this process.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import collections
+import collections.abc
+import contextlib
+import datetime
+import logging
+import time
+import uuid
+
+import redis
+import redis.asyncio
+import sqlalchemy
+import sqlalchemy.dialects.postgresql
+import sqlalchemy.dialects.sqlite
+import sqlalchemy.ext.asyncio
+
+import app.db.models
+import app.settings
+
+logger = logging.getLogger(__name__)
+
+#: Concurrent fetches per host, across every worker.
+PER_HOST_LIMIT = 4
+#: Outlives the slowest fetch: retries and redirects at the client's timeout.
+LEASE_SECONDS = 300
+#: How long a fetch waits for a slot before its import fails as busy.
+SLOT_WAIT_SECONDS = 30.0
+SLOT_POLL_SECONDS = 1.0
+FAILURE_THRESHOLD = 3
+BACKOFF_SECONDS = 5 * 60
+MAX_BACKOFF_SECONDS = 24 * 60 * 60
+
+_local_slots: collections.Counter[str] = collections.Counter()
+
+
+class HostBusyError(Exception):
+    def __init__(self, host: str) -> None:
+        super().__init__(f"No fetch slot free for {host}")
+        self.host = host
+
+
+def backoff_seconds(consecutive_failures: int) -> int:
+    """Zero below the threshold, then doubling from `BACKOFF_SECONDS`."""
+
+    if consecutive_failures < FAILURE_THRESHOLD:
+        return 0
+    return min(
+        MAX_BACKOFF_SECONDS, BACKOFF_SECONDS * 2 ** (consecutive_failures - FAILURE_THRESHOLD)
+    )
+
+
+async def record_failure(
+    session: sqlalchemy.ext.asyncio.AsyncSession, host: str, *, now: datetime.datetime
+) -> None:
+    """Count a failed fetch against the host. Caller commits."""
+
+    table: sqlalchemy.Table = app.db.models.FeedHost.__table__
+    dialect: str = session.bind.dialect.name if session.bind is not None else "postgresql"
+    insert_module = (
+        sqlalchemy.dialects.sqlite if dialect == "sqlite" else sqlalchemy.dialects.postgresql
+    )
+    # An increment in SQL, so failures from concurrent workers all count.
+    failures: int = (
+        await session.execute(
+            insert_module.insert(table)
+            .values(host=host, consecutive_failures=1)
+            .on_conflict_do_update(
+                index_elements=["host"],
+                set_={"consecutive_failures": table.c.consecutive_failures + 1},
+            )
+            .returning(table.c.consecutive_failures)
+        )
+    ).scalar_one()
+    delay: int = backoff_seconds(failures)
+    if delay:
+        await session.execute(
+            sqlalchemy.update(table)
+            .where(table.c.host == host)
+            .values(retry_after=now + datetime.timedelta(seconds=delay))
+        )
+
+
+async def record_success(session: sqlalchemy.ext.asyncio.AsyncSession, host: str) -> None:
+    """Clear the host's failures. Caller commits; a healthy host writes nothing."""
+
+    table: sqlalchemy.Table = app.db.models.FeedHost.__table__
+    await session.execute(
+        sqlalchemy.update(table)
+        .where(table.c.host == host, table.c.consecutive_failures > 0)
+        .values(consecutive_failures=0, retry_after=None)
+    )
+
+
+async def backed_off(
+    session: sqlalchemy.ext.asyncio.AsyncSession,
+    hosts: collections.abc.Collection[str],
+    *,
+    now: datetime.datetime,
+) -> dict[str, datetime.datetime]:
+    """The given hosts that may not be fetched yet, with when they may."""
+
+    if not hosts:
+        return {}
+    result = await session.execute(
+        sqlalchemy.select(app.db.models.FeedHost.host, app.db.models.FeedHost.retry_after).where(
+            app.db.models.FeedHost.host.in_(hosts),
+            app.db.models.FeedHost.retry_after > now,
+        )
+    )
+    return {
+        host: retry_after if retry_after.tzinfo else retry_after.replace(tzinfo=datetime.UTC)
+        for host, retry_after in result
+        if retry_after is not None
+    }
+
+
+def _uses_redis(redis_url: str) -> bool:
+    return redis_url.startswith(("redis://", "rediss://"))
+
+
+def _slots_key(host: str) -> str:
+    return f"feed-host:{host}:slots"
+
+
+async def _take_shared(client: redis.asyncio.Redis, host: str, token: str) -> bool:
+    key: str = _slots_key(host)
+    now: float = time.time()
+    async with client.pipeline(transaction=True) as pipe:
+        pipe.zremrangebyscore(key, "-inf", now)
+        pipe.zadd(key, {token: now + LEASE_SECONDS})
+        pipe.zrank(key, token)
+        pipe.expire(key, LEASE_SECONDS)
+        rank: int | None = (await pipe.execute())[2]
+    # Ranked by expiry, so a newcomer ranks last; past the limit it backs out.
+    if rank is not None and rank < PER_HOST_LIMIT:
+        return True
+    await client.zrem(key, token)
+    return False
+
+
+def _take_local(host: str) -> bool:
+    if _local_slots[host] >= PER_HOST_LIMIT:
+        return False
+    _local_slots[host] += 1
+    return True
+
+
+def _release_local(host: str) -> None:
+    _local_slots[host] -= 1
+    if _local_slots[host] <= 0:
+        del _local_slots[host]
+
+
+@contextlib.asynccontextmanager
+async def fetch_slot(host: str) -> collections.abc.AsyncIterator[None]:
+    """Hold one of the host's fetch slots, waiting up to `SLOT_WAIT_SECONDS`."""
+
+    redis_url: str = app.settings.get_settings().redis_url
+    client: redis.asyncio.Redis | None = (
+        redis.asyncio.Redis.from_url(redis_url, socket_timeout=1.0, socket_connect_timeout=1.0)
+        if _uses_redis(redis_url)
+        else None
+    )
+    token: str = uuid.uuid4().hex
+    shared: bool = client is not None
+    deadline: float = time.monotonic() + SLOT_WAIT_SECONDS
+    try:
+        while True:
+            if shared:
+                assert client is not None
+                try:
+                    if await _take_shared(client, host, token):
+                        break
+                except (redis.RedisError, OSError):
+                    # Politeness must not stop syncing; hold back this process at least.
+                    logger.warning("feed_host.slots_unavailable")
+                    shared = False
+                    continue
+            elif _take_local(host):
+                break
+            if time.monotonic() >= deadline:
+                raise HostBusyError(host)
+            await asyncio.sleep(SLOT_POLL_SECONDS)
+
+        try:
+            yield
+        finally:
+            if shared:
+                assert client is not None
+                try:
+                    await client.zrem(_slots_key(host), token)
+                except (redis.RedisError, OSError):
+                    # The lease expires on its own.
+                    logger.warning("feed_host.release_failed")
+            else:
+                _release_local(host)
+    finally:
+        if client is not None:
+            await client.aclose()
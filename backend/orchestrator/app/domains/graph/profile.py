@@ -3,11 +3,17 @@
 The homepage tree used to be a JSON blob. It is now footprint nodes joined by
 `contains` edges, so the thing a visitor sees and the thing the twin cites are
 the same graph.
+
+The public read is the most requested route there is, so its serialized form is
+cached per owner with a content-hash ETag. A save in this process drops the
+entry; other processes see it within `CACHE_TTL_SECONDS`.
 """
 
 from __future__ import annotations
 
+import dataclasses
 import datetime
+import time
 import typing
 
 import fastapi
@@ -15,13 +21,19 @@ import sqlalchemy
 import sqlalchemy.ext.asyncio
 
 import app.auth.dependencies
+import app.core.http_cache
+import app.core.metrics
+import app.core.tenancy
 import app.db.models
+import app.domains.graph.adjacency
 import app.domains.graph.schemas
 
 PLATFORM = "profile"
 CONTAINS = "contains"
 MAX_NODES = 512
 MAX_DEPTH = 8
+CACHE_TTL_SECONDS = 60
+MAX_CACHE_ENTRIES = 1024
 
 _PROPERTY_KEYS: tuple[str, ...] = (
     "surface",
@@ -36,6 +48,21 @@ _PROPERTY_KEYS: tuple[str, ...] = (
 )
 
 
+@dataclasses.dataclass(frozen=True)
+class ProfileDocument:
+    """The public read, serialized once, with its ETag."""
+
+    body: bytes
+    etag: str
+
+
+_CACHE: dict[str, tuple[float, ProfileDocument]] = {}
+
+
+def invalidate(owner_id: str) -> None:
+    _CACHE.pop(owner_id, None)
+
+
 def _flatten(
     node: app.domains.graph.schemas.ProfileNode,
     path: str,
@@ -54,77 +81,192 @@ def _flatten(
         _flatten(child, external_id, depth + 1, index, out)
 
 
+def _node_values(
+    source: app.domains.graph.schemas.ProfileNode, order: int
+) -> dict[str, typing.Any]:
+    dumped: dict[str, typing.Any] = source.model_dump(mode="json", exclude_none=True)
+    properties: dict[str, typing.Any] = {
+        key: dumped[key] for key in _PROPERTY_KEYS if key in dumped
+    }
+    properties["dot_id"] = source.id
+    properties["order"] = order
+    return {
+        "kind": source.kind or "attribute",
+        "label": source.label,
+        "properties": properties,
+        "visibility": "public",
+    }
+
+
 async def replace_profile_graph(
     session: sqlalchemy.ext.asyncio.AsyncSession,
     owner: app.auth.dependencies.OwnerContext,
     root: app.domains.graph.schemas.ProfileNode,
 ) -> datetime.datetime:
-    """Replace the owner's profile subgraph in one transaction."""
+    """Bring the owner's profile subgraph in line with `root` in one transaction.
+
+    Nodes are matched to the stored tree by their `external_id` path, so a node
+    that survives an edit keeps its id, and with it any twin citation of it.
+    Only real differences are written, a statement per kind of change, so a
+    one-word edit updates one row rather than rewriting the tree. A node moved
+    under another parent has a new path and is replaced. A save that changes
+    nothing writes nothing.
+    """
 
     flattened: list[tuple[str, str | None, int, app.domains.graph.schemas.ProfileNode]] = []
     _flatten(root, path="", depth=0, order=0, out=flattened)
 
-    existing: sqlalchemy.Result[tuple[app.db.models.FootprintNode]] = await session.execute(
-        sqlalchemy.select(app.db.models.FootprintNode).where(
-            app.db.models.FootprintNode.owner_id == owner.owner_id,
-            app.db.models.FootprintNode.platform == PLATFORM,
-        )
-    )
-    stale_ids: list[str] = [node.id for node in existing.scalars().all()]
-    if stale_ids:
-        await session.execute(
-            sqlalchemy.delete(app.db.models.FootprintEdge).where(
-                app.db.models.FootprintEdge.owner_id == owner.owner_id,
-                app.db.models.FootprintEdge.source_node_id.in_(stale_ids),
-            )
+    node_table: sqlalchemy.Table = app.db.models.FootprintNode.__table__
+    edge_table: sqlalchemy.Table = app.db.models.FootprintEdge.__table__
+    stored: dict[str, dict[str, typing.Any]] = {
+        row.external_id: dict(row._mapping)
+        for row in await session.execute(
+            sqlalchemy.select(
+                node_table.c.id,
+                node_table.c.external_id,
+                node_table.c.kind,
+                node_table.c.label,
+                node_table.c.properties,
+                node_table.c.visibility,
+                node_table.c.last_seen_at,
+            ).where(node_table.c.owner_id == owner.owner_id, node_table.c.platform == PLATFORM)
         )
-        await session.execute(
-            sqlalchemy.delete(app.db.models.FootprintNode).where(
-                app.db.models.FootprintNode.owner_id == owner.owner_id,
-                app.db.models.FootprintNode.platform == PLATFORM,
+    }
+    stored_edges: dict[tuple[str, str], tuple[str, float]] = {
+        (row.source_node_id, row.target_node_id): (row.id, row.weight)
+        for row in await session.execute(
+            sqlalchemy.select(
+                edge_table.c.id,
+                edge_table.c.source_node_id,
+                edge_table.c.target_node_id,
+                edge_table.c.weight,
+            ).where(
+                edge_table.c.owner_id == owner.owner_id,
+                edge_table.c.platform == PLATFORM,
+                edge_table.c.relation == CONTAINS,
             )
         )
+    }
 
     now: datetime.datetime = datetime.datetime.now(datetime.UTC)
-    by_external: dict[str, app.db.models.FootprintNode] = {}
-    for external_id, _parent_external, order, source in flattened:
-        dumped: dict[str, typing.Any] = source.model_dump(mode="json", exclude_none=True)
-        properties: dict[str, typing.Any] = {
-            key: dumped[key] for key in _PROPERTY_KEYS if key in dumped
+    common: dict[str, typing.Any] = {
+        "owner_id": owner.owner_id,
+        app.core.tenancy.SHARD_COLUMN: app.core.tenancy.owner_shard(owner.owner_id),
+        "platform": PLATFORM,
+        "source_ref": {"origin": "profile_editor"},
+        "confidence": 1.0,
+        "last_seen_at": now,
+    }
+    ids: dict[str, str] = {}
+    inserted_nodes: list[dict[str, typing.Any]] = []
+    updated_nodes: list[dict[str, typing.Any]] = []
+    wanted_edges: dict[tuple[str, str], float] = {}
+    for external_id, parent_external, order, source in flattened:
+        values: dict[str, typing.Any] = _node_values(source, order)
+        existing: dict[str, typing.Any] | None = stored.get(external_id)
+        if existing is None:
+            ids[external_id] = app.db.models.make_id("node")
+            inserted_nodes.append(
+                {"id": ids[external_id], "external_id": external_id, **common, **values}
+            )
+        else:
+            ids[external_id] = existing["id"]
+            if any(existing[column] != value for column, value in values.items()):
+                updated_nodes.append({"node_id": existing["id"], **values, "last_seen_at": now})
+        if parent_external is not None:
+            wanted_edges[(ids[parent_external], ids[external_id])] = float(order)
+
+    kept: set[str] = set(ids.values())
+    removed_nodes: list[str] = [row["id"] for row in stored.values() if row["id"] not in kept]
+    removed_edges: list[str] = [
+        edge_id for key, (edge_id, _) in stored_edges.items() if key not in wanted_edges
+    ]
+    inserted_edges: list[dict[str, typing.Any]] = [
+        {
+            "id": app.db.models.make_id("edge"),
+            **{key: common[key] for key in ("owner_id", app.core.tenancy.SHARD_COLUMN, "platform")},
+            "source_node_id": source_id,
+            "target_node_id": target_id,
+            "relation": CONTAINS,
+            "weight": weight,
+            "confidence": 1.0,
+            "evidence_ref": {"origin": "profile_editor"},
+            "last_seen_at": now,
         }
-        properties["dot_id"] = source.id
-        properties["order"] = order
-        record = app.db.models.FootprintNode(
-            owner_id=owner.owner_id,
-            kind=source.kind or "attribute",
-            label=source.label,
-            platform=PLATFORM,
-            external_id=external_id,
-            source_ref={"origin": "profile_editor"},
-            properties=properties,
-            visibility="public",
-            last_seen_at=now,
+        for (source_id, target_id), weight in wanted_edges.items()
+        if (source_id, target_id) not in stored_edges
+    ]
+    reordered_edges: list[dict[str, typing.Any]] = [
+        {"edge_id": stored_edges[key][0], "weight": weight, "last_seen_at": now}
+        for key, weight in wanted_edges.items()
+        if key in stored_edges and stored_edges[key][1] != weight
+    ]
+
+    changes: list[list[typing.Any]] = [
+        removed_edges,
+        removed_nodes,
+        inserted_nodes,
+        updated_nodes,
+        inserted_edges,
+        reordered_edges,
+    ]
+    if not any(changes):
+        return max(
+            (row["last_seen_at"] for row in stored.values() if row["last_seen_at"]), default=now
+        )
+
+    app.domains.graph.adjacency.touch(session, owner.owner_id)
+    # Removals first, a node's edges before the node; new nodes go in before
+    # the edges that reach them.
+    if removed_edges:
+        await session.execute(
+            sqlalchemy.delete(edge_table).where(
+                edge_table.c.owner_id == owner.owner_id, edge_table.c.id.in_(removed_edges)
+            )
         )
-        session.add(record)
-        by_external[external_id] = record
-    await session.flush()
-
-    for external_id, parent_external, order, _ in flattened:
-        if parent_external is None:
-            continue
-        session.add(
-            app.db.models.FootprintEdge(
-                owner_id=owner.owner_id,
-                source_node_id=by_external[parent_external].id,
-                target_node_id=by_external[external_id].id,
-                relation=CONTAINS,
-                platform=PLATFORM,
-                weight=float(order),
-                evidence_ref={"origin": "profile_editor"},
-                last_seen_at=now,
+    if removed_nodes:
+        # Any edge may reach a profile node, not only `contains`: one added
+        # through the graph API would otherwise block the node's delete.
+        await session.execute(
+            sqlalchemy.delete(edge_table).where(
+                edge_table.c.owner_id == owner.owner_id,
+                edge_table.c.source_node_id.in_(removed_nodes)
+                | edge_table.c.target_node_id.in_(removed_nodes),
             )
         )
+        await session.execute(
+            sqlalchemy.delete(node_table).where(
+                node_table.c.owner_id == owner.owner_id, node_table.c.id.in_(removed_nodes)
+            )
+        )
+    if inserted_nodes:
+        await session.execute(sqlalchemy.insert(node_table), inserted_nodes)
+    if updated_nodes:
+        await session.execute(
+            sqlalchemy.update(node_table).where(
+                node_table.c.owner_id == owner.owner_id,
+                node_table.c.id == sqlalchemy.bindparam("node_id"),
+            ),
+            updated_nodes,
+        )
+    if inserted_edges:
+        await session.execute(sqlalchemy.insert(edge_table), inserted_edges)
+    if reordered_edges:
+        await session.execute(
+            sqlalchemy.update(edge_table).where(
+                edge_table.c.owner_id == owner.owner_id,
+                edge_table.c.id == sqlalchemy.bindparam("edge_id"),
+            ),
+            reordered_edges,
+        )
+    # The root carries the save time, which the public read reports as `updated_at`.
+    await session.execute(
+        sqlalchemy.update(node_table)
+        .where(node_table.c.owner_id == owner.owner_id, node_table.c.id == ids[root.id])
+        .values(last_seen_at=now)
+    )
     await session.commit()
+    invalidate(owner.owner_id)
     return now
 
 
@@ -191,3 +333,29 @@ async def read_profile_graph(
         (r.last_seen_at for r in records if r.last_seen_at is not None), default=None
     )
     return build(roots[0].id), updated
+
+
+async def read_profile_document(
+    session: sqlalchemy.ext.asyncio.AsyncSession, owner_id: str
+) -> ProfileDocument:
+    """The public read, from cache when fresh, otherwise built and cached."""
+
+    cached = _CACHE.get(owner_id)
+    if cached and time.monotonic() - cached[0] < CACHE_TTL_SECONDS:
+        app.core.metrics.cache_lookup("profile_graph", hit=True)
+        return cached[1]
+    app.core.metrics.cache_lookup("profile_graph", hit=False)
+
+    graph, updated_at = await read_profile_graph(session, owner_id)
+    body: bytes = (
+        app.domains.graph.schemas.ProfileGraphRead(
+            owner_id=owner_id, graph=graph, updated_at=updated_at
+        )
+        .model_dump_json(by_alias=True)
+        .encode()
+    )
+    document = ProfileDocument(body=body, etag=app.core.http_cache.strong_etag(body))
+    if len(_CACHE) >= MAX_CACHE_ENTRIES:
+        _CACHE.pop(next(iter(_CACHE)))
+    _CACHE[owner_id] = (time.monotonic(), document)
+    return document
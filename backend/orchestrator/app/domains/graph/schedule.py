@@ -0,0 +1,61 @@
+"""When a synced feed is next due.
+
+An account enters the schedule when its first import succeeds, because only
+then is its feed URL known. Each completed sync moves `next_sync_at` by an
+interval that adapts to the feed: it halves when the sync found changes and
+grows by half again when it found none, between `MIN_INTERVAL_SECONDS` and
+`MAX_INTERVAL_SECONDS`. A feed that publishes daily settles near a day, and a
+busy one near its own rhythm.
+"""
+
+from __future__ import annotations
+
+import datetime
+
+import sqlalchemy.ext.asyncio
+
+import app.core.http_client
+import app.db.models
+
+MIN_INTERVAL_SECONDS = 15 * 60
+DEFAULT_INTERVAL_SECONDS = 60 * 60
+MAX_INTERVAL_SECONDS = 24 * 60 * 60
+
+
+def next_interval(previous: int | None, *, changed: bool) -> int:
+    if previous is None:
+        return DEFAULT_INTERVAL_SECONDS
+    if changed:
+        return max(MIN_INTERVAL_SECONDS, previous // 2)
+    return min(MAX_INTERVAL_SECONDS, int(previous * 1.5))
+
+
+def aware(value: datetime.datetime) -> datetime.datetime:
+    return value if value.tzinfo else value.replace(tzinfo=datetime.UTC)
+
+
+async def record_sync(
+    session: sqlalchemy.ext.asyncio.AsyncSession,
+    account: app.db.models.FootprintAccount,
+    *,
+    feed_url: str,
+    changed: bool,
+    now: datetime.datetime,
+) -> None:
+    """Move the account's next sync after a successful import. Caller commits."""
+
+    schedule: app.db.models.FeedSyncSchedule | None = await session.get(
+        app.db.models.FeedSyncSchedule, account.id
+    )
+    if schedule is None:
+        schedule = app.db.models.FeedSyncSchedule(
+            account_id=account.id,
+            owner_id=account.owner_id,
+            interval_seconds=next_interval(None, changed=changed),
+        )
+        session.add(schedule)
+    else:
+        schedule.interval_seconds = next_interval(schedule.interval_seconds, changed=changed)
+    # Keyed as the HTTP client keys its circuit breakers.
+    schedule.host = app.core.http_client.extract_host(feed_url)
+    schedule.next_sync_at = now + datetime.timedelta(seconds=schedule.interval_seconds)
@@ -121,10 +121,31 @@ class FootprintImportRead(pydantic.BaseModel):
 
 
 class FootprintGraphSnapshot(pydantic.BaseModel):
+    """One page of the graph: nodes in `(created_at, id)` order and their out-edges.
+
+    Accounts come with the first page only. Pass `next_cursor` back as `cursor`
+    for the next page; it is None on the last.
+    """
+
     owner_id: str
     accounts: list[FootprintAccountRead]
     nodes: list[FootprintNodeRead]
     edges: list[FootprintEdgeRead]
+    next_cursor: str | None = None
+
+
+class FootprintNeighbourhood(pydantic.BaseModel):
+    """The nodes within `depth` hops of `root_id`, and the edges among them."""
+
+    owner_id: str
+    root_id: str
+    depth: int
+    nodes: list[FootprintNodeRead]
+    edges: list[FootprintEdgeRead]
+    #: Hop count from the root for every returned node.
+    hops: dict[str, int]
+    #: True when the node cap cut the walk short; the nearest nodes were kept.
+    truncated: bool
 
 
 class ProfileMetaEntry(pydantic.BaseModel):
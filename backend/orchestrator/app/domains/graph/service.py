@@ -1,26 +1,39 @@
 from __future__ import annotations
 
 import asyncio
+import base64
+import collections.abc
+import dataclasses
 import datetime
 import ipaddress
+import json
 import socket
 import typing
 import urllib.parse
+import weakref
 
 import fastapi
 import httpx
 import sqlalchemy
 import sqlalchemy.ext.asyncio
+import sqlalchemy.orm
 
 import app.auth.dependencies
 import app.core.http_client
+import app.core.metrics
 import app.db.models
+import app.domains.graph.bulk
+import app.domains.graph.hosts
+import app.domains.graph.schedule
 import app.domains.graph.schemas
+import app.domains.graph.traversal
 import app.integrations.connectors.rss
 
 FOOTPRINT_IMPORT_WORKFLOW = "footprint_import"
 RSS_CONNECTORS: set[str] = {"rss", "substack"}
 MAX_FEED_BYTES = 2_000_000
+#: Items read per import; feeds list newest first, so the rest are older posts.
+MAX_FEED_ITEMS = 500
 MAX_FEED_REDIRECTS = 3
 FEED_ACCEPT_HEADER = (
     "application/rss+xml, application/atom+xml, application/xml, text/xml, "
@@ -33,7 +46,27 @@ ALLOWED_FEED_CONTENT_TYPES: set[str] = {
     "text/xml",
     "text/plain",
 }
-RETRYABLE_FEED_STATUSES: set[int] = {429, 502, 503, 504}
+SNAPSHOT_PAGE_SIZE = 250
+#: Larger pages for the NDJSON stream, which is read by programs, not a UI.
+SNAPSHOT_STREAM_PAGE_SIZE = 1000
+FEED_MAX_RETRIES = 2
+FEED_MAX_CONNECTIONS = 20
+FEED_KEEPALIVE_SECONDS = 30.0
+#: How long a vetted resolution is reused before the host is resolved again.
+FEED_DNS_TTL_SECONDS = 60.0
+
+
+@dataclasses.dataclass(frozen=True)
+class FeedFetch:
+    """A feed response, or word that it has not changed since the validators."""
+
+    feed: app.integrations.connectors.rss.RssFeed | None
+    etag: str | None = None
+    last_modified: str | None = None
+
+    @property
+    def not_modified(self) -> bool:
+        return self.feed is None
 
 
 async def create_account(
@@ -522,26 +555,20 @@ async def assert_public_feed_target(feed_url: str) -> None:
             detail="RSS import requires an http(s) feed_url.",
         )
 
+    default_port: int = 443 if parsed.scheme == "https" else 80
     try:
-        default_port: int = 443 if parsed.scheme == "https" else 80
-        addresses: list[
-            tuple[int, int, int, str, tuple[str, int] | tuple[str, int, int, int]]
-        ] = await asyncio_getaddrinfo(host, parsed.port or default_port)
+        # The same vetted answer the feed client connects to; see `_feed_dns`.
+        await _feed_dns.resolve(host, parsed.port or default_port)
     except socket.gaierror as exc:
         raise fastapi.HTTPException(
             status_code=fastapi.status.HTTP_400_BAD_REQUEST,
             detail="RSS feed host could not be resolved.",
         ) from exc
-
-    resolved_hosts: set[str] = {address[4][0] for address in addresses}
-    has_blocked_address: bool = any(
-        _is_blocked_network_address(address) for address in resolved_hosts
-    )
-    if not resolved_hosts or has_blocked_address:
+    except app.core.http_client.BlockedAddressError as exc:
         raise fastapi.HTTPException(
             status_code=fastapi.status.HTTP_400_BAD_REQUEST,
             detail="RSS feed_url must resolve to a public network address.",
-        )
+        ) from exc
 
 
 async def asyncio_getaddrinfo(
@@ -571,84 +598,163 @@ def _validate_feed_response_headers(response: httpx.Response) -> None:
         )
 
 
-async def _read_limited_feed_response(response: httpx.Response) -> str:
-    body = bytearray()
+async def _parse_feed_response(
+    response: httpx.Response, parser: app.integrations.connectors.rss.FeedParser
+) -> app.integrations.connectors.rss.RssFeed:
+    """Parse the body as it arrives, and stop reading once the parser has enough.
+
+    Bytes go to the parser undecoded so the document's own encoding declaration
+    applies; nothing but the current chunk and the items so far is held.
+    """
+
+    received: int = 0
     async for chunk in response.aiter_bytes():
-        body.extend(chunk)
-        if len(body) > MAX_FEED_BYTES:
+        received += len(chunk)
+        if received > MAX_FEED_BYTES:
             raise fastapi.HTTPException(
                 status_code=fastapi.status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
                 detail="RSS feed is too large.",
             )
-    return body.decode(response.encoding or "utf-8", errors="replace")
+        parser.feed(chunk)
+        if parser.done:
+            # Leaving the stream closes the connection without reading the rest.
+            break
+    return parser.close()
+
+
+_feed_dns = app.core.http_client.DnsCache(
+    lambda address: not _is_blocked_network_address(address),
+    ttl=FEED_DNS_TTL_SECONDS,
+    resolver=lambda host, port: asyncio_getaddrinfo(host, port),
+)
+_feed_clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _feed_client() -> httpx.AsyncClient:
+    """This loop's feed client: pooled connections, pinned to vetted addresses.
+
+    One per event loop, because pooled connections belong to the loop that
+    opened them. The API and each worker process run one long-lived loop, so in
+    practice this is one client per process and a batch of syncs on one host
+    reuses its connections.
+    """
+
+    loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+    client: httpx.AsyncClient | None = _feed_clients.get(loop)
+    if client is None or client.is_closed:
+        limits = httpx.Limits(
+            max_connections=FEED_MAX_CONNECTIONS,
+            max_keepalive_connections=FEED_MAX_CONNECTIONS,
+            keepalive_expiry=FEED_KEEPALIVE_SECONDS,
+        )
+        client = _feed_clients[loop] = app.core.http_client.create_service_client(
+            "dot-orchestrator-rss",
+            timeout=20.0,
+            max_connections=FEED_MAX_CONNECTIONS,
+            transport=app.core.http_client.PinnedTransport(_feed_dns, limits=limits),
+        )
+    return client
 
 
-async def fetch_feed_xml(feed_url: str) -> str:
+async def close_feed_client() -> None:
+    client: httpx.AsyncClient | None = _feed_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+def _feed_request_failed() -> fastapi.HTTPException:
+    return fastapi.HTTPException(
+        status_code=fastapi.status.HTTP_502_BAD_GATEWAY,
+        detail="RSS feed request failed.",
+    )
+
+
+async def fetch_feed(
+    feed_url: str,
+    *,
+    etag: str | None = None,
+    last_modified: str | None = None,
+    fallback_title: str = "Imported feed",
+    max_items: int = MAX_FEED_ITEMS,
+) -> FeedFetch:
+    """Fetch and parse a feed, conditionally when validators from the last sync are given.
+
+    A 304 costs headers only and comes back as `FeedFetch(feed=None)`. A body
+    that is not a feed raises `FeedParseError`. Retries back off with jitter,
+    and a host whose breaker is open is not contacted at all.
+    """
+
+    request_headers: dict[str, str] = {"Accept": FEED_ACCEPT_HEADER}
+    if etag:
+        request_headers["If-None-Match"] = etag
+    if last_modified:
+        request_headers["If-Modified-Since"] = last_modified
+    client: httpx.AsyncClient = _feed_client()
     current_url: str = feed_url
-    async with app.core.http_client.create_service_client(
-        "dot-orchestrator-rss",
-        timeout=20.0,
-        max_connections=10,
-    ) as client:
-        for redirect_count in range(MAX_FEED_REDIRECTS + 1):
-            validate_feed_url(current_url)
-            await assert_public_feed_target(current_url)
-
-            last_exc: Exception | None = None
-            for attempt in range(3):
-                try:
-                    async with client.stream(
-                        "GET",
-                        current_url,
-                        headers={"Accept": FEED_ACCEPT_HEADER},
-                        follow_redirects=False,
-                    ) as response:
-                        if response.status_code in {301, 302, 303, 307, 308}:
-                            location = response.headers.get("location")
-                            if not location:
-                                raise fastapi.HTTPException(
-                                    status_code=fastapi.status.HTTP_502_BAD_GATEWAY,
-                                    detail="RSS feed redirect did not include a location.",
-                                )
-                            if redirect_count >= MAX_FEED_REDIRECTS:
-                                raise fastapi.HTTPException(
-                                    status_code=fastapi.status.HTTP_502_BAD_GATEWAY,
-                                    detail="RSS feed redirected too many times.",
-                                )
-                            current_url: str = urllib.parse.urljoin(current_url, location)
-                            break
-
-                        if response.status_code in RETRYABLE_FEED_STATUSES and attempt < 2:
-                            continue
-
-                        _validate_feed_response_headers(response)
-                        try:
-                            response.raise_for_status()
-                        except httpx.HTTPStatusError as exc:
-                            raise fastapi.HTTPException(
-                                status_code=fastapi.status.HTTP_502_BAD_GATEWAY,
-                                detail="RSS feed request failed.",
-                            ) from exc
-                        return await _read_limited_feed_response(response)
-                except (httpx.ConnectError, httpx.ConnectTimeout, httpx.ReadTimeout) as exc:
-                    last_exc = exc
-                    if attempt < 2:
-                        continue
-                    raise fastapi.HTTPException(
-                        status_code=fastapi.status.HTTP_502_BAD_GATEWAY,
-                        detail="RSS feed request failed.",
-                    ) from exc
-            else:
-                if last_exc:
+    for redirect_count in range(MAX_FEED_REDIRECTS + 1):
+        validate_feed_url(current_url)
+        await assert_public_feed_target(current_url)
+        try:
+            response: httpx.Response = await app.core.http_client.resilient_request(
+                client,
+                "GET",
+                current_url,
+                headers=request_headers,
+                stream=True,
+                max_retries=FEED_MAX_RETRIES,
+            )
+        except app.core.http_client.BlockedAddressError as exc:
+            raise fastapi.HTTPException(
+                status_code=fastapi.status.HTTP_400_BAD_REQUEST,
+                detail="RSS feed_url must resolve to a public network address.",
+            ) from exc
+        except (app.core.http_client.CircuitOpenError, httpx.TransportError) as exc:
+            raise _feed_request_failed() from exc
+
+        try:
+            if response.status_code in {301, 302, 303, 307, 308}:
+                location = response.headers.get("location")
+                if not location:
                     raise fastapi.HTTPException(
                         status_code=fastapi.status.HTTP_502_BAD_GATEWAY,
-                        detail="RSS feed request failed.",
-                    ) from last_exc
-
-        raise fastapi.HTTPException(
-            status_code=fastapi.status.HTTP_502_BAD_GATEWAY,
-            detail="RSS feed redirected too many times.",
-        )
+                        detail="RSS feed redirect did not include a location.",
+                    )
+                if redirect_count >= MAX_FEED_REDIRECTS:
+                    break
+                current_url = urllib.parse.urljoin(current_url, location)
+                continue
+
+            if response.status_code == 304 and (etag or last_modified):
+                return FeedFetch(
+                    feed=None,
+                    etag=response.headers.get("etag") or etag,
+                    last_modified=response.headers.get("last-modified") or last_modified,
+                )
+
+            _validate_feed_response_headers(response)
+            try:
+                response.raise_for_status()
+            except httpx.HTTPStatusError as exc:
+                raise _feed_request_failed() from exc
+            parser = app.integrations.connectors.rss.FeedParser(
+                fallback_title=fallback_title, max_items=max_items
+            )
+            return FeedFetch(
+                feed=await _parse_feed_response(response, parser),
+                etag=response.headers.get("etag"),
+                last_modified=response.headers.get("last-modified"),
+            )
+        except httpx.TransportError as exc:
+            raise _feed_request_failed() from exc
+        finally:
+            await response.aclose()
+
+    raise fastapi.HTTPException(
+        status_code=fastapi.status.HTTP_502_BAD_GATEWAY,
+        detail="RSS feed redirected too many times.",
+    )
 
 
 def _date_property(value: datetime.datetime | None) -> str | None:
@@ -675,6 +781,94 @@ async def _mark_import_failed(
     await session.commit()
 
 
+def _sync_cursor(
+    account: app.db.models.FootprintAccount | None, feed_url: str
+) -> dict[str, typing.Any]:
+    """The account's last sync state, if it was for this feed."""
+
+    cursor: dict[str, typing.Any] = dict(account.sync_cursor or {}) if account else {}
+    return cursor if cursor.get("feed_url") == feed_url else {}
+
+
+async def _stored_external_ids(
+    session: sqlalchemy.ext.asyncio.AsyncSession,
+    owner_id: str,
+    platform: str,
+    external_ids: list[str],
+) -> set[str]:
+    if not external_ids:
+        return set()
+    result: sqlalchemy.Result[tuple[str]] = await session.execute(
+        sqlalchemy.select(app.db.models.FootprintNode.external_id).where(
+            app.db.models.FootprintNode.owner_id == owner_id,
+            app.db.models.FootprintNode.platform == platform,
+            app.db.models.FootprintNode.external_id.in_(external_ids),
+        )
+    )
+    return set(result.scalars().all())
+
+
+async def _touch_nodes(
+    session: sqlalchemy.ext.asyncio.AsyncSession,
+    owner_id: str,
+    platform: str,
+    external_ids: list[str],
+) -> None:
+    """Mark nodes as seen in this sync without rewriting them."""
+
+    if not external_ids:
+        return
+    await session.execute(
+        sqlalchemy.update(app.db.models.FootprintNode)
+        .where(
+            app.db.models.FootprintNode.owner_id == owner_id,
+            app.db.models.FootprintNode.platform == platform,
+            app.db.models.FootprintNode.external_id.in_(external_ids),
+        )
+        .values(last_seen_at=datetime.datetime.now(datetime.UTC))
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def _complete_import(
+    session: sqlalchemy.ext.asyncio.AsyncSession,
+    footprint_import: app.db.models.FootprintImport,
+    account: app.db.models.FootprintAccount | None,
+    *,
+    summary: dict[str, typing.Any],
+    cursor: dict[str, typing.Any],
+) -> app.db.models.FootprintImport:
+    now: datetime.datetime = datetime.datetime.now(datetime.UTC)
+    footprint_import.status = "succeeded"
+    footprint_import.completed_at = now
+    footprint_import.summary = summary
+    if account is not None:
+        account.last_synced_at = now
+        account.sync_cursor = cursor
+        await app.domains.graph.schedule.record_sync(
+            session,
+            account,
+            feed_url=cursor["feed_url"],
+            changed=summary.get("changed_item_count", 0) > 0,
+            now=now,
+        )
+    if footprint_import.run_id:
+        run: app.db.models.OrchestratorRun | None = await _get_owned_run(
+            session, footprint_import.owner_id, footprint_import.run_id
+        )
+        if run is not None:
+            run.status = "succeeded"
+            run.completed_at = now
+            run.output_ref = {
+                "import_id": footprint_import.id,
+                "summary": footprint_import.summary,
+            }
+    await session.commit()
+    await session.refresh(footprint_import)
+    return footprint_import
+
+
+@app.core.metrics.timed(app.core.metrics.FOOTPRINT_IMPORT_SECONDS)
 async def process_import(
     session: sqlalchemy.ext.asyncio.AsyncSession,
     owner: app.auth.dependencies.OwnerContext,
@@ -713,27 +907,72 @@ async def process_import(
         await _mark_import_failed(session, footprint_import, error_code="feed_url_rejected")
         raise
 
+    cursor: dict[str, typing.Any] = _sync_cursor(account, feed_url)
+    fallback_title: str = account.display_name or account.handle if account else "Imported feed"
+    feed_host: str = app.core.http_client.extract_host(feed_url)
     try:
-        xml_text: str = feed_xml if feed_xml is not None else await fetch_feed_xml(feed_url)
-    except fastapi.HTTPException:
+        if feed_xml is not None:
+            # A supplied body has no validators; the next fetch starts fresh.
+            fetched: FeedFetch = FeedFetch(
+                feed=app.integrations.connectors.rss.parse_feed(
+                    feed_xml, fallback_title=fallback_title, max_items=MAX_FEED_ITEMS
+                )
+            )
+        else:
+            async with app.domains.graph.hosts.fetch_slot(feed_host):
+                fetched = await fetch_feed(
+                    feed_url,
+                    etag=cursor.get("etag"),
+                    last_modified=cursor.get("last_modified"),
+                    fallback_title=fallback_title,
+                )
+            await app.domains.graph.hosts.record_success(session, feed_host)
+    except app.domains.graph.hosts.HostBusyError as exc:
+        await _mark_import_failed(session, footprint_import, error_code="feed_host_busy")
+        raise fastapi.HTTPException(
+            status_code=fastapi.status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="The feed's host is busy; try again shortly.",
+        ) from exc
+    except fastapi.HTTPException as exc:
+        if exc.status_code == fastapi.status.HTTP_502_BAD_GATEWAY:
+            # Shared with the scheduler, which defers the host once it fails repeatedly.
+            await app.domains.graph.hosts.record_failure(
+                session, feed_host, now=datetime.datetime.now(datetime.UTC)
+            )
         await _mark_import_failed(session, footprint_import, error_code="feed_fetch_failed")
         raise
-
-    try:
-        fallback_title: str = account.display_name or account.handle if account else "Imported feed"
-        feed: app.integrations.connectors.rss.RssFeed = app.integrations.connectors.rss.parse_feed(
-            xml_text, fallback_title=fallback_title
-        )
-    except Exception as exc:
+    except app.integrations.connectors.rss.FeedParseError as exc:
         await _mark_import_failed(session, footprint_import, error_code="feed_parse_failed")
         raise fastapi.HTTPException(
             status_code=fastapi.status.HTTP_400_BAD_REQUEST,
             detail="RSS feed could not be parsed.",
         ) from exc
 
+    if fetched.feed is None:
+        return await _complete_import(
+            session,
+            footprint_import,
+            account,
+            summary={
+                "feed_url": feed_url,
+                "not_modified": True,
+                "item_count": cursor.get("item_count", 0),
+                "changed_item_count": 0,
+                "node_count": 0,
+                "edge_count": 0,
+            },
+            cursor={
+                **cursor,
+                "etag": fetched.etag,
+                "last_modified": fetched.last_modified,
+                "last_import_id": footprint_import.id,
+            },
+        )
+    feed: app.integrations.connectors.rss.RssFeed = fetched.feed
+
     platform: str = connector if connector != "rss" else account.platform if account else "rss"
-    generated_node_ids: set[str] = set()
-    generated_edge_ids: set[str] = set()
+    # Staged in memory and written once per table; see app.domains.graph.bulk.
+    writer = app.domains.graph.bulk.GraphWriter(owner.owner_id)
 
     account_label: str = account.display_name or account.handle if account else feed.title
     account_external_id: str = (
@@ -741,9 +980,74 @@ async def process_import(
         if account
         else app.integrations.connectors.rss.stable_external_id("account", feed_url)
     )
-    account_node: app.db.models.FootprintNode = await upsert_node(
+    publication_external_id: str = app.integrations.connectors.rss.stable_external_id(
+        "feed", feed_url
+    )
+    # Only items that are new or changed since the last sync are written. The
+    # account and publication are restaged with them, or when they changed.
+    item_hashes: dict[str, str] = {
+        item.external_id: app.integrations.connectors.rss.item_hash(item) for item in feed.items
+    }
+    stored_items: set[str] = await _stored_external_ids(
+        session, owner.owner_id, platform, list(item_hashes)
+    )
+    # A hash only vouches for an item whose node still exists; one deleted
+    # since the last sync is written again.
+    previous_hashes: dict[str, str] = {
+        external_id: item_hash
+        for external_id, item_hash in (cursor.get("item_hashes") or {}).items()
+        if external_id in stored_items
+    }
+    changed_items: list[app.integrations.connectors.rss.RssFeedItem] = [
+        item
+        for item in feed.items
+        if previous_hashes.get(item.external_id) != item_hashes[item.external_id]
+    ]
+    feed_hash: str = app.integrations.connectors.rss.stable_external_id(
+        "feed", "\x1e".join((platform, feed.title, feed.link or "", account_label))
+    )
+    next_cursor: dict[str, typing.Any] = {
+        "feed_url": feed_url,
+        "last_import_id": footprint_import.id,
+        "item_count": len(feed.items),
+        "etag": fetched.etag,
+        "last_modified": fetched.last_modified,
+        "feed_hash": feed_hash,
+        # Items that left the feed drop out, so the cursor stays feed-sized.
+        "item_hashes": item_hashes,
+    }
+    # Unchanged items are not rewritten, but they are still in the feed: keep
+    # them as recent as the posts around them, in one statement.
+    changed_ids: set[str] = {item.external_id for item in changed_items}
+    await _touch_nodes(
         session,
         owner.owner_id,
+        platform,
+        [
+            *(external_id for external_id in item_hashes if external_id not in changed_ids),
+            account_external_id,
+            publication_external_id,
+        ],
+    )
+    if not changed_items and cursor.get("feed_hash") == feed_hash:
+        return await _complete_import(
+            session,
+            footprint_import,
+            account,
+            summary={
+                "feed_title": feed.title,
+                "feed_url": feed_url,
+                "not_modified": False,
+                "item_count": len(feed.items),
+                "changed_item_count": 0,
+                "topic_count": 0,
+                "node_count": 0,
+                "edge_count": 0,
+            },
+            cursor=next_cursor,
+        )
+
+    account_node = writer.node(
         kind="platform_account",
         label=account_label,
         platform=platform,
@@ -760,36 +1064,27 @@ async def process_import(
         },
         visibility="public",
     )
-    generated_node_ids.add(account_node.id)
 
-    publication_node: app.db.models.FootprintNode = await upsert_node(
-        session,
-        owner.owner_id,
+    publication_node = writer.node(
         kind="publication",
         label=feed.title,
         platform=platform,
-        external_id=app.integrations.connectors.rss.stable_external_id("feed", feed_url),
+        external_id=publication_external_id,
         source_ref={"import_id": footprint_import.id, "feed_url": feed_url, "url": feed.link},
         properties={"url": feed.link, "connector": connector},
         visibility="public",
     )
-    generated_node_ids.add(publication_node.id)
-    edge: app.db.models.FootprintEdge = await upsert_edge(
-        session,
-        owner.owner_id,
-        source_node_id=account_node.id,
-        target_node_id=publication_node.id,
+    writer.edge(
+        account_node,
+        publication_node,
         relation="published_to",
         platform=platform,
         evidence_ref={"import_id": footprint_import.id, "feed_url": feed_url},
     )
-    generated_edge_ids.add(edge.id)
 
     topic_count = 0
-    for item in feed.items:
-        post_node: app.db.models.FootprintNode = await upsert_node(
-            session,
-            owner.owner_id,
+    for item in changed_items:
+        post_node = writer.node(
             kind="post",
             label=item.title,
             platform=platform,
@@ -806,31 +1101,23 @@ async def process_import(
             },
             visibility="public",
         )
-        generated_node_ids.add(post_node.id)
-        authored_edge: app.db.models.FootprintEdge = await upsert_edge(
-            session,
-            owner.owner_id,
-            source_node_id=account_node.id,
-            target_node_id=post_node.id,
+        writer.edge(
+            account_node,
+            post_node,
             relation="authored",
             platform=platform,
             evidence_ref={"import_id": footprint_import.id, "url": item.link},
         )
-        published_edge: app.db.models.FootprintEdge = await upsert_edge(
-            session,
-            owner.owner_id,
-            source_node_id=post_node.id,
-            target_node_id=publication_node.id,
+        writer.edge(
+            post_node,
+            publication_node,
             relation="published_to",
             platform=platform,
             evidence_ref={"import_id": footprint_import.id, "url": item.link},
         )
-        generated_edge_ids.update({authored_edge.id, published_edge.id})
 
         for topic in app.integrations.connectors.rss.normalize_topics(item.tags):
-            topic_node: app.db.models.FootprintNode = await upsert_node(
-                session,
-                owner.owner_id,
+            topic_node = writer.node(
                 kind="topic",
                 label=topic,
                 platform=platform,
@@ -841,51 +1128,53 @@ async def process_import(
                 confidence=0.9,
             )
             topic_count += 1
-            generated_node_ids.add(topic_node.id)
-            topic_edge: app.db.models.FootprintEdge = await upsert_edge(
-                session,
-                owner.owner_id,
-                source_node_id=post_node.id,
-                target_node_id=topic_node.id,
+            writer.edge(
+                post_node,
+                topic_node,
                 relation="mentions",
                 platform=platform,
                 confidence=0.9,
                 evidence_ref={"import_id": footprint_import.id, "url": item.link},
             )
-            generated_edge_ids.add(topic_edge.id)
 
-    now: datetime.datetime = datetime.datetime.now(datetime.UTC)
-    footprint_import.status = "succeeded"
-    footprint_import.completed_at = now
-    footprint_import.summary = {
-        "feed_title": feed.title,
-        "feed_url": feed_url,
-        "item_count": len(feed.items),
-        "topic_count": topic_count,
-        "node_count": len(generated_node_ids),
-        "edge_count": len(generated_edge_ids),
-    }
-    if account is not None:
-        account.last_synced_at = now
-        account.sync_cursor = {
+    written: app.domains.graph.bulk.WriteResult = await writer.write(session)
+    generated_node_ids: set[str] = set(written.node_ids.values())
+    generated_edge_ids: set[str] = set(written.edge_ids.values())
+
+    return await _complete_import(
+        session,
+        footprint_import,
+        account,
+        summary={
+            "feed_title": feed.title,
             "feed_url": feed_url,
-            "last_import_id": footprint_import.id,
+            "not_modified": False,
             "item_count": len(feed.items),
-        }
-    if footprint_import.run_id:
-        run: app.db.models.OrchestratorRun | None = await _get_owned_run(
-            session, footprint_import.owner_id, footprint_import.run_id
+            "changed_item_count": len(changed_items),
+            "topic_count": topic_count,
+            "node_count": len(generated_node_ids),
+            "edge_count": len(generated_edge_ids),
+        },
+        cursor=next_cursor,
+    )
+
+
+def encode_snapshot_cursor(node: app.db.models.FootprintNode) -> str:
+    position: str = json.dumps([node.created_at.isoformat(), node.id])
+    return base64.urlsafe_b64encode(position.encode()).decode().rstrip("=")
+
+
+def _decode_snapshot_cursor(cursor: str) -> tuple[datetime.datetime, str]:
+    try:
+        created_at, node_id = json.loads(
+            base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
         )
-        if run is not None:
-            run.status = "succeeded"
-            run.completed_at = now
-            run.output_ref = {
-                "import_id": footprint_import.id,
-                "summary": footprint_import.summary,
-            }
-    await session.commit()
-    await session.refresh(footprint_import)
-    return footprint_import
+        return datetime.datetime.fromisoformat(created_at), str(node_id)
+    except (ValueError, TypeError) as exc:
+        raise fastapi.HTTPException(
+            status_code=fastapi.status.HTTP_400_BAD_REQUEST,
+            detail="Snapshot cursor is not valid.",
+        ) from exc
 
 
 async def get_snapshot(
@@ -895,25 +1184,159 @@ async def get_snapshot(
     platform: str | None = None,
     kind: str | None = None,
     relation: str | None = None,
-    node_limit: int = 250,
-    edge_limit: int = 500,
+    cursor: str | None = None,
+    node_limit: int = SNAPSHOT_PAGE_SIZE,
 ) -> app.domains.graph.schemas.FootprintGraphSnapshot:
-    accounts: list[app.db.models.FootprintAccount] = await list_accounts(session, owner)
-    nodes: list[app.db.models.FootprintNode] = await list_nodes(
-        session, owner, platform=platform, kind=kind, limit=node_limit
-    )
-    edges: list[app.db.models.FootprintEdge] = await list_edges(
-        session, owner, platform=platform, relation=relation, limit=edge_limit
-    )
-    node_ids: set[str] = {node.id for node in nodes}
-    visible_edges: list[app.db.models.FootprintEdge] = [
-        edge
-        for edge in edges
-        if edge.source_node_id in node_ids and edge.target_node_id in node_ids
-    ]
+    """One keyset page of the graph.
+
+    Nodes are taken in `(created_at, id)` order after the cursor, so pages
+    neither overlap nor skip when rows are added between requests. Each page
+    carries every edge leaving its nodes whose target also passes the node
+    filters, selected in SQL; across all pages every edge appears exactly once.
+    """
+
+    node = app.db.models.FootprintNode
+    filters: list[typing.Any] = [node.owner_id == owner.owner_id]
+    if platform:
+        filters.append(node.platform == platform)
+    if kind:
+        filters.append(node.kind == kind)
+    # SQLite keeps timestamps as text, and server defaults omit the fraction a
+    # bound datetime carries, so there both sides are compared as numbers.
+    as_number: bool = session.bind is not None and session.bind.dialect.name == "sqlite"
+    created_at: typing.Any = (
+        sqlalchemy.func.julianday(node.created_at) if as_number else node.created_at
+    )
+    if cursor:
+        after_created_at, after_id = _decode_snapshot_cursor(cursor)
+        after: typing.Any = sqlalchemy.bindparam(None, after_created_at, type_=node.created_at.type)
+        filters.append(
+            sqlalchemy.tuple_(created_at, node.id)
+            > sqlalchemy.tuple_(
+                sqlalchemy.func.julianday(after) if as_number else after,
+                sqlalchemy.literal(after_id),
+            )
+        )
+    node_result: sqlalchemy.Result[tuple[app.db.models.FootprintNode]] = await session.execute(
+        sqlalchemy.select(node).where(*filters).order_by(created_at, node.id).limit(node_limit + 1)
+    )
+    nodes: list[app.db.models.FootprintNode] = list(node_result.scalars().all())
+    has_more: bool = len(nodes) > node_limit
+    nodes = nodes[:node_limit]
+
+    edges: list[app.db.models.FootprintEdge] = []
+    if nodes:
+        edge = app.db.models.FootprintEdge
+        target = sqlalchemy.orm.aliased(node)
+        edge_filters: list[typing.Any] = [
+            edge.owner_id == owner.owner_id,
+            edge.source_node_id.in_([page_node.id for page_node in nodes]),
+            target.owner_id == owner.owner_id,
+        ]
+        if platform:
+            edge_filters.extend([edge.platform == platform, target.platform == platform])
+        if kind:
+            edge_filters.append(target.kind == kind)
+        if relation:
+            edge_filters.append(edge.relation == relation)
+        edge_result: sqlalchemy.Result[tuple[app.db.models.FootprintEdge]] = await session.execute(
+            sqlalchemy.select(edge)
+            .join(target, edge.target_node_id == target.id)
+            .where(*edge_filters)
+            .order_by(edge.created_at, edge.id)
+        )
+        edges = list(edge_result.scalars().all())
+
     return app.domains.graph.schemas.FootprintGraphSnapshot(
         owner_id=owner.owner_id,
-        accounts=accounts,
+        accounts=[] if cursor else await list_accounts(session, owner),
+        nodes=nodes,
+        edges=edges,
+        next_cursor=encode_snapshot_cursor(nodes[-1]) if has_more else None,
+    )
+
+
+async def get_neighbourhood(
+    session: sqlalchemy.ext.asyncio.AsyncSession,
+    owner: app.auth.dependencies.OwnerContext,
+    node_id: str,
+    *,
+    depth: int = 2,
+    direction: app.domains.graph.traversal.Direction = "both",
+    relations: collections.abc.Sequence[str] = (),
+    visibilities: collections.abc.Sequence[str] = (),
+    node_limit: int = 200,
+) -> app.domains.graph.schemas.FootprintNeighbourhood:
+    """The k-hop neighbourhood of one node, in one bounded walk."""
+
+    root: app.db.models.FootprintNode = await get_node(session, owner, node_id)
+    walk: app.domains.graph.traversal.Walk = await app.domains.graph.traversal.walk(
+        session,
+        owner.owner_id,
+        root.id,
+        depth=min(depth, app.domains.graph.traversal.MAX_DEPTH),
+        direction=direction,
+        relations=relations,
+        visibilities=visibilities,
+        node_limit=min(node_limit, app.domains.graph.traversal.MAX_NODES),
+    )
+    node_ids: list[str] = list(walk.depths)
+    node_result: sqlalchemy.Result[tuple[app.db.models.FootprintNode]] = await session.execute(
+        sqlalchemy.select(app.db.models.FootprintNode).where(
+            app.db.models.FootprintNode.owner_id == owner.owner_id,
+            app.db.models.FootprintNode.id.in_(node_ids),
+        )
+    )
+    nodes: list[app.db.models.FootprintNode] = sorted(
+        node_result.scalars().all(), key=lambda node: (walk.depths[node.id], node.id)
+    )
+    edge = app.db.models.FootprintEdge
+    edge_filters: list[typing.Any] = [
+        edge.owner_id == owner.owner_id,
+        edge.source_node_id.in_(node_ids),
+        edge.target_node_id.in_(node_ids),
+    ]
+    if relations:
+        edge_filters.append(edge.relation.in_(relations))
+    edge_result: sqlalchemy.Result[tuple[app.db.models.FootprintEdge]] = await session.execute(
+        sqlalchemy.select(edge).where(*edge_filters).order_by(edge.created_at, edge.id)
+    )
+    return app.domains.graph.schemas.FootprintNeighbourhood(
+        owner_id=owner.owner_id,
+        root_id=root.id,
+        depth=min(depth, app.domains.graph.traversal.MAX_DEPTH),
         nodes=nodes,
-        edges=visible_edges,
+        edges=list(edge_result.scalars().all()),
+        hops=walk.depths,
+        truncated=walk.truncated,
     )
+
+
+async def iter_snapshot(
+    session: sqlalchemy.ext.asyncio.AsyncSession,
+    owner: app.auth.dependencies.OwnerContext,
+    *,
+    platform: str | None = None,
+    kind: str | None = None,
+    relation: str | None = None,
+    page_size: int = SNAPSHOT_STREAM_PAGE_SIZE,
+) -> collections.abc.AsyncIterator[app.domains.graph.schemas.FootprintGraphSnapshot]:
+    """Every page in turn; only the current one is held."""
+
+    cursor: str | None = None
+    while True:
+        page = await get_snapshot(
+            session,
+            owner,
+            platform=platform,
+            kind=kind,
+            relation=relation,
+            cursor=cursor,
+            node_limit=page_size,
+        )
+        yield page
+        if page.next_cursor is None:
+            return
+        cursor = page.next_cursor
+        # Rows already sent need not stay in the identity map.
+        session.expunge_all()
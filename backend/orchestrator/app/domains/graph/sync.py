@@ -0,0 +1,182 @@
+"""Periodic feed sync: pick accounts that are due and fan them out politely.
+
+When an account is due comes from `app.domains.graph.schedule`. Each pass takes
+due rows oldest first, at most `PER_HOST_LIMIT` per host, and staggers a host's
+imports `POLITENESS_SECONDS` apart. That only spreads out one pass; the limit
+itself is held by the fetches, through `app.domains.graph.hosts`. Hosts the
+workers have recorded as failing are deferred until their backoff ends, rather
+than hit again. Lag, the time between due and enqueued, is recorded per row and
+as a metric.
+"""
+
+from __future__ import annotations
+
+import collections
+import collections.abc
+import dataclasses
+import datetime
+
+import sqlalchemy
+import sqlalchemy.ext.asyncio
+
+import app.auth.dependencies
+import app.core.metrics
+import app.core.tenancy
+import app.db.models
+import app.domains.graph.hosts
+import app.domains.graph.schedule as schedule
+import app.domains.graph.schemas
+import app.domains.graph.service
+
+PER_HOST_LIMIT = app.domains.graph.hosts.PER_HOST_LIMIT
+POLITENESS_SECONDS = 5.0
+#: Due rows considered per pass; the rest wait for the next one.
+BATCH_LIMIT = 500
+SCHEDULER_ACTOR = "feed-scheduler"
+
+#: (import id, owner id, delay in seconds) -> enqueue the import.
+Enqueue = collections.abc.Callable[[str, str, float], None]
+_Sessions = sqlalchemy.ext.asyncio.async_sessionmaker[sqlalchemy.ext.asyncio.AsyncSession]
+
+
+@dataclasses.dataclass(frozen=True)
+class _Due:
+    account_id: str
+    owner_id: str
+    host: str
+    due_at: datetime.datetime
+
+
+@dataclasses.dataclass
+class SchedulingReport:
+    enqueued: int = 0
+    deferred_hosts: list[str] = dataclasses.field(default_factory=list)
+    dropped: int = 0
+    max_lag_seconds: float = 0.0
+
+
+def _plan(
+    due: list[_Due], backed_off: dict[str, datetime.datetime], now: datetime.datetime
+) -> tuple[list[tuple[_Due, float]], dict[str, float]]:
+    """Per host: defer while it is backed off, else take a polite slice."""
+
+    by_host: dict[str, list[_Due]] = collections.defaultdict(list)
+    for row in due:
+        by_host[row.host].append(row)
+
+    planned: list[tuple[_Due, float]] = []
+    deferred: dict[str, float] = {}
+    for host, rows in by_host.items():
+        if host in backed_off:
+            deferred[host] = (backed_off[host] - now).total_seconds()
+            continue
+        for position, row in enumerate(rows[:PER_HOST_LIMIT]):
+            planned.append((row, position * POLITENESS_SECONDS))
+    return planned, deferred
+
+
+async def _enqueue_one(
+    sessions: _Sessions,
+    enqueue: Enqueue,
+    due: _Due,
+    delay_seconds: float,
+    now: datetime.datetime,
+) -> float | None:
+    """Create and enqueue one import in the owner's transaction, and lease the row.
+
+    Returns the lag in seconds, or None when the account no longer syncs and
+    its row was removed.
+    """
+
+    owner = app.auth.dependencies.OwnerContext(owner_id=due.owner_id, actor_id=SCHEDULER_ACTOR)
+    async with sessions() as session:
+        await app.core.tenancy.bind_tenant(session, due.owner_id)
+        row: app.db.models.FeedSyncSchedule | None = await session.get(
+            app.db.models.FeedSyncSchedule, due.account_id
+        )
+        if row is None:
+            return None
+        result = await session.execute(
+            sqlalchemy.select(app.db.models.FootprintAccount).where(
+                app.db.models.FootprintAccount.owner_id == due.owner_id,
+                app.db.models.FootprintAccount.id == due.account_id,
+            )
+        )
+        account: app.db.models.FootprintAccount | None = result.scalar_one_or_none()
+        feed_url: str = str((account.sync_cursor or {}).get("feed_url") or "") if account else ""
+        if account is None or account.status != "active" or not feed_url:
+            await session.delete(row)
+            await session.commit()
+            return None
+
+        lag_seconds: float = max(0.0, (now - due.due_at).total_seconds())
+        row.last_lag_seconds = lag_seconds
+        row.last_enqueued_at = now
+        # Leased until the import completes and records the real next time; a
+        # failed import is retried one interval later.
+        row.next_sync_at = now + datetime.timedelta(seconds=row.interval_seconds + delay_seconds)
+
+        platform: str = account.platform.lower()
+        footprint_import: app.db.models.FootprintImport = (
+            await app.domains.graph.service.create_import(
+                session,
+                owner,
+                app.domains.graph.schemas.FootprintImportCreate(
+                    connector=(
+                        platform if platform in app.domains.graph.service.RSS_CONNECTORS else "rss"
+                    ),
+                    import_mode="rss",
+                    account_id=account.id,
+                    source_ref={"feed_url": feed_url, "scheduled": True},
+                ),
+                # One import per due time, however many passes see the row.
+                idempotency_key=f"scheduled:{account.id}:{due.due_at.isoformat()}",
+            )
+        )
+    # After the commit inside create_import, so a worker never sees a missing row.
+    enqueue(footprint_import.id, due.owner_id, delay_seconds)
+    return lag_seconds
+
+
+async def schedule_due_syncs(
+    sessions: _Sessions,
+    enqueue: Enqueue,
+    *,
+    now: datetime.datetime | None = None,
+    limit: int = BATCH_LIMIT,
+) -> SchedulingReport:
+    """One scheduling pass. Safe to repeat: enqueued rows are leased forward."""
+
+    now = now or datetime.datetime.now(datetime.UTC)
+    report = SchedulingReport()
+    async with sessions() as session:
+        result = await session.execute(
+            sqlalchemy.select(app.db.models.FeedSyncSchedule)
+            .where(app.db.models.FeedSyncSchedule.next_sync_at <= now)
+            .order_by(app.db.models.FeedSyncSchedule.next_sync_at)
+            .limit(limit)
+        )
+        rows: list[app.db.models.FeedSyncSchedule] = list(result.scalars())
+        due: list[_Due] = [
+            _Due(row.account_id, row.owner_id, row.host, schedule.aware(row.next_sync_at))
+            for row in rows
+        ]
+        backed_off: dict[str, datetime.datetime] = await app.domains.graph.hosts.backed_off(
+            session, {row.host for row in due}, now=now
+        )
+        planned, deferred = _plan(due, backed_off, now)
+        for row in rows:
+            if row.host in deferred:
+                row.next_sync_at = now + datetime.timedelta(seconds=deferred[row.host])
+        await session.commit()
+    report.deferred_hosts = sorted(deferred)
+
+    for item, delay_seconds in planned:
+        lag_seconds: float | None = await _enqueue_one(sessions, enqueue, item, delay_seconds, now)
+        if lag_seconds is None:
+            report.dropped += 1
+            continue
+        app.core.metrics.FEED_SYNC_LAG_SECONDS.observe(lag_seconds)
+        report.enqueued += 1
+        report.max_lag_seconds = max(report.max_lag_seconds, lag_seconds)
+    return report
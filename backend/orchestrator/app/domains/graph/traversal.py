@@ -0,0 +1,187 @@
+"""Bounded k-hop traversal of an owner's footprint graph.
+
+On Postgres the walk is one `WITH RECURSIVE` query over `footprint_edges`, read
+in both directions through `(owner_id, source_node_id, relation)` and its
+target twin, returning each reached node with its hop count. SQLite, used in
+tests and local development, walks breadth-first in Python instead, one query
+per hop. Both honour the same filters: relations limit which edges are walked,
+visibilities limit which nodes may be entered, and a node cap keeps the nearest
+nodes and reports that the neighbourhood was truncated. The cap bounds the
+response; the depth limit bounds the walk.
+"""
+
+from __future__ import annotations
+
+import collections.abc
+import dataclasses
+import typing
+
+import sqlalchemy
+import sqlalchemy.dialects.postgresql
+import sqlalchemy.ext.asyncio
+
+import app.db.models
+
+#: Hops allowed in one request; beyond this a neighbourhood is most of the graph.
+MAX_DEPTH = 4
+MAX_NODES = 1000
+
+Direction = typing.Literal["out", "in", "both"]
+
+
+@dataclasses.dataclass(frozen=True)
+class Walk:
+    """Reached node ids and their hop count from the root, nearest first."""
+
+    depths: dict[str, int]
+    truncated: bool
+
+
+def _adjacency(
+    owner_id: str, direction: Direction, relations: collections.abc.Sequence[str]
+) -> sqlalchemy.Subquery:
+    """Edges as (from, to) pairs in the directions asked for."""
+
+    edge = app.db.models.FootprintEdge
+    filters: list[typing.Any] = [edge.owner_id == owner_id]
+    if relations:
+        filters.append(edge.relation.in_(relations))
+    legs: list[sqlalchemy.Select[typing.Any]] = []
+    if direction in {"out", "both"}:
+        legs.append(
+            sqlalchemy.select(
+                edge.source_node_id.label("from_id"), edge.target_node_id.label("to_id")
+            ).where(*filters)
+        )
+    if direction in {"in", "both"}:
+        legs.append(
+            sqlalchemy.select(
+                edge.target_node_id.label("from_id"), edge.source_node_id.label("to_id")
+            ).where(*filters)
+        )
+    return sqlalchemy.union_all(*legs).subquery("adjacency")
+
+
+async def walk_recursive(
+    session: sqlalchemy.ext.asyncio.AsyncSession,
+    owner_id: str,
+    root_id: str,
+    *,
+    depth: int,
+    direction: Direction = "both",
+    relations: collections.abc.Sequence[str] = (),
+    visibilities: collections.abc.Sequence[str] = (),
+    node_limit: int = 200,
+) -> Walk:
+    """Walk in one recursive query.
+
+    Each row carries the path that reached it, and a step never re-enters a
+    node on its own path, so a branch ends at `depth` or at a cycle. The
+    recursion can still reach a node by several paths; `node_limit` only
+    truncates the output, the nearest nodes first, and `MAX_DEPTH` is what
+    bounds the work.
+    """
+
+    node = app.db.models.FootprintNode
+    adjacency = _adjacency(owner_id, direction, relations)
+    bind: typing.Any = session.bind
+    on_postgres: bool = bind is not None and bind.dialect.name == "postgresql"
+    # An id array on Postgres; elsewhere a "/"-delimited string, so the same
+    # query runs under SQLite in tests.
+    id_array = sqlalchemy.dialects.postgresql.ARRAY(sqlalchemy.Text)
+    root_path: typing.Any = (
+        sqlalchemy.cast(sqlalchemy.dialects.postgresql.array([root_id]), id_array)
+        if on_postgres
+        else sqlalchemy.literal(f"/{root_id}/")
+    )
+    seed = sqlalchemy.select(
+        sqlalchemy.literal(root_id).label("node_id"),
+        sqlalchemy.literal(0).label("hops"),
+        root_path.label("path"),
+    ).cte("walk", recursive=True)
+    if on_postgres:
+        # Cast, so both terms of the recursion agree on the column type.
+        path: typing.Any = sqlalchemy.cast(
+            seed.c.path + sqlalchemy.dialects.postgresql.array([adjacency.c.to_id]), id_array
+        )
+        unvisited: typing.Any = sqlalchemy.not_(adjacency.c.to_id == sqlalchemy.any_(seed.c.path))
+    else:
+        path = seed.c.path + adjacency.c.to_id + "/"
+        unvisited = sqlalchemy.not_(
+            seed.c.path.contains(sqlalchemy.literal("/") + adjacency.c.to_id + "/")
+        )
+    step = (
+        sqlalchemy.select(adjacency.c.to_id, seed.c.hops + 1, path)
+        .join(adjacency, adjacency.c.from_id == seed.c.node_id)
+        .join(node, sqlalchemy.and_(node.id == adjacency.c.to_id, node.owner_id == owner_id))
+        .where(seed.c.hops < depth, unvisited)
+    )
+    if visibilities:
+        step = step.where(node.visibility.in_(visibilities))
+    # Paths are distinct by construction, so UNION would only add a sort.
+    walk = seed.union_all(step)
+    nearest = sqlalchemy.func.min(walk.c.hops).label("hops")
+    result = await session.execute(
+        sqlalchemy.select(walk.c.node_id, nearest)
+        # Scopes the outer query too, so the root is only returned to its owner.
+        .join(node, node.id == walk.c.node_id)
+        .where(node.owner_id == owner_id)
+        .group_by(walk.c.node_id)
+        .order_by(nearest, walk.c.node_id)
+        .limit(node_limit + 1)
+    )
+    rows: list[typing.Any] = list(result)
+    return Walk(
+        depths={row.node_id: row.hops for row in rows[:node_limit]},
+        truncated=len(rows) > node_limit,
+    )
+
+
+async def walk_breadth_first(
+    session: sqlalchemy.ext.asyncio.AsyncSession,
+    owner_id: str,
+    root_id: str,
+    *,
+    depth: int,
+    direction: Direction = "both",
+    relations: collections.abc.Sequence[str] = (),
+    visibilities: collections.abc.Sequence[str] = (),
+    node_limit: int = 200,
+) -> Walk:
+    node = app.db.models.FootprintNode
+    adjacency = _adjacency(owner_id, direction, relations)
+    depths: dict[str, int] = {root_id: 0}
+    frontier: list[str] = [root_id]
+    for hops in range(1, depth + 1):
+        if not frontier:
+            break
+        step = (
+            sqlalchemy.select(adjacency.c.to_id)
+            .distinct()
+            .join(node, node.id == adjacency.c.to_id)
+            .where(node.owner_id == owner_id, adjacency.c.from_id.in_(frontier))
+            .order_by(adjacency.c.to_id)
+        )
+        if visibilities:
+            step = step.where(node.visibility.in_(visibilities))
+        reached: list[str] = [
+            node_id for node_id in (await session.execute(step)).scalars() if node_id not in depths
+        ]
+        for node_id in reached:
+            if len(depths) == node_limit:
+                return Walk(depths=depths, truncated=True)
+            depths[node_id] = hops
+        frontier = reached
+    return Walk(depths=depths, truncated=False)
+
+
+async def walk(
+    session: sqlalchemy.ext.asyncio.AsyncSession,
+    owner_id: str,
+    root_id: str,
+    **options: typing.Any,
+) -> Walk:
+    bind: typing.Any = session.bind
+    if bind is not None and bind.dialect.name == "postgresql":
+        return await walk_recursive(session, owner_id, root_id, **options)
+    return await walk_breadth_first(session, owner_id, root_id, **options)
@@ -16,6 +16,7 @@ import typing
 
 import httpx
 
+import app.core.metrics
 import app.settings
 
 GEMINI_ENDPOINT = "https://generativelanguage.googleapis.com/v1beta/models"
@@ -56,6 +57,7 @@ class GeminiEmbeddingClient:
     def model(self) -> str:
         return self._model
 
+    @app.core.metrics.timed(app.core.metrics.EMBEDDING_BATCH_SECONDS)
     async def embed(self, texts: list[str]) -> list[list[float]]:
         if not texts:
             return []
@@ -54,25 +54,33 @@ def _extracted_text_key(owner_id: str, version_id: str) -> str:
     return f"vault/{owner_id}/extracted/{version_id}.txt"
 
 
+async def _find_source_object(
+    session: sqlalchemy.ext.asyncio.AsyncSession, owner_id: str, object_store_key: str
+) -> app.db.models.SourceObject | None:
+    result = await session.execute(
+        sqlalchemy.select(app.db.models.SourceObject).where(
+            app.db.models.SourceObject.owner_id == owner_id,
+            app.db.models.SourceObject.object_store_key == object_store_key,
+        )
+    )
+    return result.scalar_one_or_none()
+
+
 async def _get_or_create_source_object(
     session: sqlalchemy.ext.asyncio.AsyncSession,
     owner: app.auth.dependencies.OwnerContext,
+    source_object: app.db.models.SourceObject | None,
     *,
     object_store_key: str,
     filename: str,
     mime_type: str,
     size_bytes: int,
 ) -> app.db.models.SourceObject:
-    existing = await session.execute(
-        sqlalchemy.select(app.db.models.SourceObject).where(
-            app.db.models.SourceObject.owner_id == owner.owner_id,
-            app.db.models.SourceObject.object_store_key == object_store_key,
-        )
-    )
-    source_object: app.db.models.SourceObject | None = existing.scalar_one_or_none()
     if source_object is not None:
         source_object.filename = filename
         source_object.size_bytes = size_bytes
+        if mime_type:
+            source_object.mime_type = mime_type
         return source_object
 
     source_object = app.db.models.SourceObject(
@@ -88,6 +96,40 @@ async def _get_or_create_source_object(
     return source_object
 
 
+async def record_upload(
+    session: sqlalchemy.ext.asyncio.AsyncSession,
+    owner: app.auth.dependencies.OwnerContext,
+    *,
+    object_store_key: str,
+    size_bytes: int,
+    upload_sha256: str,
+    mime_type: str = "",
+) -> None:
+    """Note the digest of bytes the API just stored, for the ingest that follows.
+
+    The row is created pending, named after its key until registration gives
+    it the member's filename.
+    """
+
+    source_object: app.db.models.SourceObject | None = await _find_source_object(
+        session, owner.owner_id, object_store_key
+    )
+    filename: str = (
+        source_object.filename if source_object is not None else object_store_key.rsplit("/", 1)[-1]
+    )
+    source_object = await _get_or_create_source_object(
+        session,
+        owner,
+        source_object,
+        object_store_key=object_store_key,
+        filename=filename,
+        mime_type=mime_type,
+        size_bytes=size_bytes,
+    )
+    source_object.upload_sha256 = upload_sha256
+    await session.flush()
+
+
 async def _latest_version(
     session: sqlalchemy.ext.asyncio.AsyncSession,
     source_object_id: str,
@@ -113,21 +155,36 @@ async def ingest_object(
     """Read an uploaded object, extract it, and persist its chunks and anchors."""
 
     store = app.integrations.object_store.get_object_store()
-    try:
-        data: bytes = await store.get_bytes(object_store_key)
-    except app.integrations.object_store.ObjectNotFoundError as exc:
-        raise IngestError("The uploaded file could not be found.") from exc
-    except app.integrations.object_store.ObjectStoreError as exc:
-        raise IngestError("The uploaded file could not be read.") from exc
+    existing: app.db.models.SourceObject | None = await _find_source_object(
+        session, owner.owner_id, object_store_key
+    )
+    # An upload streamed through the API was hashed on the way in.
+    content_hash: str | None = existing.upload_sha256 if existing is not None else None
+    stored_size: int = existing.size_bytes if existing is not None else 0
+    if content_hash is None:
+        try:
+            # Hashed through the store's map, so re-ingesting unchanged bytes
+            # never copies them into the process; they are only read to be
+            # extracted.
+            async with store.get_buffer(object_store_key) as buffer:
+                content_hash = hashlib.sha256(buffer).hexdigest()
+                stored_size = len(buffer)
+        except app.integrations.object_store.ObjectNotFoundError as exc:
+            raise IngestError("The uploaded file could not be found.") from exc
+        except app.integrations.object_store.ObjectStoreError as exc:
+            raise IngestError("The uploaded file could not be read.") from exc
 
     source_object: app.db.models.SourceObject = await _get_or_create_source_object(
         session,
         owner,
+        existing,
         object_store_key=object_store_key,
         filename=filename,
         mime_type=mime_type,
-        size_bytes=size_bytes or len(data),
+        size_bytes=size_bytes or stored_size,
     )
+    # The digest vouches for one upload; a later write to the key is re-hashed.
+    source_object.upload_sha256 = None
 
     if not app.domains.knowledge.extract.is_supported(source_object.mime_type, filename):
         source_object.status = STATUS_UNSUPPORTED
@@ -139,7 +196,6 @@ async def ingest_object(
             chunk_count=0,
         )
 
-    content_hash: str = hashlib.sha256(data).hexdigest()
     previous: app.db.models.SourceVersion | None = await _latest_version(session, source_object.id)
     unchanged: bool = (
         previous is not None
@@ -168,9 +224,15 @@ async def ingest_object(
     await session.flush()
 
     try:
+        data: bytes = await store.get_bytes(object_store_key)
         extracted = app.domains.knowledge.extract.extract(
             data, mime_type=source_object.mime_type, filename=filename
         )
+    except app.integrations.object_store.ObjectStoreError as exc:
+        version.status = STATUS_FAILED
+        source_object.status = STATUS_FAILED
+        await session.flush()
+        raise IngestError("The uploaded file could not be read.") from exc
     except app.domains.knowledge.extract.UnsupportedSourceError as exc:
         version.status = STATUS_UNSUPPORTED
         source_object.status = STATUS_UNSUPPORTED
@@ -1,5 +1,9 @@
+import asyncio
+import dataclasses
 import datetime
+import hashlib
 import re
+import time
 import typing
 
 import fastapi
@@ -7,11 +11,41 @@ import sqlalchemy
 import sqlalchemy.ext.asyncio
 
 import app.auth.dependencies
+import app.core.http_cache
+import app.core.metrics
 import app.db.models
 import app.domains.publication.schemas
+import app.domains.publication.sitemap
 import app.integrations.object_store
 
 PUBLICATION_RELEASE_WORKFLOW = "publication_release"
+#: How long a public (owner, slug, version) keeps resolving to the same release
+#: without a query, which bounds how long a project made private keeps serving.
+DELIVERY_RESOLUTION_TTL_SECONDS = 30
+MAX_CACHED_RESOLUTIONS = 1024
+MAX_CACHED_MANIFESTS = 256
+#: Object-store round trips in flight while one release is snapshotted.
+SNAPSHOT_CONCURRENCY = 8
+
+
+@dataclasses.dataclass(frozen=True)
+class DeliveryManifest:
+    """A published manifest as stored, with a strong ETag over those bytes."""
+
+    body: bytes
+    etag: str
+
+
+# A release's manifest never changes once written, so its bytes are cached by
+# version with no expiry. Which version a request resolves to can change, and
+# is cached separately, briefly, and dropped when the owner releases or edits.
+_resolved: dict[tuple[str, str, int | None], tuple[float, int, str]] = {}
+_manifests: dict[tuple[str, str, int], DeliveryManifest] = {}
+
+
+def invalidate_delivery(owner_id: str, project_slug: str) -> None:
+    for key in [key for key in _resolved if key[:2] == (owner_id, project_slug)]:
+        del _resolved[key]
 
 
 def slugify(value: str) -> str:
@@ -75,10 +109,16 @@ async def update_project(
     payload: app.domains.publication.schemas.PublicationProjectUpdate,
 ) -> app.db.models.PublicationProject:
     project: app.db.models.PublicationProject = await get_project(session, owner, project_id)
+    previous_slug: str = project.slug
     updates: dict[str, typing.Any] = payload.model_dump(exclude_unset=True)
     for field, value in updates.items():
         setattr(project, field, value)
     await session.commit()
+    invalidate_delivery(owner.owner_id, previous_slug)
+    # Either way a project can enter or leave the sitemap; `publish` skips the
+    # rewrite when the owner's entries come out unchanged.
+    if updates.keys() & {"status", "visibility"}:
+        await app.domains.publication.sitemap.publish(session, owner.owner_id)
     await session.refresh(project)
     return project
 
@@ -161,6 +201,9 @@ async def update_section(
     body_ref: typing.Any | None = updates.get("body_ref")
     for field, value in updates.items():
         setattr(section, field, value)
+    if "body_ref" in updates:
+        # A reference set by the caller points at bytes this service never hashed.
+        section.body_sha256 = None
     if body_ref:
         session.add(
             app.db.models.PublicationRevision(
@@ -183,6 +226,7 @@ async def create_revision(
 ) -> app.db.models.PublicationRevision:
     section: app.db.models.PublicationSection = await get_section(session, owner, section_id)
     section.body_ref = payload.body_ref
+    section.body_sha256 = None
     revision = app.db.models.PublicationRevision(
         section_id=section_id,
         editor_id=owner.actor_id,
@@ -205,16 +249,23 @@ async def set_section_body(
     section: app.db.models.PublicationSection = await get_section(session, owner, section_id)
     revision_id: str = app.db.models.make_id("rev")
     key: str = f"drafts/{section.project_id}/sections/{section.id}/{revision_id}.md"
+    body: bytes = body_text.encode("utf-8")
+    store: (
+        app.integrations.object_store.FilesystemObjectStore
+        | app.integrations.object_store.S3ObjectStore
+    ) = app.integrations.object_store.get_object_store()
     try:
-        await app.integrations.object_store.get_object_store().put_bytes(
-            key, body_text.encode("utf-8")
-        )
+        await store.put_bytes(key, body)
+        # Compressed now, while the bytes are in hand, so a release can copy
+        # the codings with the body instead of reading it back.
+        await _put_encoded(store, key, body)
     except app.integrations.object_store.ObjectStoreError as exc:
         raise fastapi.HTTPException(
             status_code=fastapi.status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="Section body could not be persisted.",
         ) from exc
     section.body_ref = key
+    section.body_sha256 = hashlib.sha256(body).hexdigest()
     session.add(
         app.db.models.PublicationRevision(
             id=revision_id,
@@ -355,31 +406,77 @@ async def _resolve_section_body(section: app.db.models.PublicationSection) -> st
     return ref
 
 
+def release_blob_key(digest: str) -> str:
+    return f"releases/blobs/{digest}.md"
+
+
+async def _put_encoded(
+    store: app.integrations.object_store.FilesystemObjectStore
+    | app.integrations.object_store.S3ObjectStore,
+    key: str,
+    body: bytes,
+) -> None:
+    """Store `body`'s compressed codings beside `key`, compressing off the loop."""
+
+    encoded: dict[str, bytes] = await asyncio.to_thread(app.core.http_cache.precompress, body)
+    for coding, data in encoded.items():
+        await store.put_bytes(key + app.core.http_cache.ENCODING_SUFFIXES[coding], data)
+
+
+async def _snapshot_section(
+    store: app.integrations.object_store.FilesystemObjectStore
+    | app.integrations.object_store.S3ObjectStore,
+    limit: asyncio.Semaphore,
+    section: app.db.models.PublicationSection,
+) -> str:
+    # A blob is written after its codings, so one that exists is complete.
+    async with limit:
+        ref: str = section.body_ref or ""
+        if section.body_sha256 and ref.startswith(("drafts/", "releases/")):
+            # The hash is known, so the body is copied inside the store, unread.
+            key: str = release_blob_key(section.body_sha256)
+            if not await store.exists(key):
+                try:
+                    for suffix in app.core.http_cache.ENCODING_SUFFIXES.values():
+                        await store.copy(ref + suffix, key + suffix)
+                except app.integrations.object_store.ObjectNotFoundError:
+                    # A draft stored before its codings were, or by a process
+                    # without brotli.
+                    await _put_encoded(store, key, await store.get_bytes(ref))
+                await store.copy(ref, key)
+            return key
+        body: bytes = (await _resolve_section_body(section)).encode("utf-8")
+        key = release_blob_key(hashlib.sha256(body).hexdigest())
+        if not await store.exists(key):
+            await _put_encoded(store, key, body)
+            await store.put_bytes(key, body)
+        return key
+
+
 async def snapshot_release_bodies(
-    owner_id: str,
-    project_slug: str,
-    version: int,
     sections: list[app.db.models.PublicationSection],
 ) -> dict[str, str]:
     """Copy section bodies into the immutable release namespace.
 
-    Returns a map of section id → release-scoped body key. After this, a
-    release is fully self-contained: mutating drafts can never change it.
+    Returns a map of section id → release body key. After this, a release is
+    fully self-contained: mutating drafts can never change it. Bodies are
+    stored by content hash under `releases/blobs/`, so a section unchanged since
+    an earlier release (of any version or project) is already there and is not
+    uploaded again. A body uploaded through the API has a known hash and is
+    copied within the store, with the codings stored at upload, instead of
+    passing through this process. Other bodies are compressed here, once. Sections
+    are snapshotted concurrently, a few at a time.
     """
     store: (
         app.integrations.object_store.FilesystemObjectStore
         | app.integrations.object_store.S3ObjectStore
     ) = app.integrations.object_store.get_object_store()
-    body_keys: dict[str, str] = {}
-    for section in sections:
-        body_text: str = await _resolve_section_body(section)
-        key: str = (
-            f"releases/{owner_id}/{project_slug}/v{version}/sections/"
-            f"{section.section_order:03d}-{section.id}.md"
-        )
-        await store.put_bytes(key, body_text.encode("utf-8"))
-        body_keys[section.id] = key
-    return body_keys
+    limit = asyncio.Semaphore(SNAPSHOT_CONCURRENCY)
+    # If one write fails the rest may still land; a blob nothing points at is harmless.
+    keys: list[str] = await asyncio.gather(
+        *(_snapshot_section(store, limit, section) for section in sections)
+    )
+    return {section.id: key for section, key in zip(sections, keys, strict=True)}
 
 
 async def get_idempotent_release(
@@ -495,9 +592,7 @@ async def create_release(
     session.add(run)
 
     try:
-        body_keys: dict[str, str] = await snapshot_release_bodies(
-            owner.owner_id, project.slug, version, sections
-        )
+        body_keys: dict[str, str] = await snapshot_release_bodies(sections)
         manifest: dict[str, typing.Any] = build_release_manifest(
             project, release, sections, now, body_keys
         )
@@ -510,6 +605,8 @@ async def create_release(
         ) from exc
 
     await session.commit()
+    invalidate_delivery(owner.owner_id, project.slug)
+    await app.domains.publication.sitemap.publish(session, owner.owner_id)
     await session.refresh(release)
     return release
 
@@ -561,12 +658,18 @@ async def get_release_manifest(
         ) from exc
 
 
-async def get_public_delivery_manifest(
+async def _resolve_delivery(
     session: sqlalchemy.ext.asyncio.AsyncSession,
     owner_id: str,
     project_slug: str,
-    version: int | None = None,
-) -> dict[str, typing.Any]:
+    version: int | None,
+) -> tuple[int, str]:
+    """The published version and manifest key a public request is served."""
+
+    cached = _resolved.get((owner_id, project_slug, version))
+    if cached and time.monotonic() - cached[0] < DELIVERY_RESOLUTION_TTL_SECONDS:
+        return cached[1], cached[2]
+
     project_result: sqlalchemy.Result[
         tuple[app.db.models.PublicationProject]
     ] = await session.execute(
@@ -604,8 +707,33 @@ async def get_public_delivery_manifest(
             status_code=fastapi.status.HTTP_404_NOT_FOUND, detail="Delivery not found."
         )
 
+    if len(_resolved) >= MAX_CACHED_RESOLUTIONS:
+        _resolved.pop(next(iter(_resolved)))
+    _resolved[(owner_id, project_slug, version)] = (
+        time.monotonic(),
+        release.version,
+        release.manifest_key,
+    )
+    return release.version, release.manifest_key
+
+
+async def get_public_delivery_manifest(
+    session: sqlalchemy.ext.asyncio.AsyncSession,
+    owner_id: str,
+    project_slug: str,
+    version: int | None = None,
+) -> DeliveryManifest:
+    resolved_version, manifest_key = await _resolve_delivery(
+        session, owner_id, project_slug, version
+    )
+    cache_key: tuple[str, str, int] = (owner_id, project_slug, resolved_version)
+    cached: DeliveryManifest | None = _manifests.get(cache_key)
+    app.core.metrics.cache_lookup("delivery_manifest", hit=cached is not None)
+    if cached is not None:
+        return cached
+
     try:
-        return await app.integrations.object_store.get_object_store().get_json(release.manifest_key)
+        body: bytes = await app.integrations.object_store.get_object_store().get_bytes(manifest_key)
     except app.integrations.object_store.ObjectNotFoundError as exc:
         raise fastapi.HTTPException(
             status_code=fastapi.status.HTTP_404_NOT_FOUND,
@@ -617,25 +745,8 @@ async def get_public_delivery_manifest(
             detail="Delivery manifest could not be read.",
         ) from exc
 
-
-async def list_public_releases(
-    session: sqlalchemy.ext.asyncio.AsyncSession,
-) -> list[tuple[app.db.models.PublicationProject, app.db.models.PublicationRelease]]:
-    """Return all published public releases for sitemap generation."""
-    result: sqlalchemy.Result[
-        tuple[app.db.models.PublicationProject, app.db.models.PublicationRelease]
-    ] = await session.execute(
-        sqlalchemy.select(app.db.models.PublicationProject, app.db.models.PublicationRelease)
-        .join(
-            app.db.models.PublicationRelease,
-            app.db.models.PublicationRelease.project_id == app.db.models.PublicationProject.id,
-        )
-        .where(
-            app.db.models.PublicationProject.status == "published",
-            app.db.models.PublicationProject.visibility == "public",
-            app.db.models.PublicationRelease.status == "published",
-            app.db.models.PublicationRelease.revoked_at.is_(None),
-        )
-        .order_by(app.db.models.PublicationRelease.published_at.desc())
-    )
-    return list(result.all())
+    manifest = DeliveryManifest(body=body, etag=app.core.http_cache.strong_etag(body))
+    if len(_manifests) >= MAX_CACHED_MANIFESTS:
+        _manifests.pop(next(iter(_manifests)))
+    _manifests[cache_key] = manifest
+    return manifest
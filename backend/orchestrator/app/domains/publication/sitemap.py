@@ -0,0 +1,274 @@
+"""The public sitemap, written when releases change rather than built per crawl.
+
+A release (or a project edit) replaces its owner's published reader URLs in
+`sitemap_entries` and re-renders the sitemap from that table: one urlset
+while it fits in `MAX_URLS_PER_SITEMAP`, otherwise a sitemap index over
+numbered shards. Every document is stored with a gzip twin, and the endpoints
+serve the stored bytes under a content-hash ETag, so a crawler never reaches
+the database.
+
+Each owner's entries are read within their own tenant, which is all a release
+can see under RLS. Replacing them and rewriting the documents happen under a
+Postgres advisory lock, so API instances and the worker take turns instead of
+writing over each other's sitemap. `rebuild` publishes every owner in turn,
+which fills the table after an upgrade.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import collections.abc
+import contextlib
+import dataclasses
+import gzip
+import logging
+import time
+import typing
+import weakref
+import xml.etree.ElementTree as _ET
+
+import sqlalchemy
+import sqlalchemy.ext.asyncio
+
+import app.core.http_cache
+import app.core.metrics
+import app.core.tenancy
+import app.db.models
+import app.integrations.object_store
+import app.settings
+
+logger = logging.getLogger(__name__)
+
+#: The sitemaps.org limit for one file.
+MAX_URLS_PER_SITEMAP = 50_000
+#: How long another process's rewrite can go unseen by this one.
+CACHE_TTL_SECONDS = 300
+MAX_CACHE_ENTRIES = 64
+
+SITEMAP_KEY = "sitemaps/sitemap.xml"
+#: Advisory lock id for sitemap writers; any fixed 64-bit value unused elsewhere.
+MERGE_LOCK_KEY = 0x5349_5445_4D41_50
+_NAMESPACE = "http://www.sitemaps.org/schemas/sitemap/0.9"
+
+
+def shard_key(number: int) -> str:
+    return f"sitemaps/sitemap-{number}.xml"
+
+
+@dataclasses.dataclass(frozen=True)
+class SitemapDocument:
+    """A stored sitemap in one coding, with a strong ETag over those bytes."""
+
+    body: bytes
+    etag: str
+
+
+_CACHE: dict[tuple[str, str | None], tuple[float, SitemapDocument]] = {}
+# Locks belong to the loop that first waits on them; one per loop, as for clients.
+_merge_locks: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def invalidate() -> None:
+    _CACHE.clear()
+
+
+async def _owner_entries(
+    session: sqlalchemy.ext.asyncio.AsyncSession, owner_id: str
+) -> dict[str, str]:
+    """Reader URL -> date of its latest release, for the owner's public projects."""
+
+    project = app.db.models.PublicationProject
+    release = app.db.models.PublicationRelease
+    latest = sqlalchemy.func.max(release.published_at).label("published_at")
+    result = await session.execute(
+        sqlalchemy.select(project.slug, latest)
+        .join(release, release.project_id == project.id)
+        .where(
+            project.owner_id == owner_id,
+            project.status == "published",
+            project.visibility == "public",
+            release.status == "published",
+            release.revoked_at.is_(None),
+        )
+        .group_by(project.id, project.slug)
+    )
+    base: str = app.settings.get_settings().FRONTEND_URL.rstrip("/")
+    return {
+        f"{base}/read/{owner_id}/{slug}": published_at.strftime("%Y-%m-%d") if published_at else ""
+        for slug, published_at in result
+    }
+
+
+def _document(root: _ET.Element) -> bytes:
+    return (
+        b'<?xml version="1.0" encoding="UTF-8"?>\n'
+        + _ET.tostring(root, encoding="unicode").encode()
+    )
+
+
+def _urlset(entries: list[tuple[str, str]]) -> bytes:
+    urlset: _ET.Element = _ET.Element("urlset", xmlns=_NAMESPACE)
+    for loc, lastmod in entries:
+        url: _ET.Element = _ET.SubElement(urlset, "url")
+        _ET.SubElement(url, "loc").text = loc
+        if lastmod:
+            _ET.SubElement(url, "lastmod").text = lastmod
+        _ET.SubElement(url, "changefreq").text = "monthly"
+        _ET.SubElement(url, "priority").text = "0.8"
+    return _document(urlset)
+
+
+def render(owners: dict[str, dict[str, str]]) -> dict[str, bytes]:
+    """Every sitemap document for these entries, by object key."""
+
+    entries: list[tuple[str, str]] = sorted(
+        ((loc, lastmod) for urls in owners.values() for loc, lastmod in urls.items()),
+        key=lambda entry: (entry[1], entry[0]),
+        reverse=True,
+    )
+    if len(entries) <= MAX_URLS_PER_SITEMAP:
+        return {SITEMAP_KEY: _urlset(entries)}
+
+    documents: dict[str, bytes] = {}
+    index: _ET.Element = _ET.Element("sitemapindex", xmlns=_NAMESPACE)
+    api: str = app.settings.get_settings().PUBLIC_API_URL.rstrip("/")
+    for start in range(0, len(entries), MAX_URLS_PER_SITEMAP):
+        number: int = start // MAX_URLS_PER_SITEMAP + 1
+        shard: list[tuple[str, str]] = entries[start : start + MAX_URLS_PER_SITEMAP]
+        documents[shard_key(number)] = _urlset(shard)
+        sitemap: _ET.Element = _ET.SubElement(index, "sitemap")
+        _ET.SubElement(sitemap, "loc").text = f"{api}/v1/publications/sitemap-{number}.xml"
+        lastmod: str = max(entry[1] for entry in shard)
+        if lastmod:
+            _ET.SubElement(sitemap, "lastmod").text = lastmod
+    documents[SITEMAP_KEY] = _document(index)
+    return documents
+
+
+@contextlib.asynccontextmanager
+async def _serialized(
+    session: sqlalchemy.ext.asyncio.AsyncSession,
+) -> collections.abc.AsyncIterator[None]:
+    """Serialize sitemap writers: in process always, across processes on Postgres."""
+
+    async with _merge_locks.setdefault(asyncio.get_running_loop(), asyncio.Lock()):
+        bind: typing.Any = session.bind
+        if bind is not None and bind.dialect.name == "postgresql":
+            # Released when the transaction ends, with the entries it guards.
+            await session.execute(
+                sqlalchemy.select(sqlalchemy.func.pg_advisory_xact_lock(MERGE_LOCK_KEY))
+            )
+        yield
+
+
+async def _replace_and_render(session: sqlalchemy.ext.asyncio.AsyncSession, owner_id: str) -> None:
+    await app.core.tenancy.bind_tenant(session, owner_id)
+    entries: dict[str, str] = await _owner_entries(session, owner_id)
+    entry = app.db.models.SitemapEntry
+    async with _serialized(session):
+        stored: dict[str, str] = {
+            loc: lastmod
+            for loc, lastmod in await session.execute(
+                sqlalchemy.select(entry.loc, entry.lastmod).where(entry.owner_id == owner_id)
+            )
+        }
+        if stored == entries:
+            await session.commit()
+            return
+        await session.execute(sqlalchemy.delete(entry).where(entry.owner_id == owner_id))
+        if entries:
+            await session.execute(
+                sqlalchemy.insert(entry),
+                [
+                    {"loc": loc, "owner_id": owner_id, "lastmod": lastmod}
+                    for loc, lastmod in entries.items()
+                ],
+            )
+        owners: dict[str, dict[str, str]] = {}
+        for row in await session.execute(
+            sqlalchemy.select(entry.owner_id, entry.loc, entry.lastmod)
+        ):
+            owners.setdefault(row.owner_id, {})[row.loc] = row.lastmod
+        documents: dict[str, bytes] = await asyncio.to_thread(render, owners)
+        store = app.integrations.object_store.get_object_store()
+        for key, body in documents.items():
+            # The gzip twin first, so a document's plain form is never newer
+            # than the compressed one served to most crawlers.
+            await store.put_bytes(key + ".gz", gzip.compress(body, compresslevel=9, mtime=0))
+            await store.put_bytes(key, body)
+        # Entries commit only once the documents rendered from them are stored.
+        await session.commit()
+
+
+async def publish(session: sqlalchemy.ext.asyncio.AsyncSession, owner_id: str) -> None:
+    """Replace the owner's sitemap entries and rewrite the stored documents.
+
+    Runs after the change it reflects has committed, so nothing here may fail
+    that change. The work uses its own session on the caller's engine, leaving
+    the caller's objects and tenant untouched; any error is logged, and the
+    previous sitemap, stale rather than wrong, stays.
+    """
+
+    try:
+        async with sqlalchemy.ext.asyncio.AsyncSession(session.bind, expire_on_commit=False) as own:
+            await _replace_and_render(own, owner_id)
+    except Exception:  # noqa: BLE001 - the change this follows has already committed
+        logger.warning("sitemap.publish_failed owner=%s", owner_id, exc_info=True)
+    finally:
+        invalidate()
+
+
+async def rebuild(
+    sessions: sqlalchemy.ext.asyncio.async_sessionmaker[sqlalchemy.ext.asyncio.AsyncSession],
+    owner_ids: collections.abc.Iterable[str] | None = None,
+) -> int:
+    """Publish each owner's entries. Returns how many owners were published.
+
+    RLS hides projects from a query that spans tenants, so by default owners
+    come from the tables that do not: members, and owners already listed.
+    An owner with releases but neither a member row nor entries yet, as with
+    gateway or local-header identities, must be named (`OWNERS=` in the
+    Makefile); once published it is listed, and later rebuilds include it.
+    """
+
+    if owner_ids is None:
+        async with sessions() as session:
+            members = sqlalchemy.select(app.db.models.Member.id)
+            listed = sqlalchemy.select(app.db.models.SitemapEntry.owner_id)
+            owner_ids = sorted(set(await session.scalars(members.union(listed))))
+    published: int = 0
+    for owner_id in owner_ids:
+        # One session per owner: each binds its own tenant.
+        async with sessions() as session:
+            await publish(session, owner_id)
+        published += 1
+    return published
+
+
+async def read(key: str, coding: str | None = None) -> SitemapDocument | None:
+    cached = _CACHE.get((key, coding))
+    if cached and time.monotonic() - cached[0] < CACHE_TTL_SECONDS:
+        app.core.metrics.cache_lookup("sitemap", hit=True)
+        return cached[1]
+    app.core.metrics.cache_lookup("sitemap", hit=False)
+
+    suffix: str = app.core.http_cache.ENCODING_SUFFIXES[coding] if coding else ""
+    try:
+        body: bytes = await app.integrations.object_store.get_object_store().get_bytes(key + suffix)
+    except app.integrations.object_store.ObjectNotFoundError:
+        return None
+    document = SitemapDocument(body=body, etag=app.core.http_cache.strong_etag(body))
+
+    if len(_CACHE) >= MAX_CACHE_ENTRIES:
+        _CACHE.pop(next(iter(_CACHE)))
+    _CACHE[(key, coding)] = (time.monotonic(), document)
+    return document
+
+
+def empty() -> SitemapDocument:
+    """What is served before anything has been released."""
+
+    body: bytes = _urlset([])
+    return SitemapDocument(body=body, etag=app.core.http_cache.strong_etag(body))
@@ -2,21 +2,47 @@
 
 Every write is validated here rather than at the edge, so the key space stays
 bounded no matter which router grows a new entry point later.
+
+Every visitor reads the published blocks, so their serialized form is cached
+with a content-hash ETag against the content version (`versions`). A change to
+published copy announces a new version, which drops this cache here and, over
+Redis, on the other instances.
 """
 
 from __future__ import annotations
 
+import dataclasses
 import datetime
 import re
+import time
 
 import sqlalchemy
 import sqlalchemy.ext.asyncio
 
+import app.core.http_cache
+import app.core.metrics
 import app.domains.sitecontent.models as models
 import app.domains.sitecontent.schemas as schemas
+import app.domains.sitecontent.versions as versions
+import app.settings
 
 _KEY_RE = re.compile(models.KEY_PATTERN)
 
+#: How long an instance that missed a version message can serve the old copy.
+CACHE_TTL_SECONDS = 60
+
+
+@dataclasses.dataclass(frozen=True)
+class PublishedDocument:
+    """The public read, serialized once, with its ETag."""
+
+    body: bytes
+    etag: str
+
+
+# Keyed by content version; only the current one is ever kept.
+_CACHE: dict[int, tuple[float, PublishedDocument]] = {}
+
 
 class InvalidContentKeyError(ValueError):
     """The requested block key is not a well-formed content address."""
@@ -43,6 +69,31 @@ async def published_blocks(session: sqlalchemy.ext.asyncio.AsyncSession) -> dict
     return {key: value for key, value in result.all() if value is not None}
 
 
+async def published_document(session: sqlalchemy.ext.asyncio.AsyncSession) -> PublishedDocument:
+    """The public read, from cache while its version is current, otherwise rebuilt."""
+
+    version: int = versions.current()
+    cached = _CACHE.get(version)
+    if cached and time.monotonic() - cached[0] < CACHE_TTL_SECONDS:
+        app.core.metrics.cache_lookup("site_content", hit=True)
+        return cached[1]
+    app.core.metrics.cache_lookup("site_content", hit=False)
+
+    body: bytes = (
+        schemas.SiteContentPublic(blocks=await published_blocks(session)).model_dump_json().encode()
+    )
+    document = PublishedDocument(body=body, etag=app.core.http_cache.strong_etag(body))
+    # Tagged with the version read before the query: a change that lands while
+    # it runs leaves this entry stale at once rather than cached for the TTL.
+    _CACHE.clear()
+    _CACHE[version] = (time.monotonic(), document)
+    return document
+
+
+async def _announce_change() -> None:
+    await versions.announce(app.settings.get_settings().redis_url)
+
+
 async def all_blocks(
     session: sqlalchemy.ext.asyncio.AsyncSession,
 ) -> list[schemas.SiteContentValue]:
@@ -102,6 +153,8 @@ async def write_block(
         row.published_at = now
 
     await session.commit()
+    if publish:
+        await _announce_change()
     return schemas.SiteContentValue(
         key=row.key,
         published_value=row.published_value,
@@ -123,6 +176,7 @@ async def publish_block(
     row.published_at = datetime.datetime.now(datetime.UTC)
     row.updated_by = actor_id
     await session.commit()
+    await _announce_change()
     return schemas.SiteContentValue(
         key=row.key,
         published_value=row.published_value,
@@ -140,4 +194,6 @@ async def revert_block(session: sqlalchemy.ext.asyncio.AsyncSession, *, key: str
         sqlalchemy.delete(models.SiteContentBlock).where(models.SiteContentBlock.key == validated)
     )
     await session.commit()
+    if result.rowcount:
+        await _announce_change()
     return bool(result.rowcount)
@@ -0,0 +1,104 @@
+"""The published copy's content version, shared between instances over Redis.
+
+Every instance caches the published blocks against the version it has seen.
+A publish or revert bumps the local version, so this process rebuilds at once,
+then takes the next number from a Redis counter and publishes it; the other
+instances bump theirs when it arrives. Numbers only ever grow, so a delayed
+message, or this process's own echo, is recognised and ignored.
+
+Without Redis (``memory://``, as the single-instance deployment configures),
+or while it is unreachable, a message can be missed. The cache's TTL bounds
+how long another instance can serve the old copy.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import logging
+
+import redis
+import redis.asyncio
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = "site-content:version"
+VERSION_CHANNEL = "site-content:version"
+#: Pause before resubscribing after the connection drops.
+RECONNECT_SECONDS = 5.0
+
+
+@dataclasses.dataclass
+class _Versions:
+    #: Bumped on every change this process hears of; caches compare against it.
+    local: int = 0
+    #: Highest shared number seen, from our own counter increments or messages.
+    shared: int = 0
+
+
+_versions = _Versions()
+
+
+def current() -> int:
+    return _versions.local
+
+
+def bump() -> None:
+    _versions.local += 1
+
+
+def observe(shared: int) -> None:
+    """Apply a version published by an instance; stale and echoed ones are no-ops."""
+
+    if shared > _versions.shared:
+        _versions.shared = shared
+        bump()
+
+
+def _uses_redis(redis_url: str) -> bool:
+    return redis_url.startswith(("redis://", "rediss://"))
+
+
+async def announce(redis_url: str) -> None:
+    """Bump the version here and publish the next shared one to every instance."""
+
+    bump()
+    if not _uses_redis(redis_url):
+        return
+    client = redis.asyncio.Redis.from_url(redis_url, socket_timeout=1.0, socket_connect_timeout=1.0)
+    try:
+        shared: int = await client.incr(VERSION_KEY)
+        # Recorded first, so our own message is recognised when it comes back.
+        _versions.shared = max(_versions.shared, shared)
+        await client.publish(VERSION_CHANNEL, shared)
+    except (redis.RedisError, OSError):
+        # The write has committed; other instances catch up when their TTL lapses.
+        logger.warning("site_content.announce_failed")
+    finally:
+        await client.aclose()
+
+
+async def listen(redis_url: str) -> None:
+    """Observe published versions until cancelled, resubscribing after errors."""
+
+    while True:
+        client = redis.asyncio.Redis.from_url(redis_url, socket_connect_timeout=1.0)
+        try:
+            async with client.pubsub() as pubsub:
+                await pubsub.subscribe(VERSION_CHANNEL)
+                # Anything published while unsubscribed was missed.
+                bump()
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        observe(int(message["data"]))
+        except (redis.RedisError, OSError, ValueError):
+            logger.warning("site_content.listen_failed", exc_info=True)
+        finally:
+            await client.aclose()
+        await asyncio.sleep(RECONNECT_SECONDS)
+
+
+def start_listener(redis_url: str) -> asyncio.Task[None] | None:
+    if not _uses_redis(redis_url):
+        return None
+    return asyncio.create_task(listen(redis_url), name="site-content-versions")
@@ -88,6 +88,37 @@ class SupportContribution(app.db.models.Base):
     )
 
 
+#: The one `SupportTotals` row.
+TOTALS_ID = "all"
+
+
+class SupportTotals(app.db.models.Base):
+    """Succeeded contributions, counted and summed as the ledger changes.
+
+    `apply_event` adjusts this in the transaction that moves a contribution into
+    or out of `succeeded`, so the public figure is one row read, never a scan.
+    `reconcile_totals` recomputes it from the ledger and reports any drift.
+    """
+
+    __tablename__ = "support_totals"
+
+    id: sqlalchemy.orm.Mapped[str] = sqlalchemy.orm.mapped_column(
+        sqlalchemy.String(16), primary_key=True, default=TOTALS_ID
+    )
+    supporters: sqlalchemy.orm.Mapped[int] = sqlalchemy.orm.mapped_column(
+        sqlalchemy.Integer, nullable=False, default=0
+    )
+    total_minor: sqlalchemy.orm.Mapped[int] = sqlalchemy.orm.mapped_column(
+        sqlalchemy.BigInteger, nullable=False, default=0
+    )
+    updated_at: sqlalchemy.orm.Mapped[datetime.datetime] = sqlalchemy.orm.mapped_column(
+        sqlalchemy.DateTime(timezone=True),
+        server_default=sqlalchemy.func.now(),
+        onupdate=sqlalchemy.func.now(),
+        nullable=False,
+    )
+
+
 def hash_email(email: str) -> str:
     return hashlib.sha256(email.strip().lower().encode("utf-8")).hexdigest()
 
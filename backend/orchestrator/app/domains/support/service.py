@@ -8,7 +8,9 @@ was received. Only a verified provider event may settle the ledger.
 from __future__ import annotations
 
 import asyncio
+import dataclasses
 import datetime
+import logging
 import typing
 
 import sqlalchemy
@@ -23,6 +25,8 @@ try:  # pragma: no cover - exercised only when the optional dep is installed
 except ImportError:  # pragma: no cover
     stripe = None  # type: ignore[assignment]
 
+logger = logging.getLogger(__name__)
+
 
 class SupportUnavailableError(RuntimeError):
     """Support is not configured, or the provider rejected the request."""
@@ -188,15 +192,27 @@ async def apply_event(
 
     metadata: dict[str, typing.Any] = obj.get("metadata") or {}
     support_id: str = str(metadata.get("support_id") or "")
+    # Locked, so events settling one payment at once (Stripe sends the checkout
+    # and the payment intent together) take turns: the second sees the first's
+    # committed status and does not count the same transition again.
     contribution: models.SupportContribution | None = (
-        await session.get(models.SupportContribution, support_id) if support_id else None
+        await session.get(
+            models.SupportContribution, support_id, with_for_update=True, populate_existing=True
+        )
+        if support_id
+        else None
     )
     if contribution is None:
         contribution = await session.scalar(
-            sqlalchemy.select(models.SupportContribution).where(
-                models.SupportContribution.provider_ref == provider_ref
-            )
+            sqlalchemy.select(models.SupportContribution)
+            .where(models.SupportContribution.provider_ref == provider_ref)
+            .with_for_update()
+            .execution_options(populate_existing=True)
         )
+    # (status, amount) as counted before this event; a new row was not counted.
+    previous: tuple[str, int] | None = (
+        (contribution.status, contribution.amount_minor) if contribution is not None else None
+    )
     if contribution is None:
         purpose: str = str(metadata.get("purpose") or "general")
         customer_details: dict[str, typing.Any] = obj.get("customer_details") or {}
@@ -238,11 +254,19 @@ async def apply_event(
 
     if status == "succeeded":
         contribution.settled_at = datetime.datetime.now(datetime.UTC)
+    counted_before: bool = previous is not None and previous[0] == "succeeded"
+    counted_now: bool = contribution.status == "succeeded"
+    await _adjust_totals(
+        session,
+        supporters=int(counted_now) - int(counted_before),
+        total_minor=(contribution.amount_minor if counted_now else 0)
+        - (previous[1] if previous is not None and counted_before else 0),
+    )
     await session.commit()
     return changed
 
 
-async def totals(session: sqlalchemy.ext.asyncio.AsyncSession) -> dict[str, int]:
+async def _ledger_totals(session: sqlalchemy.ext.asyncio.AsyncSession) -> dict[str, int]:
     result: sqlalchemy.Result[tuple[int, int]] = await session.execute(
         sqlalchemy.select(
             sqlalchemy.func.count(models.SupportContribution.id),
@@ -253,3 +277,80 @@ async def totals(session: sqlalchemy.ext.asyncio.AsyncSession) -> dict[str, int]
     )
     supporters, total_minor = result.one()
     return {"supporters": int(supporters), "total_minor": int(total_minor)}
+
+
+async def _adjust_totals(
+    session: sqlalchemy.ext.asyncio.AsyncSession, *, supporters: int, total_minor: int
+) -> None:
+    """Shift the totals row within the caller's transaction.
+
+    Incremented in SQL rather than read and written back, so two webhooks
+    settling at once both count.
+    """
+
+    if not supporters and not total_minor:
+        return
+    result = await session.execute(
+        sqlalchemy.update(models.SupportTotals)
+        .where(models.SupportTotals.id == models.TOTALS_ID)
+        .values(
+            supporters=models.SupportTotals.supporters + supporters,
+            total_minor=models.SupportTotals.total_minor + total_minor,
+        )
+    )
+    if not result.rowcount:
+        # The migration seeds the row; a schema built without it starts from
+        # the ledger, which already includes this change.
+        session.add(models.SupportTotals(id=models.TOTALS_ID, **await _ledger_totals(session)))
+
+
+async def totals(session: sqlalchemy.ext.asyncio.AsyncSession) -> dict[str, int]:
+    row: models.SupportTotals | None = await session.get(models.SupportTotals, models.TOTALS_ID)
+    if row is None:
+        return await _ledger_totals(session)
+    return {"supporters": row.supporters, "total_minor": row.total_minor}
+
+
+@dataclasses.dataclass(frozen=True)
+class TotalsReconciliation:
+    """The maintained totals as found, and as recomputed from the ledger."""
+
+    stored: dict[str, int] | None
+    ledger: dict[str, int]
+
+    @property
+    def drifted(self) -> bool:
+        return self.stored != self.ledger
+
+
+async def reconcile_totals(session: sqlalchemy.ext.asyncio.AsyncSession) -> TotalsReconciliation:
+    """Recompute the totals from the ledger, correct the row, and report drift.
+
+    The row is locked before the ledger is read. A webhook that holds it has
+    committed by then, so its contribution is counted; one that arrives later
+    waits, then adjusts the corrected figure.
+    """
+
+    row: models.SupportTotals | None = await session.scalar(
+        sqlalchemy.select(models.SupportTotals)
+        .where(models.SupportTotals.id == models.TOTALS_ID)
+        .with_for_update()
+    )
+    ledger: dict[str, int] = await _ledger_totals(session)
+    report = TotalsReconciliation(
+        stored=(
+            {"supporters": row.supporters, "total_minor": row.total_minor}
+            if row is not None
+            else None
+        ),
+        ledger=ledger,
+    )
+    if row is None:
+        session.add(models.SupportTotals(id=models.TOTALS_ID, **ledger))
+    elif report.drifted:
+        row.supporters = ledger["supporters"]
+        row.total_minor = ledger["total_minor"]
+    await session.commit()
+    if report.drifted:
+        logger.warning("support.totals_drift stored=%s ledger=%s", report.stored, report.ledger)
+    return report
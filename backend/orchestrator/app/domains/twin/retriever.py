@@ -16,7 +16,9 @@ import sqlalchemy.ext.asyncio
 
 import app.auth.dependencies
 import app.core.tenancy
+import app.core.timing
 import app.db.models
+import app.domains.graph.adjacency
 import app.domains.knowledge.embedding
 
 DEFAULT_LIMIT = 12
@@ -26,6 +28,9 @@ MAX_LIMIT = 40
 CHUNK_CANDIDATE_WINDOW = 800
 #: Vector similarity leads the blend; keyword overlap keeps exact terms honest.
 VECTOR_WEIGHT = 0.7
+#: Hops walked out from the direct hits. Topics and publications sit one hop
+#: from a post; two reaches the other posts that share them.
+GRAPH_HOPS = 2
 _WORD: re.Pattern[str] = re.compile(r"[A-Za-z0-9']{3,}")
 _STOPWORDS: frozenset[str] = frozenset(
     {
@@ -94,13 +99,13 @@ def _node_text(node: app.db.models.FootprintNode) -> str:
     return " ".join(parts).lower()
 
 
-async def retrieve(
+async def _ranked_nodes(
     session: sqlalchemy.ext.asyncio.AsyncSession,
     requester: app.auth.dependencies.OwnerContext,
     graph_owner_id: str,
     question: str,
-    limit: int = DEFAULT_LIMIT,
-) -> list[app.db.models.FootprintNode]:
+    limit: int,
+) -> list[tuple[float, app.db.models.FootprintNode]]:
     visibilities: tuple[str, ...] = allowed_visibilities(requester, graph_owner_id)
     statement: sqlalchemy.Select[tuple[app.db.models.FootprintNode]] = (
         sqlalchemy.select(app.db.models.FootprintNode)
@@ -112,21 +117,79 @@ async def retrieve(
         # Bounded candidate window; replaced by a vector index when embeddings land.
         .limit(500)
     )
-    result: sqlalchemy.Result[tuple[app.db.models.FootprintNode]] = await session.execute(statement)
-    candidates: list[app.db.models.FootprintNode] = list(result.scalars().all())
+    with app.core.timing.span("node_query"):
+        result: sqlalchemy.Result[tuple[app.db.models.FootprintNode]] = await session.execute(
+            statement
+        )
+        candidates: list[app.db.models.FootprintNode] = list(result.scalars().all())
 
+    bounded: int = min(limit, MAX_LIMIT)
     terms: list[str] = _terms(question)
     if not terms:
-        return candidates[: min(limit, MAX_LIMIT)]
+        return [(1.0, node) for node in candidates[:bounded]]
 
-    scored: list[tuple[int, app.db.models.FootprintNode]] = []
+    scored: list[tuple[float, app.db.models.FootprintNode]] = []
     for node in candidates:
         text: str = _node_text(node)
         score: int = sum(text.count(term) for term in terms)
         if score:
-            scored.append((score, node))
+            scored.append((float(score), node))
     scored.sort(key=lambda pair: pair[0], reverse=True)
-    return [node for _, node in scored[: min(limit, MAX_LIMIT)]]
+    return await _expand_along_graph(
+        session, graph_owner_id, visibilities, scored[:bounded], bounded
+    )
+
+
+async def _expand_along_graph(
+    session: sqlalchemy.ext.asyncio.AsyncSession,
+    graph_owner_id: str,
+    visibilities: tuple[str, ...],
+    hits: list[tuple[float, app.db.models.FootprintNode]],
+    limit: int,
+) -> list[tuple[float, app.db.models.FootprintNode]]:
+    """Re-rank direct hits with their neighbourhood, by personalized PageRank.
+
+    The hits seed a walk over the cached adjacency, so a topic several hits
+    share, or a post that shares their topics, is found without widening the
+    candidate window. Only the few neighbours that make the cut are read, by
+    id, and visibility is checked again on those rows rather than trusted from
+    the cache.
+    """
+
+    if not hits:
+        return []
+    with app.core.timing.span("graph_expansion"):
+        adjacency = await app.domains.graph.adjacency.load(session, graph_owner_id)
+        ranks: dict[str, float] = app.domains.graph.adjacency.personalized_pagerank(
+            adjacency,
+            {node.id: score for score, node in hits},
+            allowed=visibilities,
+            hops=GRAPH_HOPS,
+        )
+        best: list[str] = sorted(ranks, key=lambda node_id: (-ranks[node_id], node_id))[:limit]
+        nodes: dict[str, app.db.models.FootprintNode] = {node.id: node for _, node in hits}
+        missing: list[str] = [node_id for node_id in best if node_id not in nodes]
+        if missing:
+            result: sqlalchemy.Result[tuple[app.db.models.FootprintNode]] = await session.execute(
+                sqlalchemy.select(app.db.models.FootprintNode).where(
+                    app.db.models.FootprintNode.owner_id == graph_owner_id,
+                    app.db.models.FootprintNode.visibility.in_(visibilities),
+                    app.db.models.FootprintNode.id.in_(missing),
+                )
+            )
+            nodes.update({node.id: node for node in result.scalars()})
+    return [(ranks[node_id], nodes[node_id]) for node_id in best if node_id in nodes]
+
+
+async def retrieve(
+    session: sqlalchemy.ext.asyncio.AsyncSession,
+    requester: app.auth.dependencies.OwnerContext,
+    graph_owner_id: str,
+    question: str,
+    limit: int = DEFAULT_LIMIT,
+) -> list[app.db.models.FootprintNode]:
+    ranked = await _ranked_nodes(session, requester, graph_owner_id, question, limit)
+    return [node for _, node in ranked]
 
 
 def to_fragments(nodes: list[app.db.models.FootprintNode]) -> list[dict[str, typing.Any]]:
@@ -203,14 +266,9 @@ async def _node_passages(
     question: str,
     limit: int,
 ) -> list[Passage]:
-    nodes: list[app.db.models.FootprintNode] = await retrieve(
+    ranked: list[tuple[float, app.db.models.FootprintNode]] = await _ranked_nodes(
         session, requester, graph_owner_id, question, limit
     )
-    terms: list[str] = _terms(question)
-    raw: list[float] = [
-        float(sum(_node_text(node).count(term) for term in terms)) if terms else 1.0
-        for node in nodes
-    ]
     return [
         Passage(
             id=node.id,
@@ -220,7 +278,7 @@ async def _node_passages(
             score=score,
             properties=node.properties or {},
         )
-        for node, score in zip(nodes, _normalized(raw), strict=True)
+        for (_, node), score in zip(ranked, _normalized([rank for rank, _ in ranked]), strict=True)
     ]
 
 
@@ -255,8 +313,9 @@ async def _chunk_candidates(
         .order_by(app.db.models.SourceVersion.created_at.desc().nullslast())
         .limit(CHUNK_CANDIDATE_WINDOW)
     )
-    result = await session.execute(statement)
-    return [(row[0], row[1], row[2]) for row in result.all()]
+    with app.core.timing.span("chunk_query"):
+        result = await session.execute(statement)
+        return [(row[0], row[1], row[2]) for row in result.all()]
 
 
 async def _chunk_passages(
@@ -343,7 +402,8 @@ async def _embed_question(question: str) -> tuple[list[float], str] | None:
     if isinstance(client, app.domains.knowledge.embedding.NullEmbeddingClient):
         return None
     try:
-        vectors: list[list[float]] = await client.embed([question])
+        with app.core.timing.span("embedding"):
+            vectors: list[list[float]] = await client.embed([question])
     except app.domains.knowledge.embedding.EmbeddingUnavailableError:
         # Degrade to keyword rather than failing the whole question.
         return None
@@ -359,25 +419,28 @@ async def retrieve_passages(
 ) -> list[Passage]:
     """Graph nodes and vault passages, ranked together into one citable set."""
 
-    # The corpus owner is the tenant being queried. Public callers still receive
-    # only public rows because visibility is resolved below from the requester.
-    await app.core.tenancy.bind_tenant(session, graph_owner_id)
+    with app.core.timing.span("retrieval"):
+        # The corpus owner is the tenant being queried. Public callers still
+        # receive only public rows because visibility is resolved below from
+        # the requester.
+        with app.core.timing.span("bind_tenant"):
+            await app.core.tenancy.bind_tenant(session, graph_owner_id)
 
-    bounded: int = min(limit, MAX_LIMIT)
-    nodes: list[Passage] = await _node_passages(
-        session, requester, graph_owner_id, question, bounded
-    )
-    chunks: list[Passage] = await _chunk_passages(
-        session, requester, graph_owner_id, question, bounded
-    )
+        bounded: int = min(limit, MAX_LIMIT)
+        nodes: list[Passage] = await _node_passages(
+            session, requester, graph_owner_id, question, bounded
+        )
+        chunks: list[Passage] = await _chunk_passages(
+            session, requester, graph_owner_id, question, bounded
+        )
 
-    # Documents answer "what did I write about this"; nodes answer "what is
-    # this". Both are kept so one cannot crowd the other out entirely.
-    reserved: int = min(len(chunks), max(1, bounded // 2)) if chunks else 0
-    merged: list[Passage] = chunks[:reserved] + nodes[: bounded - reserved]
-    merged.extend(passage for passage in chunks[reserved:] if len(merged) < bounded)
-    merged.sort(key=lambda passage: passage.score, reverse=True)
-    return merged[:bounded]
+        # Documents answer "what did I write about this"; nodes answer "what is
+        # this". Both are kept so one cannot crowd the other out entirely.
+        reserved: int = min(len(chunks), max(1, bounded // 2)) if chunks else 0
+        merged: list[Passage] = chunks[:reserved] + nodes[: bounded - reserved]
+        merged.extend(passage for passage in chunks[reserved:] if len(merged) < bounded)
+        merged.sort(key=lambda passage: passage.score, reverse=True)
+        return merged[:bounded]
 
 
 def passages_to_fragments(passages: list[Passage]) -> list[dict[str, typing.Any]]:
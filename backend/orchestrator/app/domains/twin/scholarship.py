@@ -18,6 +18,7 @@ from html.parser import HTMLParser
 
 import httpx
 
+import app.core.metrics
 import app.domains.twin.retriever as retriever
 import app.settings
 
@@ -254,7 +255,9 @@ async def search(question: str) -> list[retriever.Passage]:
     query = research_query(question)
     cached = _CACHE.get(query)
     if cached and time.monotonic() - cached[0] < CACHE_TTL_SECONDS:
+        app.core.metrics.cache_lookup("scholarship", hit=True)
         return cached[1]
+    app.core.metrics.cache_lookup("scholarship", hit=False)
 
     headers: dict[str, str] = {}
     if settings.SEMANTIC_SCHOLAR_API_KEY:
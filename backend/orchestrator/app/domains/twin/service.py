@@ -13,6 +13,8 @@ import typing
 import sqlalchemy.ext.asyncio
 
 import app.auth.dependencies
+import app.core.metrics
+import app.core.timing
 import app.db.models
 import app.domains.twin.boundary as boundary
 import app.domains.twin.constitution as constitution
@@ -101,6 +103,7 @@ def _social_response(question: str) -> schemas.TwinAskResponse | None:
 
 
 def _refuse(code: str) -> schemas.TwinAskResponse:
+    app.core.metrics.TWIN_REFUSALS.labels(code).inc()
     return schemas.TwinAskResponse(
         answer=_REFUSAL_TEXT[code], citations=[], grounded=False, refusal_code=code
     )
@@ -350,7 +353,8 @@ async def _with_scholarship(
     # A question such as "where is this weakest?" needs the retrieved passage
     # to make sense to an academic index. Only released canon is included here.
     research_prompt = f"{question}\n{canon[0].text[:500]}"
-    found = await scholarship.search(research_prompt)
+    with app.core.timing.span("scholarship"):
+        found = await scholarship.search(research_prompt)
     return [*passages, *found], bool(found)
 
 
@@ -430,12 +434,14 @@ async def ask(
 
     resolved: model.ModelClient = client or model.get_model_client()
     try:
-        raw: str = await resolved.complete(system=SYSTEM_PROMPT, user=user_message)
+        with app.core.timing.span("model"):
+            raw: str = await resolved.complete(system=SYSTEM_PROMPT, user=user_message)
     except model.ModelUnavailableError:
         return _extractive_fallback(passages, payload.question)
 
     try:
-        parsed: boundary.ModelOutput = boundary.parse_model_output(raw)
+        with app.core.timing.span("boundary_parse"):
+            parsed: boundary.ModelOutput = boundary.parse_model_output(raw)
     except boundary.BoundaryViolation:
         # Malformed output is a refusal, not a retry (HKI-2).
         return _refuse(REFUSAL_BOUNDARY_VIOLATION)
@@ -452,9 +458,8 @@ async def ask(
         # traceable to the member's graph. Drop it rather than ship it.
         return _refuse(REFUSAL_UNGROUNDED)
 
-    return schemas.TwinAskResponse(
-        answer=parsed.answer,
-        citations=[
+    with app.core.timing.span("citation_anchors"):
+        citations: list[schemas.Citation] = [
             schemas.Citation(
                 node_id=passage_id,
                 kind=retrieved[passage_id].kind,
@@ -462,9 +467,8 @@ async def ask(
                 locator=_locator_with_heading(retrieved[passage_id], payload.question),
             )
             for passage_id in cited
-        ],
-        grounded=True,
-    )
+        ]
+    return schemas.TwinAskResponse(answer=parsed.answer, citations=citations, grounded=True)
 
 
 async def record_feedback(
@@ -632,12 +636,15 @@ async def ask_stream(
     accumulated = ""
     shown = 0
     try:
-        async for chunk in client.stream(system=SYSTEM_PROMPT, user=user_message):
-            accumulated += chunk.text
-            partial = _partial_answer(accumulated)
-            if len(partial) > shown:
-                yield {"event": "delta", "text": partial[shown:]}
-                shown = len(partial)
+        # Includes time the consumer spends on each delta; a slow client reads
+        # as a slow model here, which is the latency the reader experiences.
+        with app.core.timing.span("model"):
+            async for chunk in client.stream(system=SYSTEM_PROMPT, user=user_message):
+                accumulated += chunk.text
+                partial = _partial_answer(accumulated)
+                if len(partial) > shown:
+                    yield {"event": "delta", "text": partial[shown:]}
+                    shown = len(partial)
     except model.ModelUnavailableError:
         # Fall back to the cited released prose so a model outage still teaches.
         fallback = _extractive_fallback(passages, payload.question)
@@ -651,7 +658,8 @@ async def ask_stream(
 
     # The object is complete — now enforce the boundary on the whole thing.
     try:
-        parsed: boundary.ModelOutput = boundary.parse_model_output(accumulated)
+        with app.core.timing.span("boundary_parse"):
+            parsed: boundary.ModelOutput = boundary.parse_model_output(accumulated)
     except boundary.BoundaryViolation:
         refusal = _refuse(REFUSAL_BOUNDARY_VIOLATION)
         yield {"event": "refused", "answer": refusal.answer, "refusal_code": refusal.refusal_code}
@@ -675,10 +683,8 @@ async def ask_stream(
     if len(final_answer) > shown:
         yield {"event": "delta", "text": final_answer[shown:]}
 
-    yield {
-        "event": "done",
-        "answer": final_answer,
-        "citations": [
+    with app.core.timing.span("citation_anchors"):
+        citations: list[dict[str, typing.Any]] = [
             schemas.Citation(
                 node_id=pid,
                 kind=retrieved[pid].kind,
@@ -686,6 +692,5 @@ async def ask_stream(
                 locator=_locator_with_heading(retrieved[pid], payload.question),
             ).model_dump()
             for pid in cited
-        ],
-        "grounded": True,
-    }
+        ]
+    yield {"event": "done", "answer": final_answer, "citations": citations, "grounded": True}
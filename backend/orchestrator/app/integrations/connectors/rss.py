@@ -10,6 +10,10 @@ import re
 import xml.etree.ElementTree as ET
 
 
+class FeedParseError(ValueError):
+    """The document is not a feed this parser reads, or is not well-formed."""
+
+
 @dataclasses.dataclass(frozen=True)
 class RssFeedItem:
     title: str
@@ -32,6 +36,20 @@ def stable_external_id(prefix: str, value: str, *, max_length: int = 64) -> str:
     return f"{prefix}:{digest}"[:max_length]
 
 
+def item_hash(item: RssFeedItem) -> str:
+    """Digest of everything an import writes for an item, for change detection."""
+
+    published: str = item.published_at.isoformat() if item.published_at else ""
+    fields: tuple[str, ...] = (
+        item.title,
+        item.link or "",
+        published,
+        item.excerpt or "",
+        "\x1f".join(item.tags),
+    )
+    return hashlib.sha256("\x1e".join(fields).encode("utf-8")).hexdigest()[:32]
+
+
 def stable_slug(value: str, *, max_length: int = 120) -> str:
     slug: str = re.sub(r"[^a-zA-Z0-9]+", "-", value.strip().lower()).strip("-")
     return slug[:max_length] or "untitled"
@@ -93,33 +111,22 @@ def _atom_link(entry: ET.Element) -> str | None:
     return None
 
 
-def _parse_rss_channel(channel: ET.Element, fallback_title: str) -> RssFeed:
-    title: str = _clean_text(
-        _text(_first_child(channel, "title")) or fallback_title, max_length=200
+def _rss_item(item: ET.Element) -> RssFeedItem | None:
+    item_title: str = _clean_text(_text(_first_child(item, "title")), max_length=300)
+    item_link: str | None = _text(_first_child(item, "link")) or None
+    guid: str = _text(_first_child(item, "guid")) or item_link or item_title
+    description: str = _text(_first_child(item, "description"))
+    pub_date: str = _text(_first_child(item, "pubdate"))
+    if not item_title and not item_link:
+        return None
+    return RssFeedItem(
+        title=item_title or item_link or "Untitled post",
+        link=item_link,
+        external_id=stable_external_id("post", guid),
+        published_at=_parse_date(pub_date),
+        excerpt=_clean_text(description) if description else None,
+        tags=_rss_categories(item),
     )
-    link: str | None = _text(_first_child(channel, "link")) or None
-    parsed_items: list[RssFeedItem] = []
-
-    for item in _children(channel, "item"):
-        item_title: str = _clean_text(_text(_first_child(item, "title")), max_length=300)
-        item_link: str | None = _text(_first_child(item, "link")) or None
-        guid: str = _text(_first_child(item, "guid")) or item_link or item_title
-        description: str = _text(_first_child(item, "description"))
-        pub_date: str = _text(_first_child(item, "pubdate"))
-        if not item_title and not item_link:
-            continue
-        parsed_items.append(
-            RssFeedItem(
-                title=item_title or item_link or "Untitled post",
-                link=item_link,
-                external_id=stable_external_id("post", guid),
-                published_at=_parse_date(pub_date),
-                excerpt=_clean_text(description) if description else None,
-                tags=_rss_categories(item),
-            )
-        )
-
-    return RssFeed(title=title, link=link, items=tuple(parsed_items))
 
 
 def _atom_categories(entry: ET.Element) -> tuple[str, ...]:
@@ -130,51 +137,129 @@ def _atom_categories(entry: ET.Element) -> tuple[str, ...]:
     return tuple(sorted({value for value in values if value}))
 
 
-def _parse_atom_feed(root: ET.Element, fallback_title: str) -> RssFeed:
-    title: str = _clean_text(_text(_first_child(root, "title")) or fallback_title, max_length=200)
-    link: str | None = _atom_link(root)
-    parsed_items: list[RssFeedItem] = []
-
-    for entry in _children(root, "entry"):
-        item_title: str = _clean_text(_text(_first_child(entry, "title")), max_length=300)
-        item_link: str | None = _atom_link(entry)
-        entry_id: str = _text(_first_child(entry, "id")) or item_link or item_title
-        summary: str = _text(_first_child(entry, "summary")) or _text(
-            _first_child(entry, "content")
-        )
-        updated: str = _text(_first_child(entry, "published")) or _text(
-            _first_child(entry, "updated")
-        )
-        if not item_title and not item_link:
-            continue
-        parsed_items.append(
-            RssFeedItem(
-                title=item_title or item_link or "Untitled post",
-                link=item_link,
-                external_id=stable_external_id("post", entry_id),
-                published_at=_parse_date(updated),
-                excerpt=_clean_text(summary) if summary else None,
-                tags=_atom_categories(entry),
-            )
-        )
-
-    return RssFeed(title=title, link=link, items=tuple(parsed_items))
-
-
-def parse_feed(xml_text: str, *, fallback_title: str = "Imported publication") -> RssFeed:
-    root: ET.Element[str] = ET.fromstring(xml_text)
-    root_name: str = _local_name(root.tag)
-
-    if root_name == "rss":
-        channel: ET.Element[str] | None = _first_child(root, "channel")
-        if channel is None:
-            raise ValueError("RSS feed is missing channel.")
-        return _parse_rss_channel(channel, fallback_title)
+def _atom_item(entry: ET.Element) -> RssFeedItem | None:
+    item_title: str = _clean_text(_text(_first_child(entry, "title")), max_length=300)
+    item_link: str | None = _atom_link(entry)
+    entry_id: str = _text(_first_child(entry, "id")) or item_link or item_title
+    summary: str = _text(_first_child(entry, "summary")) or _text(_first_child(entry, "content"))
+    updated: str = _text(_first_child(entry, "published")) or _text(_first_child(entry, "updated"))
+    if not item_title and not item_link:
+        return None
+    return RssFeedItem(
+        title=item_title or item_link or "Untitled post",
+        link=item_link,
+        external_id=stable_external_id("post", entry_id),
+        published_at=_parse_date(updated),
+        excerpt=_clean_text(summary) if summary else None,
+        tags=_atom_categories(entry),
+    )
 
-    if root_name == "feed":
-        return _parse_atom_feed(root, fallback_title)
 
-    raise ValueError(f"Unsupported feed root: {root_name}.")
+class FeedParser:
+    """Parse an RSS or Atom feed from chunks as they arrive.
+
+    Each item is built when its closing tag is read and then dropped from the
+    tree, so memory follows the largest item rather than the whole feed. Once
+    `max_items` items are parsed, `done` is set and the rest of the document
+    need not be read. Only what precedes the items (title, link) is kept.
+    """
+
+    def __init__(
+        self, *, fallback_title: str = "Imported publication", max_items: int | None = None
+    ) -> None:
+        self.fallback_title: str = fallback_title
+        self.max_items: int | None = max_items
+        self.items: list[RssFeedItem] = []
+        self._parser = ET.XMLPullParser(events=("start", "end"))
+        self._stack: list[ET.Element] = []
+        self._root: ET.Element | None = None
+        self._done: bool = False
+
+    @property
+    def done(self) -> bool:
+        return self._done
+
+    def feed(self, data: bytes | str) -> list[RssFeedItem]:
+        """Parse one chunk; return the items it completed."""
+
+        if self._done:
+            return []
+        parsed: list[RssFeedItem] = []
+        try:
+            self._parser.feed(data)
+            events = list(self._parser.read_events())
+        except ET.ParseError as exc:
+            raise FeedParseError("Feed is not well-formed XML.") from exc
+        for event, element in events:
+            if event == "start":
+                if self._root is None:
+                    root_name: str = _local_name(element.tag)
+                    if root_name not in {"rss", "feed"}:
+                        raise FeedParseError(f"Unsupported feed root: {root_name}.")
+                    self._root = element
+                self._stack.append(element)
+                continue
+            self._stack.pop()
+            item: RssFeedItem | None = self._item(element)
+            if item is not None:
+                parsed.append(item)
+                if self.max_items is not None and len(self.items) + len(parsed) >= self.max_items:
+                    self._done = True
+                    break
+        self.items.extend(parsed)
+        return parsed
+
+    def _item(self, element: ET.Element) -> RssFeedItem | None:
+        """Build an item if `element` is one, and drop it from the tree."""
+
+        if not self._stack:
+            return None
+        parent: ET.Element = self._stack[-1]
+        name: str = _local_name(element.tag)
+        parent_name: str = _local_name(parent.tag)
+        if name == "item" and parent_name == "channel" and len(self._stack) == 2:
+            item: RssFeedItem | None = _rss_item(element)
+        elif name == "entry" and parent is self._root and parent_name == "feed":
+            item = _atom_item(element)
+        else:
+            return None
+        parent.remove(element)
+        return item
+
+    def close(self) -> RssFeed:
+        """The feed so far. Checks the document is complete unless stopped early."""
+
+        if not self._done:
+            try:
+                self._parser.close()
+            except ET.ParseError as exc:
+                raise FeedParseError("Feed ended before the document did.") from exc
+        if self._root is None:
+            raise FeedParseError("Feed is empty.")
+        if _local_name(self._root.tag) == "rss":
+            channel: ET.Element | None = _first_child(self._root, "channel")
+            if channel is None:
+                raise FeedParseError("RSS feed is missing channel.")
+            title_source: ET.Element = channel
+            link: str | None = _text(_first_child(channel, "link")) or None
+        else:
+            title_source = self._root
+            link = _atom_link(self._root)
+        title: str = _clean_text(
+            _text(_first_child(title_source, "title")) or self.fallback_title, max_length=200
+        )
+        return RssFeed(title=title, link=link, items=tuple(self.items))
+
+
+def parse_feed(
+    xml: str | bytes,
+    *,
+    fallback_title: str = "Imported publication",
+    max_items: int | None = None,
+) -> RssFeed:
+    parser = FeedParser(fallback_title=fallback_title, max_items=max_items)
+    parser.feed(xml)
+    return parser.close()
 
 
 def normalize_topics(
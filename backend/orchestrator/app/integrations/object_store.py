@@ -1,14 +1,36 @@
 from __future__ import annotations
 
+import asyncio
+import collections.abc
+import concurrent.futures
+import contextlib
+import functools
 import json
+import math
+import mmap
+import os
 import pathlib
+import shutil
 import typing
+import uuid
+import weakref
 
 import aioboto3
+import botocore.config
 import botocore.exceptions
 
 import app.settings
 
+#: Connections each loop's S3 client keeps open. Release snapshots fan out
+#: `SNAPSHOT_CONCURRENCY` requests at a time, well inside this.
+S3_MAX_POOL_CONNECTIONS = 32
+#: S3 requires parts of at least 5 MiB, except the last.
+MULTIPART_PART_SIZE = 8 * 1024 * 1024
+STREAM_CHUNK_SIZE = 64 * 1024
+PRESIGNED_PUT_SECONDS = 15 * 60
+
+T = typing.TypeVar("T")
+
 
 class ObjectStoreError(RuntimeError):
     """Raised when an object store operation fails."""
@@ -19,9 +41,47 @@ class ObjectNotFoundError(ObjectStoreError):
 
 
 class FilesystemObjectStore:
-    def __init__(self, root: str | pathlib.Path, bucket: str) -> None:
+    """Objects as files under `root/bucket`, for development and single hosts.
+
+    File I/O blocks, so every read and write runs on a small thread pool of
+    the store's own rather than on the event loop: a large upload no longer
+    stalls the requests around it, and the pool bounds how many threads disk
+    I/O can take. Writes go to a temporary name and are renamed into place,
+    so readers never see a partial object; with `fsync` the data and the
+    rename are flushed to disk before the write returns.
+    """
+
+    def __init__(
+        self,
+        root: str | pathlib.Path,
+        bucket: str,
+        *,
+        fsync: bool = True,
+        io_threads: int = 8,
+    ) -> None:
         self.root: pathlib.Path = pathlib.Path(root).expanduser()
         self.bucket: str = bucket
+        self.fsync: bool = fsync
+        self.io_threads: int = io_threads
+        self._executor: concurrent.futures.ThreadPoolExecutor | None = None
+
+    async def open(self) -> None:
+        self._pool()
+
+    async def close(self) -> None:
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def _pool(self) -> concurrent.futures.ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.io_threads, thread_name_prefix="object-store"
+            )
+        return self._executor
+
+    async def _run(self, function: collections.abc.Callable[..., T], *args: typing.Any) -> T:
+        return await asyncio.get_running_loop().run_in_executor(self._pool(), function, *args)
 
     def _path_for(self, key: str) -> pathlib.Path:
         bucket_root: pathlib.Path = (self.root / self.bucket).resolve()
@@ -32,58 +92,209 @@ class FilesystemObjectStore:
             raise ObjectStoreError(f"Object key escapes storage root: {key}") from exc
         return path
 
+    def _open_temporary(self, path: pathlib.Path) -> tuple[pathlib.Path, typing.BinaryIO]:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path: pathlib.Path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+        return tmp_path, tmp_path.open("wb")
+
+    def _commit(self, handle: typing.BinaryIO, tmp_path: pathlib.Path, path: pathlib.Path) -> None:
+        """Close a temporary file and rename it over `path`, durably if asked."""
+
+        with handle:
+            if self.fsync:
+                handle.flush()
+                os.fsync(handle.fileno())
+        tmp_path.replace(path)
+        if self.fsync:
+            # The rename is only durable once the directory entry is.
+            directory: int = os.open(path.parent, os.O_RDONLY)
+            try:
+                os.fsync(directory)
+            finally:
+                os.close(directory)
+
+    def _write(self, path: pathlib.Path, data: bytes) -> None:
+        tmp_path, handle = self._open_temporary(path)
+        try:
+            handle.write(data)
+            self._commit(handle, tmp_path, path)
+        finally:
+            handle.close()
+            tmp_path.unlink(missing_ok=True)
+
     async def put_json(self, key: str, payload: dict[str, typing.Any]) -> None:
+        body: str = json.dumps(payload, indent=2, sort_keys=True) + "\n"
+        await self.put_bytes(key, body.encode("utf-8"))
+
+    async def put_bytes(self, key: str, data: bytes) -> None:
         path: pathlib.Path = self._path_for(key)
-        path.parent.mkdir(parents=True, exist_ok=True)
-        tmp_path: pathlib.Path = path.with_name(f".{path.name}.tmp")
         try:
-            tmp_path.write_text(
-                json.dumps(payload, indent=2, sort_keys=True) + "\n",
-                encoding="utf-8",
-            )
-            tmp_path.replace(path)
+            await self._run(self._write, path, data)
         except OSError as exc:
             raise ObjectStoreError(f"Could not write object: {key}") from exc
 
-    async def put_bytes(self, key: str, data: bytes) -> None:
+    async def put_stream(
+        self,
+        key: str,
+        chunks: collections.abc.AsyncIterable[bytes],
+        content_type: str = "application/octet-stream",
+    ) -> int:
         path: pathlib.Path = self._path_for(key)
-        path.parent.mkdir(parents=True, exist_ok=True)
-        tmp_path: pathlib.Path = path.with_name(f".{path.name}.tmp")
+        size: int = 0
         try:
-            tmp_path.write_bytes(data)
-            tmp_path.replace(path)
+            tmp_path, handle = await self._run(self._open_temporary, path)
         except OSError as exc:
             raise ObjectStoreError(f"Could not write object: {key}") from exc
+        try:
+            async for chunk in chunks:
+                await self._run(handle.write, chunk)
+                size += len(chunk)
+            await self._run(self._commit, handle, tmp_path, path)
+        except OSError as exc:
+            raise ObjectStoreError(f"Could not write object: {key}") from exc
+        finally:
+            await self._run(handle.close)
+            await self._run(functools.partial(tmp_path.unlink, missing_ok=True))
+        return size
 
     async def get_json(self, key: str) -> dict[str, typing.Any]:
+        data: bytes = await self.get_bytes(key)
+        try:
+            return json.loads(data.decode("utf-8"))
+        except (UnicodeDecodeError, json.JSONDecodeError) as exc:
+            raise ObjectStoreError(f"Could not read object: {key}") from exc
+
+    async def get_text(self, key: str) -> str:
+        return (await self.get_bytes(key)).decode("utf-8")
+
+    async def get_stream(
+        self,
+        key: str,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+        *,
+        offset: int = 0,
+        length: int | None = None,
+    ) -> collections.abc.AsyncIterator[bytes]:
         path: pathlib.Path = self._path_for(key)
         try:
-            return json.loads(path.read_text(encoding="utf-8"))
+            handle: typing.BinaryIO = await self._run(path.open, "rb")
         except FileNotFoundError as exc:
             raise ObjectNotFoundError(f"Object not found: {key}") from exc
-        except (OSError, json.JSONDecodeError) as exc:
+        except OSError as exc:
+            raise ObjectStoreError(f"Could not read object: {key}") from exc
+        try:
+            if offset:
+                await self._run(handle.seek, offset)
+            remaining: float = math.inf if length is None else length
+            while remaining > 0:
+                chunk: bytes = await self._run(handle.read, int(min(chunk_size, remaining)))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+        finally:
+            await self._run(handle.close)
+
+    async def size(self, key: str) -> int:
+        try:
+            return (await self._run(self._path_for(key).stat)).st_size
+        except FileNotFoundError as exc:
+            raise ObjectNotFoundError(f"Object not found: {key}") from exc
+        except OSError as exc:
             raise ObjectStoreError(f"Could not read object: {key}") from exc
 
-    async def get_text(self, key: str) -> str:
+    @contextlib.asynccontextmanager
+    async def get_buffer(self, key: str) -> collections.abc.AsyncIterator[memoryview]:
+        """The object memory-mapped, read without copying it into the process.
+
+        Pages are read in as the view is touched. The view is released on
+        exit, so slices of it must not outlive the block.
+        """
+
         path: pathlib.Path = self._path_for(key)
         try:
-            return path.read_text(encoding="utf-8")
+            mapped: mmap.mmap | None = await self._run(_map_file, path)
         except FileNotFoundError as exc:
             raise ObjectNotFoundError(f"Object not found: {key}") from exc
         except OSError as exc:
             raise ObjectStoreError(f"Could not read object: {key}") from exc
+        if mapped is None:
+            yield memoryview(b"")
+            return
+        view = memoryview(mapped)
+        try:
+            yield view
+        finally:
+            view.release()
+            mapped.close()
+
+    async def exists(self, key: str) -> bool:
+        return await self._run(self._path_for(key).is_file)
+
+    async def presigned_put_url(
+        self, key: str, *, content_type: str, size: int, expires_in: int = 0
+    ) -> str | None:
+        """Files have no URL of their own, so uploads go through the API."""
+
+        return None
+
+    def _link(self, source: pathlib.Path, path: pathlib.Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path: pathlib.Path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            try:
+                os.link(source, tmp_path)
+            except OSError:
+                # Another device, or a filesystem without links.
+                shutil.copyfile(source, tmp_path)
+            tmp_path.replace(path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+    async def copy(self, source_key: str, destination_key: str) -> None:
+        """Hard-link when source and destination share a filesystem, else copy.
+
+        Objects are never rewritten in place (writes replace the file), so a
+        link can never see a later write to the other name.
+        """
+        source: pathlib.Path = self._path_for(source_key)
+        path: pathlib.Path = self._path_for(destination_key)
+        try:
+            await self._run(self._link, source, path)
+        except FileNotFoundError as exc:
+            raise ObjectNotFoundError(f"Object not found: {source_key}") from exc
+        except OSError as exc:
+            raise ObjectStoreError(f"Could not write object: {destination_key}") from exc
 
     async def get_bytes(self, key: str) -> bytes:
         path: pathlib.Path = self._path_for(key)
         try:
-            return path.read_bytes()
+            return await self._run(path.read_bytes)
         except FileNotFoundError as exc:
             raise ObjectNotFoundError(f"Object not found: {key}") from exc
         except OSError as exc:
             raise ObjectStoreError(f"Could not read object: {key}") from exc
 
 
+def _map_file(path: pathlib.Path) -> mmap.mmap | None:
+    """A read-only map of the file, or None when it is empty (which cannot be mapped)."""
+
+    with path.open("rb") as handle:
+        if os.fstat(handle.fileno()).st_size == 0:
+            return None
+        return mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+
+
 class S3ObjectStore:
+    """S3 (or a compatible service) through one long-lived client per event loop.
+
+    Opening a client resolves the endpoint, loads the service model and builds a
+    connection pool, which costs more than the request that follows. The client
+    is opened once, on first use or in the app lifespan, and kept until
+    `close`. Pooled connections belong to the loop that opened them, so the API
+    loop and each worker loop get their own.
+    """
+
     def __init__(
         self,
         bucket: str,
@@ -99,17 +310,55 @@ class S3ObjectStore:
             region_name=region_name,
         )
         self.endpoint_url: str | None = endpoint_url
+        self._clients: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, tuple[contextlib.AsyncExitStack, typing.Any]
+        ] = weakref.WeakKeyDictionary()
+        self._opening: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock] = (
+            weakref.WeakKeyDictionary()
+        )
+
+    async def _client(self) -> typing.Any:
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        opened = self._clients.get(loop)
+        if opened is not None:
+            return opened[1]
+        async with self._opening.setdefault(loop, asyncio.Lock()):
+            opened = self._clients.get(loop)
+            if opened is None:
+                stack = contextlib.AsyncExitStack()
+                s3 = await stack.enter_async_context(
+                    self.session.client(
+                        "s3",
+                        endpoint_url=self.endpoint_url,
+                        config=botocore.config.Config(
+                            max_pool_connections=S3_MAX_POOL_CONNECTIONS,
+                            tcp_keepalive=True,
+                            # SigV4, so presigned PUTs can sign the body's length.
+                            signature_version="s3v4",
+                        ),
+                    )
+                )
+                opened = self._clients[loop] = (stack, s3)
+        return opened[1]
+
+    async def open(self) -> None:
+        await self._client()
+
+    async def close(self) -> None:
+        opened = self._clients.pop(asyncio.get_running_loop(), None)
+        if opened is not None:
+            await opened[0].aclose()
 
     async def put_json(self, key: str, payload: dict[str, typing.Any]) -> None:
         body: str = json.dumps(payload, indent=2, sort_keys=True)
         try:
-            async with self.session.client("s3", endpoint_url=self.endpoint_url) as s3:
-                await s3.put_object(
-                    Bucket=self.bucket,
-                    Key=key,
-                    Body=body.encode("utf-8"),
-                    ContentType="application/json",
-                )
+            s3 = await self._client()
+            await s3.put_object(
+                Bucket=self.bucket,
+                Key=key,
+                Body=body.encode("utf-8"),
+                ContentType="application/json",
+            )
         except Exception as exc:
             raise ObjectStoreError(f"Could not write object: {key}") from exc
 
@@ -117,22 +366,87 @@ class S3ObjectStore:
         self, key: str, data: bytes, content_type: str = "application/octet-stream"
     ) -> None:
         try:
-            async with self.session.client("s3", endpoint_url=self.endpoint_url) as s3:
-                await s3.put_object(
-                    Bucket=self.bucket,
-                    Key=key,
-                    Body=data,
-                    ContentType=content_type,
-                )
+            s3 = await self._client()
+            await s3.put_object(
+                Bucket=self.bucket,
+                Key=key,
+                Body=data,
+                ContentType=content_type,
+            )
         except Exception as exc:
             raise ObjectStoreError(f"Could not write object: {key}") from exc
 
+    async def put_stream(
+        self,
+        key: str,
+        chunks: collections.abc.AsyncIterable[bytes],
+        content_type: str = "application/octet-stream",
+    ) -> int:
+        """Write a body of unknown length without holding it, returning its size.
+
+        Up to one part is buffered. A body that fits in it is a single
+        PutObject; a larger one becomes a multipart upload of
+        `MULTIPART_PART_SIZE` parts, aborted if anything fails so no orphaned
+        parts are billed. Errors raised by `chunks` itself propagate unchanged.
+        """
+
+        s3 = await self._client()
+        buffer = bytearray()
+        size: int = 0
+        upload_id: str | None = None
+        parts: list[dict[str, typing.Any]] = []
+
+        async def upload_part(data: bytes) -> None:
+            response = await s3.upload_part(
+                Bucket=self.bucket,
+                Key=key,
+                UploadId=upload_id,
+                PartNumber=len(parts) + 1,
+                Body=data,
+            )
+            parts.append({"ETag": response["ETag"], "PartNumber": len(parts) + 1})
+
+        try:
+            async for chunk in chunks:
+                size += len(chunk)
+                buffer += chunk
+                while len(buffer) >= MULTIPART_PART_SIZE:
+                    if upload_id is None:
+                        created = await s3.create_multipart_upload(
+                            Bucket=self.bucket, Key=key, ContentType=content_type
+                        )
+                        upload_id = created["UploadId"]
+                    await upload_part(bytes(buffer[:MULTIPART_PART_SIZE]))
+                    del buffer[:MULTIPART_PART_SIZE]
+            if upload_id is None:
+                await s3.put_object(
+                    Bucket=self.bucket, Key=key, Body=bytes(buffer), ContentType=content_type
+                )
+                return size
+            if buffer:
+                await upload_part(bytes(buffer))
+            await s3.complete_multipart_upload(
+                Bucket=self.bucket,
+                Key=key,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": parts},
+            )
+            return size
+        except BaseException as exc:
+            if upload_id is not None:
+                with contextlib.suppress(Exception):
+                    await s3.abort_multipart_upload(Bucket=self.bucket, Key=key, UploadId=upload_id)
+            if isinstance(exc, botocore.exceptions.BotoCoreError | botocore.exceptions.ClientError):
+                raise ObjectStoreError(f"Could not write object: {key}") from exc
+            raise
+
     async def get_json(self, key: str) -> dict[str, typing.Any]:
         try:
-            async with self.session.client("s3", endpoint_url=self.endpoint_url) as s3:
-                response = await s3.get_object(Bucket=self.bucket, Key=key)
-                body = await response["Body"].read()
-                return json.loads(body.decode("utf-8"))
+            s3 = await self._client()
+            response = await s3.get_object(Bucket=self.bucket, Key=key)
+            async with response["Body"] as stream:
+                body = await stream.read()
+            return json.loads(body.decode("utf-8"))
         except botocore.exceptions.ClientError as exc:
             if exc.response["Error"]["Code"] == "NoSuchKey":
                 raise ObjectNotFoundError(f"Object not found: {key}") from exc
@@ -141,40 +455,166 @@ class S3ObjectStore:
             raise ObjectStoreError(f"Could not read object: {key}") from exc
 
     async def get_text(self, key: str) -> str:
+        return (await self.get_bytes(key)).decode("utf-8")
+
+    async def get_stream(
+        self,
+        key: str,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+        *,
+        offset: int = 0,
+        length: int | None = None,
+    ) -> collections.abc.AsyncIterator[bytes]:
+        """The object's bytes as they arrive; a missing key fails on the first chunk.
+
+        `offset` and `length` become a ranged GET, so only that slice is sent.
+        """
+
+        options: dict[str, str] = {}
+        if offset or length is not None:
+            last: str = "" if length is None else str(offset + length - 1)
+            options["Range"] = f"bytes={offset}-{last}"
         try:
-            async with self.session.client("s3", endpoint_url=self.endpoint_url) as s3:
-                response = await s3.get_object(Bucket=self.bucket, Key=key)
-                body = await response["Body"].read()
-                return body.decode("utf-8")
+            s3 = await self._client()
+            response = await s3.get_object(Bucket=self.bucket, Key=key, **options)
         except botocore.exceptions.ClientError as exc:
             if exc.response["Error"]["Code"] == "NoSuchKey":
                 raise ObjectNotFoundError(f"Object not found: {key}") from exc
             raise ObjectStoreError(f"Could not read object: {key}") from exc
+        # Closing the body hands its connection back to the pool, even when the
+        # consumer stops early.
+        async with response["Body"] as body:
+            async for chunk in body.iter_chunks(chunk_size):
+                yield chunk
+
+    @contextlib.asynccontextmanager
+    async def get_buffer(self, key: str) -> collections.abc.AsyncIterator[memoryview]:
+        """The object's bytes as a view, matching the filesystem store's map."""
+
+        yield memoryview(await self.get_bytes(key))
+
+    async def size(self, key: str) -> int:
+        try:
+            s3 = await self._client()
+            response = await s3.head_object(Bucket=self.bucket, Key=key)
+            return response["ContentLength"]
+        except botocore.exceptions.ClientError as exc:
+            if exc.response["Error"]["Code"] in {"404", "NoSuchKey", "NotFound"}:
+                raise ObjectNotFoundError(f"Object not found: {key}") from exc
+            raise ObjectStoreError(f"Could not read object: {key}") from exc
+
+    async def exists(self, key: str) -> bool:
+        try:
+            s3 = await self._client()
+            await s3.head_object(Bucket=self.bucket, Key=key)
+            return True
+        except botocore.exceptions.ClientError as exc:
+            # HEAD has no body, so a missing key comes back as a bare 404.
+            if exc.response["Error"]["Code"] in {"404", "NoSuchKey", "NotFound"}:
+                return False
+            raise ObjectStoreError(f"Could not read object: {key}") from exc
+
+    async def copy(self, source_key: str, destination_key: str) -> None:
+        """Server-side CopyObject: the bytes never leave the bucket."""
+
+        try:
+            s3 = await self._client()
+            await s3.copy_object(
+                Bucket=self.bucket,
+                Key=destination_key,
+                CopySource={"Bucket": self.bucket, "Key": source_key},
+            )
+        except botocore.exceptions.ClientError as exc:
+            if exc.response["Error"]["Code"] == "NoSuchKey":
+                raise ObjectNotFoundError(f"Object not found: {source_key}") from exc
+            raise ObjectStoreError(f"Could not write object: {destination_key}") from exc
+
+    async def presigned_put_url(
+        self, key: str, *, content_type: str, size: int, expires_in: int = PRESIGNED_PUT_SECONDS
+    ) -> str:
+        """A URL that accepts exactly one body of `size` bytes for `key`.
+
+        Length and type are signed headers, so S3 refuses a PUT of any other
+        size: the upload cap holds even though the bytes never reach the API.
+        """
+
+        try:
+            s3 = await self._client()
+            return await s3.generate_presigned_url(
+                "put_object",
+                Params={
+                    "Bucket": self.bucket,
+                    "Key": key,
+                    "ContentType": content_type,
+                    "ContentLength": size,
+                },
+                ExpiresIn=expires_in,
+            )
+        except (botocore.exceptions.BotoCoreError, botocore.exceptions.ClientError) as exc:
+            raise ObjectStoreError(f"Could not sign an upload for: {key}") from exc
 
     async def get_bytes(self, key: str) -> bytes:
         try:
-            async with self.session.client("s3", endpoint_url=self.endpoint_url) as s3:
-                response = await s3.get_object(Bucket=self.bucket, Key=key)
-                return await response["Body"].read()
+            s3 = await self._client()
+            response = await s3.get_object(Bucket=self.bucket, Key=key)
+            async with response["Body"] as stream:
+                return await stream.read()
         except botocore.exceptions.ClientError as exc:
             if exc.response["Error"]["Code"] == "NoSuchKey":
                 raise ObjectNotFoundError(f"Object not found: {key}") from exc
             raise ObjectStoreError(f"Could not read object: {key}") from exc
 
 
+_stores: dict[tuple[typing.Any, ...], FilesystemObjectStore | S3ObjectStore] = {}
+
+
 def get_object_store() -> FilesystemObjectStore | S3ObjectStore:
+    """The process's store for the current settings.
+
+    One instance per configuration, so its client and connection pool are
+    shared by every caller instead of rebuilt per request. Changed settings
+    (tests, a reload) get a store of their own.
+    """
+
     settings: app.settings.Settings = app.settings.get_settings()
+    endpoint_url: str | None = (
+        settings.object_store_endpoint if settings.object_store_endpoint else None
+    )
+    config: tuple[typing.Any, ...] = (
+        settings.object_store_backend,
+        settings.object_store_bucket,
+        endpoint_url,
+        settings.AWS_REGION,
+        settings.AWS_ACCESS_KEY_ID,
+        settings.AWS_SECRET_ACCESS_KEY,
+        settings.local_object_store_root,
+        settings.LOCAL_OBJECT_STORE_FSYNC,
+        settings.LOCAL_OBJECT_STORE_IO_THREADS,
+    )
+    store: FilesystemObjectStore | S3ObjectStore | None = _stores.get(config)
+    if store is not None:
+        return store
 
     if settings.object_store_backend == "s3":
-        return S3ObjectStore(
+        store = S3ObjectStore(
             bucket=settings.object_store_bucket,
-            endpoint_url=settings.object_store_endpoint if settings.object_store_endpoint else None,
+            endpoint_url=endpoint_url,
             region_name=settings.AWS_REGION,
             aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
             aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
         )
+    else:
+        store = FilesystemObjectStore(
+            root=settings.local_object_store_root,
+            bucket=settings.object_store_bucket,
+            fsync=settings.LOCAL_OBJECT_STORE_FSYNC,
+            io_threads=settings.LOCAL_OBJECT_STORE_IO_THREADS,
+        )
+    return _stores.setdefault(config, store)
 
-    return FilesystemObjectStore(
-        root=settings.local_object_store_root,
-        bucket=settings.object_store_bucket,
-    )
+
+async def close_object_stores() -> None:
+    """Close this loop's clients; the next call on the loop reopens them."""
+
+    for store in list(_stores.values()):
+        await store.close()
@@ -1,3 +1,4 @@
+import asyncio
 import collections.abc
 import contextlib
 import logging
@@ -13,6 +14,7 @@ import app.api.v1.commerce as _commerce_router
 import app.api.v1.graph as _graph_router
 import app.api.v1.health as _health_router
 import app.api.v1.join as _join_router
+import app.api.v1.metrics as _metrics_router
 import app.api.v1.publications as _publications_router
 import app.api.v1.readers as _readers_router
 import app.api.v1.runs as _runs_router
@@ -22,8 +24,13 @@ import app.api.v1.twin as _twin_router
 import app.api.v1.vault as _vault_router
 import app.core.errors as _errors
 import app.core.logging as _logging
+import app.core.metrics as _metrics
 import app.core.middleware as _middleware
 import app.core.security as _security
+import app.core.timing as _timing
+import app.domains.graph.service as _graph_service
+import app.domains.sitecontent.versions as _sitecontent_versions
+import app.integrations.object_store as _object_store
 import app.settings as _settings
 
 
@@ -39,6 +46,7 @@ async def lifespan(app: fastapi.FastAPI) -> collections.abc.AsyncGenerator[None,
             # Never send request bodies — private content must not reach Sentry.
             send_default_pii=False,
         )
+    _timing.configure_tracing(settings.OTEL_ENABLED, settings.SERVICE_NAME)
     logger.info(
         "Starting DOT orchestrator",
         extra={
@@ -47,7 +55,16 @@ async def lifespan(app: fastapi.FastAPI) -> collections.abc.AsyncGenerator[None,
             "auth_mode": settings.AUTH_MODE,
         },
     )
+    # Opened up front so the first request does not pay for the S3 client.
+    await _object_store.get_object_store().open()
+    content_versions = _sitecontent_versions.start_listener(settings.redis_url)
     yield
+    if content_versions is not None:
+        content_versions.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await content_versions
+    await _graph_service.close_feed_client()
+    await _object_store.close_object_stores()
     logger.info("DOT orchestrator stopped")
 
 
@@ -105,7 +122,10 @@ def create_app() -> fastapi.FastAPI:
     # request IDs remain present instead of masking an exception as a CORS error.
     fapp.add_middleware(_errors.UnhandledExceptionMiddleware)
     fapp.add_middleware(_security.SecurityHeadersMiddleware)
+    # Inside the request-ID middleware so the timings log line carries the ID.
+    fapp.add_middleware(_timing.ServerTimingMiddleware)
     fapp.add_middleware(_middleware.RequestIdMiddleware)
+    fapp.add_middleware(_metrics.MetricsMiddleware)
     fapp.add_middleware(
         fastapi.middleware.cors.CORSMiddleware,
         allow_origins=settings.CORS_ORIGINS,
@@ -121,9 +141,10 @@ def create_app() -> fastapi.FastAPI:
             "X-Owner-Id",
             "X-Actor-Id",
         ],
-        expose_headers=["X-Request-ID"],
+        expose_headers=["X-Request-ID", _timing.SERVER_TIMING_HEADER],
     )
     fapp.include_router(_health_router.router)
+    fapp.include_router(_metrics_router.router)
     fapp.include_router(_auth_router.router)
     fapp.include_router(_graph_router.public_router)
     fapp.include_router(_graph_router.router)
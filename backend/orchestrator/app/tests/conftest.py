@@ -11,6 +11,11 @@ import app.api.v1.auth as _auth_router_module
 import app.core.tenancy
 import app.db.models
 import app.db.session
+import app.domains.graph.adjacency
+import app.domains.graph.profile
+import app.domains.publication.service
+import app.domains.publication.sitemap
+import app.domains.sitecontent.service
 import app.main
 import app.settings
 
@@ -20,6 +25,21 @@ def _reset_auth_rate_limiter() -> None:
     _auth_router_module._limiter._storage.reset()  # noqa: SLF001
 
 
+@pytest.fixture(autouse=True)
+def _reset_graph_caches() -> None:
+    # Each test gets a fresh database, so anything cached by an earlier one is stale.
+    app.domains.graph.adjacency._CACHE.clear()  # noqa: SLF001
+    app.domains.graph.profile._CACHE.clear()  # noqa: SLF001
+
+
+@pytest.fixture(autouse=True)
+def _reset_delivery_caches() -> None:
+    app.domains.publication.service._resolved.clear()  # noqa: SLF001
+    app.domains.publication.service._manifests.clear()  # noqa: SLF001
+    app.domains.publication.sitemap.invalidate()
+    app.domains.sitecontent.service._CACHE.clear()  # noqa: SLF001
+
+
 @pytest.fixture()
 async def session_factory() -> collections.abc.AsyncGenerator[
     sqlalchemy.ext.asyncio.async_sessionmaker[sqlalchemy.ext.asyncio.AsyncSession], None
@@ -52,6 +72,9 @@ def client(
 ) -> collections.abc.Generator[fastapi.testclient.TestClient, None, None]:
     monkeypatch.setenv("ORCHESTRATOR_OBJECT_STORE_BACKEND", "filesystem")
     monkeypatch.setenv("ORCHESTRATOR_LOCAL_OBJECT_STORE_ROOT", str(tmp_path / "objects"))
+    monkeypatch.setenv("ORCHESTRATOR_LOCAL_OBJECT_STORE_FSYNC", "false")
+    # No broker runs under the suite; content versions stay in process.
+    monkeypatch.setenv("ORCHESTRATOR_REDIS_URL", "memory://")
     # Sessions are signed, so the suite must not inherit (or require) a developer secret.
     monkeypatch.setenv(
         "ORCHESTRATOR_SERVICE_AUTH_SECRET", "test-session-signing-secret-at-least-32-bytes"
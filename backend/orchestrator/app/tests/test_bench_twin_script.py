@@ -0,0 +1,53 @@
+"""The benchmark has to measure the path readers actually take.
+
+A harness that quietly refuses every question would report excellent latency.
+These pin that a small run stays on the grounded path, reaches every stage it
+claims to time, and leaves the real model and embedding clients in place after.
+"""
+
+from __future__ import annotations
+
+import app.domains.knowledge.embedding as embedding
+import app.domains.twin.model as model
+from scripts import bench_twin
+
+_SMALL = bench_twin.BenchConfig(sections=2, documents=1, nodes=8, iterations=3, concurrency=(1, 2))
+
+
+async def test_a_small_run_is_grounded_and_reports_every_stage(session_factory) -> None:
+    report = await bench_twin.run(session_factory, _SMALL)
+
+    assert set(report["operations"]) == {"retrieve_passages", "ask", "ask_stream"}
+    for operation in ("ask", "ask_stream"):
+        outcome = report["operations"][operation]
+        assert outcome["grounded"] == _SMALL.iterations, operation
+        assert {"retrieval", "embedding", "model", "boundary_parse"} <= set(outcome["stages"])
+        assert {"p50", "p95", "p99"} <= set(outcome["latency_ms"])
+    assert set(report["throughput"]) == {"1", "2"}
+    assert report["meta"]["config"]["iterations"] == _SMALL.iterations
+
+
+async def test_the_stand_ins_do_not_outlive_the_run(session_factory) -> None:
+    originals = (model.get_model_client, embedding.get_embedding_client)
+
+    await bench_twin.run(session_factory, _SMALL)
+
+    assert (model.get_model_client, embedding.get_embedding_client) == originals
+
+
+def test_comparison_reports_the_change_per_stage() -> None:
+    previous = {
+        "operations": {
+            "ask": {"latency_ms": {"p50": 10.0, "p95": 20.0}, "stages": {"model": {"p50": 4.0}}}
+        }
+    }
+    current = {
+        "operations": {
+            "ask": {"latency_ms": {"p50": 5.0, "p95": 20.0}, "stages": {"model": {"p50": 5.0}}}
+        }
+    }
+
+    lines = bench_twin.compare(previous, current)
+
+    assert "-50.0%" in lines[0]
+    assert lines[1].startswith("ask.model") and "+25.0%" in lines[1]
@@ -144,6 +144,17 @@ async def test_verified_matching_payment_grants_download(
     assert response.status_code == 200
     assert response.headers["content-type"] == "application/pdf"
     assert response.content.startswith(b"%PDF")
+    assert response.headers["cache-control"] == "private, no-cache"
+    revalidated = client.get(
+        "/v1/commerce/products/book-one-pdf/download",
+        headers={**_headers(), "If-None-Match": response.headers["etag"]},
+    )
+    assert revalidated.status_code == 304
+    ranged = client.get(
+        "/v1/commerce/products/book-one-pdf/download",
+        headers={**_headers(), "Range": "bytes=0-3"},
+    )
+    assert ranged.status_code == 206 and ranged.content == b"%PDF"
     assert (
         client.get(
             "/v1/commerce/products/book-one-pdf/download",
@@ -0,0 +1,249 @@
+"""Synced feeds come back on their own, politely.
+
+These pin the scheduler's contract: a completed import enrolls its account, a
+due account is enqueued once with its lag recorded, a host gets at most
+`PER_HOST_LIMIT` imports per pass spaced apart and no more fetches at once, a
+host the workers recorded as failing is left alone, and an account that
+stopped syncing leaves the schedule.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import datetime
+
+import fastapi
+import pytest
+import sqlalchemy
+
+import app.auth.dependencies
+import app.core.tenancy
+import app.db.models
+import app.domains.graph.hosts as hosts
+import app.domains.graph.schedule as schedule
+import app.domains.graph.service
+import app.domains.graph.sync as sync
+import app.settings
+from app.domains.graph.schemas import FootprintImportCreate
+
+NOW = datetime.datetime(2026, 6, 13, 12, 0, tzinfo=datetime.UTC)
+FEED = """<?xml version="1.0"?><rss version="2.0"><channel><title>Notes</title>
+<item><title>One</title><link>https://feeds.example.com/p/1</link><guid>1</guid></item>
+</channel></rss>"""
+
+
+async def _enrolled(session_factory, owner_id: str, handle: str, feed_url: str) -> str:
+    async with session_factory() as session:
+        await app.core.tenancy.bind_tenant(session, owner_id)
+        account = app.db.models.FootprintAccount(
+            owner_id=owner_id,
+            platform="rss",
+            handle=handle,
+            auth_mode="rss",
+            sync_cursor={"feed_url": feed_url},
+        )
+        session.add(account)
+        await session.flush()
+        await schedule.record_sync(
+            session,
+            account,
+            feed_url=feed_url,
+            changed=False,
+            now=NOW - datetime.timedelta(hours=2),
+        )
+        await session.commit()
+        return account.id
+
+
+def test_the_interval_adapts_to_how_often_a_feed_changes() -> None:
+    assert schedule.next_interval(None, changed=True) == schedule.DEFAULT_INTERVAL_SECONDS
+    assert schedule.next_interval(3600, changed=True) == 1800
+    assert schedule.next_interval(3600, changed=False) == 5400
+    assert schedule.next_interval(1000, changed=True) == schedule.MIN_INTERVAL_SECONDS
+    assert schedule.next_interval(80000, changed=False) == schedule.MAX_INTERVAL_SECONDS
+
+
+async def test_a_completed_import_enrolls_its_account(session_factory) -> None:
+    owner = app.auth.dependencies.OwnerContext(owner_id="owner-sync", actor_id="owner-sync")
+    async with session_factory() as session:
+        await app.core.tenancy.bind_tenant(session, owner.owner_id)
+        account = app.db.models.FootprintAccount(
+            owner_id=owner.owner_id, platform="rss", handle="notes", auth_mode="rss"
+        )
+        session.add(account)
+        await session.commit()
+        footprint_import = await app.domains.graph.service.create_import(
+            session,
+            owner,
+            FootprintImportCreate(
+                connector="rss",
+                import_mode="rss",
+                account_id=account.id,
+                source_ref={"feed_url": "https://feeds.example.com/notes"},
+            ),
+        )
+        await app.domains.graph.service.process_import(
+            session, owner, footprint_import.id, feed_xml=FEED
+        )
+        row = await session.get(app.db.models.FeedSyncSchedule, account.id)
+
+    assert row is not None
+    assert row.host == "feeds.example.com"
+    assert row.interval_seconds == schedule.DEFAULT_INTERVAL_SECONDS
+
+
+async def test_due_accounts_are_enqueued_once_with_their_lag(session_factory) -> None:
+    account_id = await _enrolled(session_factory, "owner-a", "a", "https://a.example.com/feed")
+    enqueued: list[tuple[str, str, float]] = []
+
+    report = await sync.schedule_due_syncs(
+        session_factory, lambda *args: enqueued.append(args), now=NOW
+    )
+    again = await sync.schedule_due_syncs(
+        session_factory, lambda *args: enqueued.append(args), now=NOW
+    )
+
+    assert report.enqueued == 1 and again.enqueued == 0
+    assert [(owner_id, delay) for _id, owner_id, delay in enqueued] == [("owner-a", 0.0)]
+    # Enrolled two hours ago with a one-hour interval: an hour late.
+    assert report.max_lag_seconds == 3600
+    async with session_factory() as session:
+        await app.core.tenancy.bind_tenant(session, "owner-a")
+        row = await session.get(app.db.models.FeedSyncSchedule, account_id)
+        queued = await app.domains.graph.service.get_import(
+            session,
+            app.auth.dependencies.OwnerContext(owner_id="owner-a", actor_id="owner-a"),
+            enqueued[0][0],
+        )
+    assert row.last_lag_seconds == 3600
+    assert schedule.aware(row.next_sync_at) > NOW
+    assert queued.status == "queued"
+    assert queued.source_ref["feed_url"] == "https://a.example.com/feed"
+
+
+async def test_one_host_gets_a_limited_staggered_slice(session_factory) -> None:
+    for index in range(sync.PER_HOST_LIMIT + 2):
+        await _enrolled(session_factory, f"owner-{index}", "busy", "https://busy.example.com/f")
+    await _enrolled(session_factory, "owner-quiet", "quiet", "https://quiet.example.com/f")
+    enqueued: list[tuple[str, str, float]] = []
+
+    report = await sync.schedule_due_syncs(
+        session_factory, lambda *args: enqueued.append(args), now=NOW
+    )
+
+    assert report.enqueued == sync.PER_HOST_LIMIT + 1
+    delays = sorted(delay for _id, owner_id, delay in enqueued if owner_id != "owner-quiet")
+    assert delays == [position * sync.POLITENESS_SECONDS for position in range(sync.PER_HOST_LIMIT)]
+
+
+async def test_a_host_that_keeps_failing_is_deferred(session_factory) -> None:
+    await _enrolled(session_factory, "owner-down", "down", "https://down.example.com/feed")
+    # Recorded by the workers' fetches, which run in other processes.
+    async with session_factory() as session:
+        for _ in range(hosts.FAILURE_THRESHOLD):
+            await hosts.record_failure(session, "down.example.com", now=NOW)
+        await session.commit()
+    enqueued: list[tuple[str, str, float]] = []
+
+    report = await sync.schedule_due_syncs(
+        session_factory, lambda *args: enqueued.append(args), now=NOW
+    )
+
+    assert enqueued == []
+    assert report.deferred_hosts == ["down.example.com"]
+    async with session_factory() as session:
+        row = (
+            await session.execute(sqlalchemy.select(app.db.models.FeedSyncSchedule))
+        ).scalar_one()
+        await hosts.record_success(session, "down.example.com")
+        await session.commit()
+    assert schedule.aware(row.next_sync_at) == NOW + datetime.timedelta(
+        seconds=hosts.BACKOFF_SECONDS
+    )
+    later = NOW + datetime.timedelta(seconds=hosts.BACKOFF_SECONDS)
+    assert (
+        await sync.schedule_due_syncs(session_factory, lambda *args: None, now=later)
+    ).enqueued == 1
+
+
+async def test_a_failed_fetch_counts_against_its_host(
+    session_factory, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    async def unreachable(*_args, **_kwargs) -> None:
+        raise app.domains.graph.service._feed_request_failed()
+
+    monkeypatch.setenv("ORCHESTRATOR_REDIS_URL", "memory://")
+    monkeypatch.setattr(app.domains.graph.service, "fetch_feed", unreachable)
+    app.settings.get_settings.cache_clear()
+    owner = app.auth.dependencies.OwnerContext(owner_id="owner-fail", actor_id="owner-fail")
+    try:
+        async with session_factory() as session:
+            await app.core.tenancy.bind_tenant(session, owner.owner_id)
+            footprint_import = await app.domains.graph.service.create_import(
+                session,
+                owner,
+                FootprintImportCreate(
+                    connector="rss",
+                    import_mode="rss",
+                    source_ref={"feed_url": "https://down.example.com/feed"},
+                ),
+            )
+            with pytest.raises(fastapi.HTTPException):
+                await app.domains.graph.service.process_import(session, owner, footprint_import.id)
+            host = await session.get(app.db.models.FeedHost, "down.example.com")
+    finally:
+        app.settings.get_settings.cache_clear()
+
+    assert host is not None and host.consecutive_failures == 1
+    assert host.retry_after is None
+
+
+def test_backoff_starts_at_the_threshold_and_doubles() -> None:
+    assert hosts.backoff_seconds(hosts.FAILURE_THRESHOLD - 1) == 0
+    assert hosts.backoff_seconds(hosts.FAILURE_THRESHOLD) == hosts.BACKOFF_SECONDS
+    assert hosts.backoff_seconds(hosts.FAILURE_THRESHOLD + 1) == 2 * hosts.BACKOFF_SECONDS
+    assert hosts.backoff_seconds(100) == hosts.MAX_BACKOFF_SECONDS
+
+
+async def test_fetches_hold_a_host_slot(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("ORCHESTRATOR_REDIS_URL", "memory://")
+    monkeypatch.setattr(hosts, "SLOT_WAIT_SECONDS", 0.0)
+    app.settings.get_settings.cache_clear()
+    try:
+        async with contextlib.AsyncExitStack() as held:
+            for _ in range(hosts.PER_HOST_LIMIT):
+                await held.enter_async_context(hosts.fetch_slot("busy.example.com"))
+            with pytest.raises(hosts.HostBusyError):
+                async with hosts.fetch_slot("busy.example.com"):
+                    pass
+            async with hosts.fetch_slot("quiet.example.com"):
+                pass
+        async with hosts.fetch_slot("busy.example.com"):
+            pass
+    finally:
+        app.settings.get_settings.cache_clear()
+
+
+async def test_an_account_that_stopped_syncing_leaves_the_schedule(session_factory) -> None:
+    account_id = await _enrolled(session_factory, "owner-off", "off", "https://off.example.com/f")
+    async with session_factory() as session:
+        await app.core.tenancy.bind_tenant(session, "owner-off")
+        account = (
+            await session.execute(
+                sqlalchemy.select(app.db.models.FootprintAccount).where(
+                    app.db.models.FootprintAccount.owner_id == "owner-off",
+                    app.db.models.FootprintAccount.id == account_id,
+                )
+            )
+        ).scalar_one()
+        account.status = "paused"
+        await session.commit()
+    enqueued: list[tuple[str, str, float]] = []
+
+    report = await sync.schedule_due_syncs(
+        session_factory, lambda *args: enqueued.append(args), now=NOW
+    )
+
+    assert enqueued == [] and report.dropped == 1
+    async with session_factory() as session:
+        assert await session.get(app.db.models.FeedSyncSchedule, account_id) is None
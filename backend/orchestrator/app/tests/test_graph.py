@@ -1,5 +1,15 @@
+import asyncio
+import json
+
 import fastapi.testclient
 import httpx
+import pytest
+import sqlalchemy
+import sqlalchemy.ext.asyncio
+
+import app.core.http_client
+import app.db.models
+import app.domains.graph.service
 
 OWNER_HEADERS: dict[str, str] = {"X-Owner-Id": "owner_1"}
 OTHER_OWNER_HEADERS: dict[str, str] = {"X-Owner-Id": "owner_2"}
@@ -346,3 +356,187 @@ def test_graph_import_process_is_owner_scoped(client: fastapi.testclient.TestCli
     )
 
     assert process_response.status_code == 404
+
+
+def _substack_import(client: fastapi.testclient.TestClient, key: str) -> str:
+    account_response: httpx.Response = client.post(
+        "/v1/graph/accounts",
+        headers=OWNER_HEADERS,
+        json={"platform": "substack", "handle": f"henok-{key}", "auth_mode": "rss"},
+    )
+    import_response: httpx.Response = client.post(
+        "/v1/graph/imports",
+        headers={**OWNER_HEADERS, "Idempotency-Key": key},
+        json={
+            "connector": "substack",
+            "import_mode": "rss",
+            "account_id": account_response.json()["id"],
+            "source_ref": {"feed_url": "https://henok.substack.com/feed"},
+        },
+    )
+    return import_response.json()["id"]
+
+
+def test_graph_import_writes_only_changed_items(client: fastapi.testclient.TestClient) -> None:
+    import_id: str = _substack_import(client, "incremental")
+    process_url: str = f"/v1/graph/imports/{import_id}/process"
+
+    first = client.post(process_url, headers=OWNER_HEADERS, json={"feed_xml": SUBSTACK_RSS})
+    unchanged = client.post(process_url, headers=OWNER_HEADERS, json={"feed_xml": SUBSTACK_RSS})
+    edited = client.post(
+        process_url,
+        headers=OWNER_HEADERS,
+        json={"feed_xml": SUBSTACK_RSS.replace("Substack as a graph source", "Feeds as graphs")},
+    )
+
+    assert first.json()["summary"]["changed_item_count"] == 2
+    assert unchanged.json()["summary"]["changed_item_count"] == 0
+    assert unchanged.json()["summary"]["node_count"] == 0
+    assert edited.json()["summary"]["changed_item_count"] == 1
+    labels = {
+        node["label"]
+        for node in client.get("/v1/graph/snapshot", headers=OWNER_HEADERS).json()["nodes"]
+    }
+    assert "Feeds as graphs" in labels and "Substack as a graph source" not in labels
+
+
+def test_graph_import_resync_keeps_feed_items_current(
+    client: fastapi.testclient.TestClient,
+    session_factory: sqlalchemy.ext.asyncio.async_sessionmaker[sqlalchemy.ext.asyncio.AsyncSession],
+) -> None:
+    import_id: str = _substack_import(client, "resync")
+    process_url: str = f"/v1/graph/imports/{import_id}/process"
+
+    def posts() -> dict[str, str]:
+        nodes = client.get("/v1/graph/snapshot", headers=OWNER_HEADERS).json()["nodes"]
+        return {node["label"]: node["last_seen_at"] for node in nodes if node["kind"] == "post"}
+
+    client.post(process_url, headers=OWNER_HEADERS, json={"feed_xml": SUBSTACK_RSS})
+    first_seen: dict[str, str] = posts()
+
+    # Removed locally while the post is still in the feed.
+    async def delete_post() -> None:
+        node = app.db.models.FootprintNode
+        async with session_factory() as session:
+            await session.execute(
+                sqlalchemy.delete(node).where(
+                    node.owner_id == "owner_1", node.label == "Graph-aware publishing"
+                )
+            )
+            await session.commit()
+
+    asyncio.run(delete_post())
+    resync = client.post(process_url, headers=OWNER_HEADERS, json={"feed_xml": SUBSTACK_RSS})
+
+    assert resync.json()["summary"]["changed_item_count"] == 1
+    seen: dict[str, str] = posts()
+    assert set(seen) == {"Graph-aware publishing", "Substack as a graph source"}
+    assert seen["Substack as a graph source"] > first_seen["Substack as a graph source"]
+
+
+def test_graph_import_resync_is_a_conditional_get(
+    client: fastapi.testclient.TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    seen: list[dict[str, str]] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(dict(request.headers))
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304, headers={"ETag": '"v1"'})
+        return httpx.Response(
+            200,
+            headers={"Content-Type": "application/rss+xml", "ETag": '"v1"'},
+            text=SUBSTACK_RSS,
+        )
+
+    async def public_target(_feed_url: str) -> None:
+        return None
+
+    monkeypatch.setattr(
+        app.core.http_client,
+        "create_service_client",
+        lambda *_args, **_kwargs: httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+    monkeypatch.setattr(app.domains.graph.service, "assert_public_feed_target", public_target)
+    import_id: str = _substack_import(client, "conditional")
+
+    first = client.post(f"/v1/graph/imports/{import_id}/process", headers=OWNER_HEADERS)
+    second = client.post(f"/v1/graph/imports/{import_id}/process", headers=OWNER_HEADERS)
+
+    assert first.json()["summary"]["not_modified"] is False
+    assert "if-none-match" not in seen[0]
+    assert seen[1]["if-none-match"] == '"v1"'
+    assert second.status_code == 200
+    assert second.json()["status"] == "succeeded"
+    assert second.json()["summary"]["not_modified"] is True
+    assert second.json()["summary"]["item_count"] == 2
+
+
+def test_graph_snapshot_pages_cover_the_graph_exactly_once(
+    client: fastapi.testclient.TestClient,
+) -> None:
+    nodes = [create_node(client, label=f"Post {index}") for index in range(7)]
+    for source, target in zip(nodes, nodes[1:], strict=False):
+        response = client.post(
+            "/v1/graph/edges",
+            headers=OWNER_HEADERS,
+            json={
+                "source_node_id": source["id"],
+                "target_node_id": target["id"],
+                "relation": "next",
+            },
+        )
+        assert response.status_code == 201
+
+    seen_nodes: list[str] = []
+    seen_edges: list[str] = []
+    cursor: str | None = None
+    pages = 0
+    while True:
+        params = {"node_limit": 3, **({"cursor": cursor} if cursor else {})}
+        page = client.get("/v1/graph/snapshot", headers=OWNER_HEADERS, params=params).json()
+        pages += 1
+        page_ids = {node["id"] for node in page["nodes"]}
+        # Each edge travels with its source node, even when the target is on a later page.
+        assert all(edge["source_node_id"] in page_ids for edge in page["edges"])
+        seen_nodes += [node["id"] for node in page["nodes"]]
+        seen_edges += [edge["id"] for edge in page["edges"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert pages == 3
+    assert sorted(seen_nodes) == sorted(node["id"] for node in nodes)
+    assert len(seen_edges) == len(set(seen_edges)) == 6
+
+
+def test_graph_snapshot_rejects_a_forged_cursor(client: fastapi.testclient.TestClient) -> None:
+    response = client.get(
+        "/v1/graph/snapshot", headers=OWNER_HEADERS, params={"cursor": "not-a-cursor"}
+    )
+
+    assert response.status_code == 400
+
+
+def test_graph_snapshot_streams_as_ndjson(client: fastapi.testclient.TestClient) -> None:
+    source = create_node(client, label="Streamed post")
+    target = create_node(client, label="Streamed topic", kind="topic")
+    client.post(
+        "/v1/graph/edges",
+        headers=OWNER_HEADERS,
+        json={
+            "source_node_id": source["id"],
+            "target_node_id": target["id"],
+            "relation": "mentions",
+        },
+    )
+    create_node(client, headers=OTHER_OWNER_HEADERS, label="Someone else's post")
+
+    response = client.get("/v1/graph/snapshot/stream", headers=OWNER_HEADERS)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert [record["type"] for record in records] == ["node", "node", "edge", "end"]
+    assert records[-1] == {"type": "end", "nodes": 2, "edges": 1}
+    assert {record["data"]["owner_id"] for record in records[:-1]} == {"owner_1"}
@@ -0,0 +1,117 @@
+"""Neighbourhood walks are bounded and agree on every backend.
+
+The recursive CTE is what Postgres runs; SQLite runs it too, so these compare it
+against the breadth-first fallback on the same graph as well as pinning the
+filters, the cap, and the endpoint's tenant scoping.
+"""
+
+from __future__ import annotations
+
+import fastapi.testclient
+import pytest
+
+import app.core.tenancy
+import app.domains.graph.traversal as traversal
+from app.domains.graph.bulk import GraphWriter
+
+OWNER = "owner-walk"
+WALKS = [traversal.walk_recursive, traversal.walk_breadth_first]
+
+
+async def _graph(session_factory) -> dict[str, str]:
+    """a -> b -> c -> a (a cycle), b -> d (public), d -> e, with x unconnected."""
+
+    writer = GraphWriter(OWNER)
+    keys = {
+        name: writer.node(
+            kind="post",
+            label=name,
+            platform="rss",
+            external_id=name,
+            source_ref={},
+            visibility="public" if name in {"a", "d", "e"} else "private",
+        )
+        for name in "abcdex"
+    }
+    for source, target, relation in [
+        ("a", "b", "links"),
+        ("b", "c", "links"),
+        ("c", "a", "links"),
+        ("b", "d", "mentions"),
+        ("d", "e", "links"),
+    ]:
+        writer.edge(keys[source], keys[target], relation=relation, platform="rss")
+    async with session_factory() as session:
+        await app.core.tenancy.bind_tenant(session, OWNER)
+        result = await writer.write(session)
+        await session.commit()
+    return {name: result.node_ids[key] for name, key in keys.items()}
+
+
+def _named(ids: dict[str, str], depths: dict[str, int]) -> dict[str, int]:
+    names = {node_id: name for name, node_id in ids.items()}
+    return {names[node_id]: hops for node_id, hops in depths.items()}
+
+
+@pytest.mark.parametrize("walk", WALKS, ids=["recursive", "breadth_first"])
+async def test_walks_follow_depth_direction_and_filters(session_factory, walk) -> None:
+    ids = await _graph(session_factory)
+    async with session_factory() as session:
+        await app.core.tenancy.bind_tenant(session, OWNER)
+        both = await walk(session, OWNER, ids["b"], depth=2)
+        out = await walk(session, OWNER, ids["b"], depth=1, direction="out")
+        links = await walk(session, OWNER, ids["a"], depth=3, direction="out", relations=["links"])
+        public = await walk(session, OWNER, ids["a"], depth=3, visibilities=["public"])
+
+    assert _named(ids, both.depths) == {"b": 0, "a": 1, "c": 1, "d": 1, "e": 2}
+    assert _named(ids, out.depths) == {"b": 0, "c": 1, "d": 1}
+    assert _named(ids, links.depths) == {"a": 0, "b": 1, "c": 2}
+    # Private b and c cannot be entered, so public d is out of reach too.
+    assert _named(ids, public.depths) == {"a": 0}
+    assert not both.truncated
+
+
+async def test_the_cap_keeps_the_nearest_nodes_on_both_backends(session_factory) -> None:
+    ids = await _graph(session_factory)
+    async with session_factory() as session:
+        await app.core.tenancy.bind_tenant(session, OWNER)
+        walks = [await walk(session, OWNER, ids["b"], depth=2, node_limit=3) for walk in WALKS]
+
+    assert walks[0] == walks[1]
+    assert walks[0].truncated
+    assert set(walks[0].depths.values()) == {0, 1}
+
+
+def test_the_endpoint_returns_the_neighbourhood_within_the_tenant(
+    client: fastapi.testclient.TestClient,
+) -> None:
+    headers = {"X-Owner-Id": "owner_1"}
+    nodes = []
+    for label in ("Root", "Near", "Far"):
+        response = client.post(
+            "/v1/graph/nodes", headers=headers, json={"kind": "post", "label": label}
+        )
+        nodes.append(response.json()["id"])
+    for source, target in [(0, 1), (1, 2)]:
+        client.post(
+            "/v1/graph/edges",
+            headers=headers,
+            json={
+                "source_node_id": nodes[source],
+                "target_node_id": nodes[target],
+                "relation": "r",
+            },
+        )
+
+    near = client.get(f"/v1/graph/nodes/{nodes[0]}/neighbourhood?depth=1", headers=headers)
+    far = client.get(f"/v1/graph/nodes/{nodes[0]}/neighbourhood?depth=2", headers=headers)
+    foreign = client.get(
+        f"/v1/graph/nodes/{nodes[0]}/neighbourhood", headers={"X-Owner-Id": "owner_2"}
+    )
+
+    assert near.status_code == 200
+    assert [node["label"] for node in near.json()["nodes"]] == ["Root", "Near"]
+    assert len(near.json()["edges"]) == 1
+    assert far.json()["hops"] == {nodes[0]: 0, nodes[1]: 1, nodes[2]: 2}
+    assert len(far.json()["edges"]) == 2
+    assert foreign.status_code == 404
@@ -0,0 +1,106 @@
+"""The feed client resolves once, connects only where it vetted, and backs off.
+
+A local server stands in for a feed host, reached under a name the system
+resolver does not know, so a connection that lands proves the pinned address
+was used rather than a fresh lookup.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import socket
+
+import httpx
+import pytest
+
+import app.core.http_client as http_client
+
+
+def _resolver(address: str, calls: list[str]):
+    async def resolve(host: str, port: int) -> http_client.AddrInfo:
+        calls.append(host)
+        return [(socket.AF_INET, socket.SOCK_STREAM, 6, "", (address, port))]
+
+    return resolve
+
+
+async def test_resolutions_are_cached_until_the_ttl_and_vetted() -> None:
+    calls: list[str] = []
+    dns = http_client.DnsCache(
+        lambda address: address != "10.0.0.1", ttl=60.0, resolver=_resolver("93.184.216.34", calls)
+    )
+
+    assert await dns.resolve("feeds.example.com", 443) == ("93.184.216.34",)
+    await dns.resolve("FEEDS.example.com", 443)
+    assert calls == ["feeds.example.com"]
+
+    blocked = http_client.DnsCache(lambda address: False, resolver=_resolver("10.0.0.1", calls))
+    with pytest.raises(http_client.BlockedAddressError):
+        await blocked.resolve("internal.example.com", 80)
+    with pytest.raises(http_client.BlockedAddressError):
+        await blocked.resolve("internal.example.com", 80)
+    # A rejected host is asked again rather than remembered as good.
+    assert calls.count("internal.example.com") == 2
+
+
+async def test_connections_go_to_the_vetted_address_and_are_reused() -> None:
+    connections: list[int] = []
+
+    async def serve(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        connections.append(1)
+        while await reader.readuntil(b"\r\n\r\n"):
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok")
+            await writer.drain()
+            if reader.at_eof():
+                break
+
+    server = await asyncio.start_server(serve, "127.0.0.1", 0)
+    port: int = server.sockets[0].getsockname()[1]
+    calls: list[str] = []
+    dns = http_client.DnsCache(lambda _address: True, resolver=_resolver("127.0.0.1", calls))
+    transport = http_client.PinnedTransport(dns, limits=httpx.Limits(max_connections=2))
+    try:
+        async with httpx.AsyncClient(transport=transport) as client:
+            for _ in range(3):
+                response = await client.get(f"http://feed.invalid:{port}/feed")
+                assert response.text == "ok"
+    finally:
+        server.close()
+
+    assert calls == ["feed.invalid"]
+    assert len(connections) == 1
+
+
+async def test_a_host_that_resolves_to_a_blocked_address_is_never_contacted() -> None:
+    dns = http_client.DnsCache(lambda _address: False, resolver=_resolver("127.0.0.1", []))
+    transport = http_client.PinnedTransport(dns, limits=httpx.Limits(max_connections=1))
+
+    async with httpx.AsyncClient(transport=transport) as client:
+        with pytest.raises(http_client.BlockedAddressError):
+            await client.get("http://rebound.invalid/feed")
+
+
+async def test_retries_back_off_with_jitter_and_close_what_they_drop(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    sleeps: list[float] = []
+    statuses = iter([503, 503, 200])
+
+    async def record_sleep(seconds: float) -> None:
+        sleeps.append(seconds)
+
+    def handler(_request: httpx.Request) -> httpx.Response:
+        return httpx.Response(next(statuses), text="body")
+
+    monkeypatch.setattr(http_client.asyncio, "sleep", record_sleep)
+    monkeypatch.setattr(http_client, "_breakers", {})
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        response = await http_client.resilient_request(
+            client, "GET", "https://jitter.example.com/feed", stream=True, backoff_base=1.0
+        )
+        body = await response.aread()
+        await response.aclose()
+
+    assert response.status_code == 200 and body == b"body"
+    assert len(sleeps) == 2
+    assert 0 <= sleeps[0] <= 1.0 and 0 <= sleeps[1] <= 2.0
@@ -0,0 +1,117 @@
+"""`/metrics` is for capacity planning, so its labels must stay bounded.
+
+Series are keyed by route template and code, never by a concrete path or
+anything a reader typed; these pin that, and the scrape-time samplers.
+"""
+
+from __future__ import annotations
+
+import fastapi.testclient
+import prometheus_client.parser
+
+import app.core.http_client as http_client
+import app.core.metrics as metrics
+
+
+def _samples(text: str) -> list[prometheus_client.samples.Sample]:
+    return [
+        sample
+        for family in prometheus_client.parser.text_string_to_metric_families(text)
+        for sample in family.samples
+    ]
+
+
+def test_requests_are_observed_by_route_template(client: fastapi.testclient.TestClient) -> None:
+    client.get("/healthz")
+    client.get("/v1/no-such-route/zebra-quartz")
+
+    body = client.get("/metrics").text
+
+    routes = {
+        sample.labels["route"]
+        for sample in _samples(body)
+        if sample.name == "dot_http_request_duration_seconds_count"
+    }
+    assert {"/healthz", "unmatched"} <= routes
+    assert "zebra" not in body
+
+
+def test_refusals_are_counted_by_code(client: fastapi.testclient.TestClient) -> None:
+    before = metrics.REGISTRY.get_sample_value(
+        "dot_twin_refusals_total", {"refusal_code": "no_grounded_context"}
+    )
+
+    response = client.post(
+        "/v1/twin/public/ask",
+        json={"owner_id": "nobody-here", "lens": "ground", "question": "Anything at all?"},
+    )
+
+    assert response.json()["refusal_code"] == "no_grounded_context"
+    after = metrics.REGISTRY.get_sample_value(
+        "dot_twin_refusals_total", {"refusal_code": "no_grounded_context"}
+    )
+    assert after == (before or 0) + 1
+
+
+def test_circuit_breakers_are_sampled_at_scrape_time(
+    client: fastapi.testclient.TestClient,
+) -> None:
+    breaker = http_client._breaker_for("metrics-test.invalid")
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+
+    try:
+        body = client.get("/metrics").text
+    finally:
+        http_client._breakers.pop("metrics-test.invalid")
+
+    breakers = {
+        sample.labels["state"]: sample.value
+        for sample in _samples(body)
+        if sample.name == "dot_http_circuit_breakers"
+    }
+    assert breakers["open"] >= 1
+    assert set(breakers) == {"closed", "half_open", "open"}
+    assert "metrics-test.invalid" not in body
+
+
+def test_the_token_guards_the_endpoint() -> None:
+    app = fastapi.FastAPI()
+    app.include_router(
+        metrics.create_metrics_router(pool=lambda: None, redis_url="memory://", token="s3cret")
+    )
+    client = fastapi.testclient.TestClient(app)
+
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer s3cret"}).status_code == 200
+
+
+def test_the_endpoint_is_closed_without_a_token_outside_local() -> None:
+    closed = fastapi.FastAPI()
+    closed.include_router(metrics.create_metrics_router(pool=lambda: None, redis_url="memory://"))
+    local = fastapi.FastAPI()
+    local.include_router(
+        metrics.create_metrics_router(
+            pool=lambda: None, redis_url="memory://", open_without_token=True
+        )
+    )
+
+    assert fastapi.testclient.TestClient(closed).get("/metrics").status_code == 404
+    assert fastapi.testclient.TestClient(local).get("/metrics").status_code == 200
+
+
+async def test_timed_labels_the_outcome() -> None:
+    histogram = prometheus_client.Histogram(
+        "test_timed_seconds", "test", ("outcome",), registry=prometheus_client.CollectorRegistry()
+    )
+
+    @metrics.timed(histogram)
+    async def fails() -> None:
+        raise RuntimeError
+
+    try:
+        await fails()
+    except RuntimeError:
+        pass
+
+    assert histogram.labels("error")._sum.get() > 0
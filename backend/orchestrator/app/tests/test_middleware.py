@@ -0,0 +1,114 @@
+"""The middleware stack must not stand between the model and the reader.
+
+Every layer is pure ASGI. These pin what that buys: a streamed delta reaches
+the socket before the next one is produced, the request ID stays bound while a
+stream runs, and a failure still leaves with its headers.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import typing
+
+import fastapi.testclient
+import pytest
+
+import app.core.middleware as middleware
+import app.domains.twin.service as service
+from scripts import bench_middleware
+
+
+def _scope(path: str, body: bytes, request_id: str) -> dict[str, typing.Any]:
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"x-request-id", request_id.encode()),
+        ],
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+    }
+
+
+async def test_stream_deltas_are_flushed_before_the_next_is_produced(
+    client: fastapi.testclient.TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    first_delta_sent = asyncio.Event()
+    bound_ids: list[str] = []
+
+    async def fake_ask_stream(*_args, **_kwargs):
+        bound_ids.append(middleware.request_id_var.get())
+        yield {"type": "delta", "text": "First."}
+        # A buffering layer would hold the first delta until the stream ends,
+        # and this wait would time out.
+        await asyncio.wait_for(first_delta_sent.wait(), timeout=2)
+        yield {"type": "done", "citations": []}
+
+    monkeypatch.setattr(service, "ask_stream", fake_ask_stream)
+    body = json.dumps({"owner_id": "henok", "lens": "ground", "question": "Why?"}).encode()
+    received: list[typing.Any] = []
+    delivered = False
+
+    async def receive() -> dict[str, typing.Any]:
+        nonlocal delivered
+        if not delivered:
+            delivered = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await asyncio.Event().wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: dict[str, typing.Any]) -> None:
+        received.append(message)
+        if message["type"] == "http.response.body" and b"delta" in message.get("body", b""):
+            first_delta_sent.set()
+
+    await client.app(_scope("/v1/twin/public/ask/stream", body, "rid-stream"), receive, send)
+
+    start = received[0]
+    headers = {key.decode().lower(): value.decode() for key, value in start["headers"]}
+    assert start["status"] == 200
+    assert headers["x-request-id"] == "rid-stream"
+    assert headers["x-content-type-options"] == "nosniff"
+    chunks = [message["body"] for message in received[1:] if message.get("body")]
+    assert b"delta" in chunks[0] and b"done" in chunks[1]
+    assert bound_ids == ["rid-stream"]
+
+
+def test_an_unhandled_error_keeps_its_headers(
+    client: fastapi.testclient.TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    async def explode(*_args, **_kwargs):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(service, "ask", explode)
+    failing = fastapi.testclient.TestClient(client.app, raise_server_exceptions=False)
+
+    response = failing.post(
+        "/v1/twin/public/ask",
+        json={"owner_id": "henok", "lens": "ground", "question": "Why?"},
+        headers={"X-Request-Id": "rid-error"},
+    )
+
+    assert response.status_code == 500
+    assert response.json()["error"]["code"] == "INTERNAL_ERROR"
+    assert response.headers["X-Request-Id"] == "rid-error"
+    assert response.headers["Strict-Transport-Security"].startswith("max-age=")
+
+
+async def test_the_benchmark_compares_every_stack() -> None:
+    report = await bench_middleware.run(requests=5)
+
+    assert set(report["routes"]) == set(bench_middleware.ROUTES)
+    for stacks in report["routes"].values():
+        assert set(stacks) == set(bench_middleware.STACKS)
+        assert stacks["bare"]["overhead_us"] == 0
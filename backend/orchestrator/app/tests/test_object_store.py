@@ -0,0 +1,203 @@
+"""Object-store operations behave the same on every backend.
+
+The filesystem store stands in for S3 in development and tests, so its edge
+cases are pinned here: keys cannot escape the bucket, and a copy is a new
+object that later writes to the source cannot change. The S3 store runs against
+a recording fake client, which is enough to pin how many clients it opens and
+which calls a streamed upload becomes.
+"""
+
+from __future__ import annotations
+
+import collections.abc
+import contextlib
+import os
+import pathlib
+import threading
+import typing
+
+import pytest
+
+import app.integrations.object_store as object_store
+
+
+@pytest.fixture()
+def store(tmp_path: pathlib.Path) -> object_store.FilesystemObjectStore:
+    return object_store.FilesystemObjectStore(tmp_path, "bucket")
+
+
+async def test_a_copy_shares_the_bytes_but_not_later_writes(
+    store: object_store.FilesystemObjectStore,
+) -> None:
+    await store.put_bytes("drafts/a.md", b"first")
+
+    await store.copy("drafts/a.md", "releases/blobs/a.md")
+    await store.put_bytes("drafts/a.md", b"second")
+
+    assert await store.get_bytes("releases/blobs/a.md") == b"first"
+    assert await store.exists("releases/blobs/a.md")
+    assert not await store.exists("releases/blobs/b.md")
+
+
+async def test_copy_links_rather_than_duplicating(
+    store: object_store.FilesystemObjectStore,
+) -> None:
+    await store.put_bytes("drafts/a.md", b"body")
+
+    await store.copy("drafts/a.md", "releases/blobs/a.md")
+
+    assert (
+        store._path_for("drafts/a.md").stat().st_ino
+        == store._path_for("releases/blobs/a.md").stat().st_ino
+    )
+
+
+async def test_copying_a_missing_object_or_out_of_the_bucket_fails(
+    store: object_store.FilesystemObjectStore,
+) -> None:
+    with pytest.raises(object_store.ObjectNotFoundError):
+        await store.copy("drafts/missing.md", "releases/blobs/x.md")
+    await store.put_bytes("drafts/a.md", b"body")
+    with pytest.raises(object_store.ObjectStoreError):
+        await store.copy("drafts/a.md", "../escape.md")
+
+
+async def test_streams_round_trip_in_chunks(store: object_store.FilesystemObjectStore) -> None:
+    async def chunks() -> collections.abc.AsyncIterator[bytes]:
+        for part in (b"ab", b"cd", b"e"):
+            yield part
+
+    assert await store.put_stream("vault/a.bin", chunks()) == 5
+    assert [chunk async for chunk in store.get_stream("vault/a.bin", chunk_size=2)] == [
+        b"ab",
+        b"cd",
+        b"e",
+    ]
+    with pytest.raises(object_store.ObjectNotFoundError):
+        [chunk async for chunk in store.get_stream("vault/missing.bin")]
+
+
+async def test_file_io_runs_on_the_store_pool_and_fsyncs_when_asked(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    threads: set[str] = set()
+    synced: list[int] = []
+    real_fsync = os.fsync
+
+    def fsync(fd: int) -> None:
+        threads.add(threading.current_thread().name)
+        synced.append(fd)
+        real_fsync(fd)
+
+    monkeypatch.setattr(object_store.os, "fsync", fsync)
+    durable = object_store.FilesystemObjectStore(tmp_path, "bucket", io_threads=2)
+    await durable.put_bytes("a.bin", b"body")
+    # The file, then the directory holding the rename.
+    assert len(synced) == 2
+    assert all(name.startswith("object-store") for name in threads)
+
+    fast = object_store.FilesystemObjectStore(tmp_path, "bucket", fsync=False)
+    await fast.put_bytes("b.bin", b"body")
+    assert len(synced) == 2
+    assert await fast.get_bytes("b.bin") == b"body"
+    assert not list((tmp_path / "bucket").glob(".*.tmp"))
+    await durable.close()
+    await fast.close()
+
+
+async def test_buffers_map_the_file_and_are_released(
+    store: object_store.FilesystemObjectStore,
+) -> None:
+    await store.put_bytes("texts/a.txt", b"extracted text")
+    await store.put_bytes("texts/empty.txt", b"")
+
+    async with store.get_buffer("texts/a.txt") as view:
+        assert bytes(view[:9]) == b"extracted"
+    # Released with the map, so it cannot be read after the block.
+    with pytest.raises(ValueError):
+        view.tobytes()
+    async with store.get_buffer("texts/empty.txt") as empty:
+        assert len(empty) == 0
+    with pytest.raises(object_store.ObjectNotFoundError):
+        async with store.get_buffer("texts/missing.txt"):
+            pass
+
+
+class FakeS3:
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+        self.parts: list[bytes] = []
+
+    def __getattr__(self, name: str) -> typing.Any:
+        async def call(**kwargs: typing.Any) -> dict[str, typing.Any]:
+            self.calls.append(name)
+            if name == "upload_part":
+                self.parts.append(kwargs["Body"])
+            return {"UploadId": "upload-1", "ETag": f'"{len(self.parts)}"'}
+
+        return call
+
+
+@pytest.fixture()
+def s3(monkeypatch: pytest.MonkeyPatch) -> tuple[object_store.S3ObjectStore, FakeS3, list[int]]:
+    store = object_store.S3ObjectStore("bucket", None, "us-east-1", "key", "secret")
+    fake = FakeS3()
+    opened: list[int] = []
+
+    @contextlib.asynccontextmanager
+    async def client(*_args: typing.Any, **_kwargs: typing.Any):
+        opened.append(1)
+        yield fake
+
+    monkeypatch.setattr(store.session, "client", client)
+    return store, fake, opened
+
+
+async def test_one_client_serves_every_request_until_closed(s3) -> None:
+    store, fake, opened = s3
+
+    await store.put_bytes("a", b"1")
+    await store.exists("a")
+    await store.copy("a", "b")
+    assert len(opened) == 1
+
+    await store.close()
+    await store.put_bytes("a", b"2")
+    assert len(opened) == 2
+    assert fake.calls == ["put_object", "head_object", "copy_object", "put_object"]
+
+
+async def test_large_streams_upload_in_parts(s3, monkeypatch: pytest.MonkeyPatch) -> None:
+    store, fake, _opened = s3
+    monkeypatch.setattr(object_store, "MULTIPART_PART_SIZE", 4)
+
+    async def chunks(*parts: bytes) -> collections.abc.AsyncIterator[bytes]:
+        for part in parts:
+            yield part
+
+    assert await store.put_stream("small", chunks(b"ab")) == 2
+    assert fake.calls == ["put_object"]
+
+    fake.calls.clear()
+    assert await store.put_stream("large", chunks(b"abc", b"defgh", b"ij")) == 10
+    assert fake.calls == [
+        "create_multipart_upload",
+        "upload_part",
+        "upload_part",
+        "upload_part",
+        "complete_multipart_upload",
+    ]
+    assert fake.parts == [b"abcd", b"efgh", b"ij"]
+
+
+async def test_a_failed_stream_aborts_its_upload(s3, monkeypatch: pytest.MonkeyPatch) -> None:
+    store, fake, _opened = s3
+    monkeypatch.setattr(object_store, "MULTIPART_PART_SIZE", 4)
+
+    async def chunks() -> collections.abc.AsyncIterator[bytes]:
+        yield b"abcdef"
+        raise ValueError("client went away")
+
+    with pytest.raises(ValueError, match="client went away"):
+        await store.put_stream("large", chunks())
+    assert fake.calls[-1] == "abort_multipart_upload"
@@ -2,8 +2,11 @@
 
 from __future__ import annotations
 
+import copy
+
 import fastapi.testclient
 import pytest
+import sqlalchemy
 
 OWNER = "member_profile_a"
 OTHER = "member_profile_b"
@@ -95,6 +98,139 @@ def test_republish_replaces_rather_than_appends(client: fastapi.testclient.TestC
     assert [e for e in snapshot["edges"] if e["platform"] == "profile"] == []
 
 
+def test_reads_are_validated_by_etag_and_a_save_changes_it(
+    client: fastapi.testclient.TestClient,
+) -> None:
+    _put(client, OWNER, TREE)
+    first = client.get("/v1/graph/profile", params={"owner_id": OWNER})
+    etag = first.headers["etag"]
+
+    assert first.headers["cache-control"].startswith("public, max-age=")
+    revalidated = client.get(
+        "/v1/graph/profile", params={"owner_id": OWNER}, headers={"If-None-Match": etag}
+    )
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+    assert revalidated.headers["etag"] == etag
+
+    edited = copy.deepcopy(TREE)
+    edited["graph"]["label"] = "Henok T."
+    _put(client, OWNER, edited)
+    after = client.get(
+        "/v1/graph/profile", params={"owner_id": OWNER}, headers={"If-None-Match": etag}
+    )
+    assert after.status_code == 200
+    assert after.headers["etag"] != etag
+    assert after.json()["graph"]["label"] == "Henok T."
+
+
+def test_a_cached_read_runs_no_queries(
+    client: fastapi.testclient.TestClient, session_factory
+) -> None:
+    _put(client, OWNER, TREE)
+    client.get("/v1/graph/profile", params={"owner_id": OWNER})
+    statements: list[str] = []
+    sqlalchemy.event.listen(
+        session_factory.kw["bind"].sync_engine,
+        "before_cursor_execute",
+        lambda _conn, _cursor, statement, *_rest: statements.append(statement),
+    )
+
+    response = client.get("/v1/graph/profile", params={"owner_id": OWNER})
+
+    assert response.json()["graph"]["children"][0]["actionLabel"] == "Begin reading"
+    assert statements == []
+
+
+def _profile_ids(client: fastapi.testclient.TestClient) -> dict[str, str]:
+    snapshot = client.get("/v1/graph/snapshot", headers={"X-Owner-Id": OWNER}).json()
+    return {n["external_id"]: n["id"] for n in snapshot["nodes"] if n["platform"] == "profile"}
+
+
+def _count_written_rows(session_factory) -> list[int]:
+    written: list[int] = []
+
+    def count(_conn, _cursor, statement: str, parameters, _context, executemany: bool) -> None:
+        if statement.lstrip().split(" ", 1)[0] in {"INSERT", "UPDATE", "DELETE"}:
+            written.append(len(parameters) if executemany else 1)
+
+    sqlalchemy.event.listen(session_factory.kw["bind"].sync_engine, "before_cursor_execute", count)
+    return written
+
+
+def test_an_edit_keeps_the_ids_of_nodes_it_did_not_remove(
+    client: fastapi.testclient.TestClient,
+) -> None:
+    _put(client, OWNER, TREE)
+    before = _profile_ids(client)
+    edited = copy.deepcopy(TREE)
+    edited["graph"]["children"][1]["label"] = "Work history"
+    edited["graph"]["children"][0]["children"] = [{"id": "essays", "label": "Essays"}]
+
+    assert _put(client, OWNER, edited).status_code == 200
+    after = _profile_ids(client)
+
+    assert after["self/work"] == before["self/work"]
+    assert after["self/writing"] == before["self/writing"]
+    assert "self/writing/dot" not in after and "self/writing/essays" in after
+    graph = client.get("/v1/graph/profile", params={"owner_id": OWNER}).json()["graph"]
+    assert graph["children"][1]["label"] == "Work history"
+    assert graph["children"][0]["children"][0]["label"] == "Essays"
+
+
+async def test_removing_a_node_drops_its_other_edges_too(
+    client: fastapi.testclient.TestClient, session_factory
+) -> None:
+    # SQLite leaves foreign keys unenforced unless asked; Postgres always enforces them.
+    async with session_factory() as session:
+        await session.execute(sqlalchemy.text("PRAGMA foreign_keys=ON"))
+    _put(client, OWNER, TREE)
+    ids = _profile_ids(client)
+    for source, target in [("self/writing/dot", "self/work"), ("self/work", "self/writing/dot")]:
+        response = client.post(
+            "/v1/graph/edges",
+            headers={"X-Owner-Id": OWNER},
+            json={
+                "source_node_id": ids[source],
+                "target_node_id": ids[target],
+                "relation": "cites",
+            },
+        )
+        assert response.status_code in {200, 201}
+    edited = copy.deepcopy(TREE)
+    edited["graph"]["children"][0]["children"] = []
+
+    assert _put(client, OWNER, edited).status_code == 200
+    snapshot = client.get("/v1/graph/snapshot", headers={"X-Owner-Id": OWNER}).json()
+    assert "self/writing/dot" not in _profile_ids(client)
+    assert [e for e in snapshot["edges"] if e["relation"] == "cites"] == []
+
+
+def test_a_save_writes_only_what_changed(
+    client: fastapi.testclient.TestClient, session_factory
+) -> None:
+    _put(client, OWNER, TREE)
+    written = _count_written_rows(session_factory)
+
+    _put(client, OWNER, TREE)
+    assert written == []
+
+    edited = copy.deepcopy(TREE)
+    edited["graph"]["children"][1]["label"] = "Work history"
+    _put(client, OWNER, edited)
+    # The edited node, then the root's save time.
+    assert sum(written) == 2
+
+    written.clear()
+    reordered = copy.deepcopy(edited)
+    reordered["graph"]["children"].reverse()
+    _put(client, OWNER, reordered)
+    # Two sibling orders, their two edges, and the root.
+    assert sum(written) == 5
+    graph = client.get("/v1/graph/profile", params={"owner_id": OWNER}).json()["graph"]
+    assert [child["id"] for child in graph["children"]] == ["work", "writing"]
+
+
 def test_sibling_ids_repeated_under_different_parents_are_kept_apart(
     client: fastapi.testclient.TestClient,
 ) -> None:
@@ -1,16 +1,22 @@
+import asyncio
+import hashlib
 import pathlib
+import shutil
 
 import fastapi
 import fastapi.testclient
 import httpx
 import pytest
 import sqlalchemy
+import sqlalchemy.exc
 import sqlalchemy.ext.asyncio
 
 import app.auth.dependencies
 import app.db.models
 import app.domains.publication.schemas
 import app.domains.publication.service
+import app.domains.publication.sitemap
+import app.integrations.object_store
 
 OWNER_HEADERS: dict[str, str] = {"X-Owner-Id": "owner_1"}
 OTHER_OWNER_HEADERS: dict[str, str] = {"X-Owner-Id": "owner_2"}
@@ -71,16 +77,18 @@ async def test_section_body_service_round_trip_preserves_revisions(
 
 
 def create_ready_project(
-    client: fastapi.testclient.TestClient, visibility: str = "private"
+    client: fastapi.testclient.TestClient,
+    visibility: str = "private",
+    headers: dict[str, str] = OWNER_HEADERS,
 ) -> tuple[dict, dict]:
     project = client.post(
         "/v1/publications/projects",
-        headers=OWNER_HEADERS,
+        headers=headers,
         json={"title": "Henok Book", "visibility": visibility},
     ).json()
     section_response: httpx.Response = client.post(
         f"/v1/publications/projects/{project['id']}/sections",
-        headers=OWNER_HEADERS,
+        headers=headers,
         json={"title": "Chapter 1", "body_ref": "objects/drafts/chapter-1.md"},
     )
     assert section_response.status_code == 201
@@ -171,8 +179,8 @@ def test_publication_release_writes_immutable_manifest(
     assert snapshot["order"] == 0
     assert snapshot["title"] == "Chapter 1"
     assert snapshot["status"] == "draft"
-    # Bodies are snapshotted into the immutable release namespace.
-    assert snapshot["body_ref"].startswith("releases/owner_1/henok-book/v1/sections/")
+    # Bodies are snapshotted into the immutable release namespace, by content.
+    assert snapshot["body_ref"].startswith("releases/blobs/")
     body_response: httpx.Response = client.get(
         f"/v1/publications/delivery/body/{snapshot['body_ref']}"
     )
@@ -263,8 +271,264 @@ def test_publication_delivery_manifest_requires_published_release(
     assert manifest_response.status_code == 404
 
 
-def test_section_body_upload_and_release_snapshot(
+def test_delivery_manifests_are_cached_and_revalidated_by_etag(
+    client: fastapi.testclient.TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    project, _section = create_ready_project(client, visibility="public")
+    client.post(
+        f"/v1/publications/projects/{project['id']}/releases", headers=OWNER_HEADERS, json={}
+    )
+    url = "/v1/publications/delivery/owner_1/henok-book/manifest"
+    first: httpx.Response = client.get(url)
+    reads: list[str] = []
+    store_type = type(app.integrations.object_store.get_object_store())
+    original = store_type.get_bytes
+
+    async def counted(self, key: str) -> bytes:
+        reads.append(key)
+        return await original(self, key)
+
+    monkeypatch.setattr(store_type, "get_bytes", counted)
+
+    again: httpx.Response = client.get(url)
+    revalidated: httpx.Response = client.get(url, headers={"If-None-Match": first.headers["etag"]})
+    pinned: httpx.Response = client.get(url, params={"version": 1})
+
+    assert reads == []
+    assert again.content == first.content
+    assert revalidated.status_code == 304 and revalidated.content == b""
+    assert pinned.headers["etag"] == first.headers["etag"]
+    assert "immutable" in pinned.headers["cache-control"]
+    assert "immutable" not in first.headers["cache-control"]
+
+
+def test_a_new_release_or_a_private_project_is_served_at_once(
+    client: fastapi.testclient.TestClient,
+) -> None:
+    project, _section = create_ready_project(client, visibility="public")
+    releases = f"/v1/publications/projects/{project['id']}/releases"
+    url = "/v1/publications/delivery/owner_1/henok-book/manifest"
+    client.post(releases, headers=OWNER_HEADERS, json={})
+    first: httpx.Response = client.get(url)
+
+    client.post(releases, headers={**OWNER_HEADERS, "Idempotency-Key": "second"}, json={})
+    latest: httpx.Response = client.get(url, headers={"If-None-Match": first.headers["etag"]})
+    assert latest.status_code == 200
+    assert latest.json()["release"]["version"] == 2
+    assert client.get(url, params={"version": 1}).json()["release"]["version"] == 1
+
+    client.patch(
+        f"/v1/publications/projects/{project['id']}",
+        headers=OWNER_HEADERS,
+        json={"visibility": "private"},
+    )
+    assert client.get(url).status_code == 404
+
+
+def test_the_sitemap_is_written_at_release_and_served_from_storage(
+    client: fastapi.testclient.TestClient,
+    session_factory: sqlalchemy.ext.asyncio.async_sessionmaker[sqlalchemy.ext.asyncio.AsyncSession],
+) -> None:
+    project, _section = create_ready_project(client, visibility="public")
+    assert b"<url>" not in client.get("/v1/publications/sitemap.xml").content
+    client.post(
+        f"/v1/publications/projects/{project['id']}/releases", headers=OWNER_HEADERS, json={}
+    )
+    assert asyncio.run(_sitemap_owners(session_factory)) == ["owner_1"]
+
+    plain: httpx.Response = client.get(
+        "/v1/publications/sitemap.xml", headers={"Accept-Encoding": "identity"}
+    )
+    packed: httpx.Response = client.get(
+        "/v1/publications/sitemap.xml", headers={"Accept-Encoding": "gzip"}
+    )
+    revalidated: httpx.Response = client.get(
+        "/v1/publications/sitemap.xml",
+        headers={"Accept-Encoding": "identity", "If-None-Match": plain.headers["etag"]},
+    )
+
+    assert plain.status_code == 200
+    assert b"/read/owner_1/henok-book</loc>" in plain.content
+    assert "content-encoding" not in plain.headers
+    assert packed.headers["content-encoding"] == "gzip"
+    assert packed.content == plain.content
+    assert packed.headers["etag"] != plain.headers["etag"]
+    assert revalidated.status_code == 304
+    assert client.get("/v1/publications/sitemap-1.xml").status_code == 404
+
+    client.patch(
+        f"/v1/publications/projects/{project['id']}",
+        headers=OWNER_HEADERS,
+        json={"visibility": "private"},
+    )
+    assert b"<url>" not in client.get("/v1/publications/sitemap.xml").content
+
+
+def test_an_unpublished_project_leaves_the_sitemap(
+    client: fastapi.testclient.TestClient,
+) -> None:
+    project, _section = create_ready_project(client, visibility="public")
+    client.post(
+        f"/v1/publications/projects/{project['id']}/releases", headers=OWNER_HEADERS, json={}
+    )
+    assert b"/read/owner_1/henok-book</loc>" in client.get("/v1/publications/sitemap.xml").content
+
+    response: httpx.Response = client.patch(
+        f"/v1/publications/projects/{project['id']}",
+        headers=OWNER_HEADERS,
+        json={"status": "draft"},
+    )
+
+    assert response.status_code == 200
+    assert b"henok-book" not in client.get("/v1/publications/sitemap.xml").content
+
+
+async def _sitemap_owners(
+    session_factory: sqlalchemy.ext.asyncio.async_sessionmaker[sqlalchemy.ext.asyncio.AsyncSession],
+) -> list[str]:
+    async with session_factory() as session:
+        listed = sqlalchemy.select(app.db.models.SitemapEntry.owner_id).distinct()
+        return sorted(await session.scalars(listed))
+
+
+def test_rebuilding_fills_the_sitemap_after_an_upgrade(
     client: fastapi.testclient.TestClient,
+    session_factory: sqlalchemy.ext.asyncio.async_sessionmaker[sqlalchemy.ext.asyncio.AsyncSession],
+    tmp_path: pathlib.Path,
+) -> None:
+    for headers in (OWNER_HEADERS, OTHER_OWNER_HEADERS):
+        project, _section = create_ready_project(client, visibility="public", headers=headers)
+        client.post(f"/v1/publications/projects/{project['id']}/releases", headers=headers, json={})
+
+    # As upgraded: releases exist, but nothing has listed them yet.
+    async def forget() -> None:
+        async with session_factory() as session:
+            await session.execute(sqlalchemy.delete(app.db.models.SitemapEntry))
+            await session.commit()
+
+    asyncio.run(forget())
+    for stored in tmp_path.rglob("sitemaps"):
+        shutil.rmtree(stored)
+    app.domains.publication.sitemap.invalidate()
+    assert b"<url>" not in client.get("/v1/publications/sitemap.xml").content
+
+    async def rebuild(owner_ids: list[str] | None = None) -> int:
+        return await app.domains.publication.sitemap.rebuild(session_factory, owner_ids)
+
+    async def add_members() -> None:
+        async with session_factory() as session:
+            session.add(app.db.models.Member(id="owner_1", email_hash="0" * 64))
+            session.add(app.db.models.Member(id="member_quiet", email_hash="1" * 64))
+            await session.commit()
+
+    asyncio.run(add_members())
+    # owner_2 has no member row, so a default rebuild cannot find it.
+    assert asyncio.run(rebuild()) == 2
+    assert asyncio.run(_sitemap_owners(session_factory)) == ["owner_1"]
+    assert asyncio.run(rebuild(["owner_2"])) == 1
+    # Once listed, it is part of every later rebuild.
+    assert asyncio.run(rebuild()) == 3
+    sitemap: bytes = client.get("/v1/publications/sitemap.xml").content
+    assert b"/read/owner_1/henok-book</loc>" in sitemap
+    assert b"/read/owner_2/henok-book</loc>" in sitemap
+
+
+def test_a_sitemap_failure_does_not_fail_the_committed_release(
+    client: fastapi.testclient.TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    project, _section = create_ready_project(client, visibility="public")
+
+    async def unavailable(session: object, owner_id: str) -> dict[str, str]:
+        raise sqlalchemy.exc.OperationalError("select", {}, Exception("connection lost"))
+
+    monkeypatch.setattr(app.domains.publication.sitemap, "_owner_entries", unavailable)
+    response: httpx.Response = client.post(
+        f"/v1/publications/projects/{project['id']}/releases", headers=OWNER_HEADERS, json={}
+    )
+
+    assert response.status_code == 201
+    assert response.json()["version"] == 1
+
+
+def test_a_large_sitemap_becomes_an_index_over_shards(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(app.domains.publication.sitemap, "MAX_URLS_PER_SITEMAP", 2)
+    owners: dict[str, dict[str, str]] = {
+        "owner_1": {"https://example.test/read/owner_1/a": "2026-01-01"},
+        "owner_2": {
+            "https://example.test/read/owner_2/b": "2026-03-01",
+            "https://example.test/read/owner_2/c": "2026-02-01",
+        },
+    }
+
+    documents = app.domains.publication.sitemap.render(owners)
+
+    assert set(documents) == {
+        "sitemaps/sitemap.xml",
+        "sitemaps/sitemap-1.xml",
+        "sitemaps/sitemap-2.xml",
+    }
+    index: bytes = documents["sitemaps/sitemap.xml"]
+    assert b"<sitemapindex" in index
+    assert b"/v1/publications/sitemap-2.xml</loc><lastmod>2026-01-01</lastmod>" in index
+    assert documents["sitemaps/sitemap-1.xml"].count(b"<url>") == 2
+    assert b"/read/owner_2/b</loc>" in documents["sitemaps/sitemap-1.xml"]
+
+
+async def test_release_snapshots_run_concurrently_and_skip_stored_bodies(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    class SlowStore:
+        def __init__(self) -> None:
+            self.objects: dict[str, bytes] = {}
+            self.puts: list[str] = []
+            self.in_flight = 0
+            self.peak = 0
+
+        async def _round_trip(self) -> None:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+            await asyncio.sleep(0.01)
+            self.in_flight -= 1
+
+        async def exists(self, key: str) -> bool:
+            await self._round_trip()
+            return key in self.objects
+
+        async def put_bytes(self, key: str, data: bytes) -> None:
+            await self._round_trip()
+            self.puts.append(key)
+            self.objects[key] = data
+
+    store = SlowStore()
+    monkeypatch.setattr(app.integrations.object_store, "get_object_store", lambda: store)
+    sections = [
+        app.db.models.PublicationSection(id=f"sec_{index}", body_ref=f"Chapter {index % 20}.")
+        for index in range(40)
+    ]
+
+    first = await app.domains.publication.service.snapshot_release_bodies(sections)
+    uploaded = len([key for key in store.puts if key.endswith(".md")])
+    second = await app.domains.publication.service.snapshot_release_bodies(sections)
+
+    assert first == second
+    assert (
+        first["sec_0"]
+        == first["sec_20"]
+        == "releases/blobs/" + (hashlib.sha256(b"Chapter 0.").hexdigest() + ".md")
+    )
+    assert len(set(first.values())) == 20
+    # Same-content sections snapshotted side by side may both upload; a later
+    # release finds every body already stored.
+    assert 20 <= uploaded <= 40
+    assert all(f"{key}.gz" in store.objects for key in first.values())
+    assert len([key for key in store.puts if key.endswith(".md")]) == uploaded
+    assert 1 < store.peak <= app.domains.publication.service.SNAPSHOT_CONCURRENCY
+
+
+def test_section_body_upload_and_release_snapshot(
+    client: fastapi.testclient.TestClient, monkeypatch: pytest.MonkeyPatch
 ) -> None:
     project = client.post(
         "/v1/publications/projects",
@@ -318,6 +582,12 @@ def test_section_body_upload_and_release_snapshot(
     assert second_upload.status_code == 200
     assert second_upload.json()["body_ref"] != first_draft_ref
 
+    async def unread(_store, key: str) -> str:
+        raise AssertionError(f"release read {key} back instead of copying it")
+
+    store_type = type(app.integrations.object_store.get_object_store())
+    get_text = store_type.get_text
+    monkeypatch.setattr(store_type, "get_text", unread)
     release: httpx.Response = client.post(
         f"/v1/publications/projects/{project['id']}/releases",
         headers=OWNER_HEADERS,
@@ -329,16 +599,40 @@ def test_section_body_upload_and_release_snapshot(
     assert manifest["project"]["meta"]["author"] == "Henok"
     manifest_section = manifest["sections"][0]
     assert manifest_section["meta"]["kind"] == "preface"
-    assert manifest_section["body_ref"].startswith(
-        f"releases/owner_1/{project['slug']}/v1/sections/"
+    assert manifest_section["body_ref"].startswith("releases/blobs/")
+
+    assert manifest_section["body_ref"] == "releases/blobs/{}.md".format(
+        hashlib.sha256(b"# Preface\n\nA revised observer belongs in the inquiry.").hexdigest()
     )
 
+    monkeypatch.setattr(store_type, "get_text", get_text)
     body: httpx.Response = client.get(
         f"/v1/publications/delivery/body/{manifest_section['body_ref']}"
     )
     assert body.status_code == 200
     assert "observer belongs in the inquiry" in body.text
 
+    body_url: str = f"/v1/publications/delivery/body/{manifest_section['body_ref']}"
+    compressed: httpx.Response = client.get(body_url, headers={"Accept-Encoding": "gzip"})
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert compressed.text == "# Preface\n\nA revised observer belongs in the inquiry."
+    assert compressed.headers["etag"].endswith('-gzip"')
+    identity: httpx.Response = client.get(body_url, headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in identity.headers
+    assert identity.headers["etag"] == '"{}"'.format(
+        manifest_section["body_ref"].removeprefix("releases/blobs/").removesuffix(".md")
+    )
+    revalidated: httpx.Response = client.get(
+        body_url, headers={"If-None-Match": compressed.headers["etag"]}
+    )
+    assert revalidated.status_code == 304
+    ranged: httpx.Response = client.get(body_url, headers={"Range": "bytes=2-8"})
+    assert ranged.status_code == 206
+    assert ranged.content == b"Preface"
+    assert ranged.headers["content-range"] == f"bytes 2-8/{len(identity.content)}"
+    assert client.get(body_url, headers={"Range": "bytes=9999-"}).status_code == 416
+    assert client.get(f"{body_url}.gz").status_code == 404
+
     # Draft namespace must never be publicly readable.
     draft_leak: httpx.Response = client.get(
         f"/v1/publications/delivery/body/{upload.json()['body_ref']}"
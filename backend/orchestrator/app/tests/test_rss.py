@@ -0,0 +1,102 @@
+"""Feeds are parsed as they stream in.
+
+These pin that chunking does not change the result, that the parser keeps no
+finished items in its tree, and that an import stops reading a feed once it
+has `MAX_FEED_ITEMS` items.
+"""
+
+from __future__ import annotations
+
+import httpx
+import pytest
+
+import app.core.http_client
+import app.domains.graph.service
+import app.integrations.connectors.rss as rss
+
+
+def _rss(items: int) -> bytes:
+    entries = "".join(
+        f"<item><title>Post {index}</title><link>https://example.com/{index}</link>"
+        f"<guid>p{index}</guid><category>Graphs</category></item>"
+        for index in range(items)
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+        f"<title>Notes</title><link>https://example.com</link>{entries}</channel></rss>"
+    ).encode()
+
+
+ATOM = b"""<?xml version="1.0"?>
+<feed xmlns="http://www.w3.org/2005/Atom"><title>Atom Notes</title>
+<link href="https://atom.example.com" rel="alternate"/>
+<entry><title>First</title><id>tag:1</id><link href="https://atom.example.com/1"/>
+<category term="graphs"/><updated>2026-06-13T12:00:00Z</updated></entry>
+</feed>"""
+
+
+@pytest.mark.parametrize("document", [_rss(20), ATOM], ids=["rss", "atom"])
+def test_chunked_parsing_matches_parsing_whole(document: bytes) -> None:
+    whole = rss.parse_feed(document)
+    parser = rss.FeedParser()
+    streamed: list[rss.RssFeedItem] = []
+    for start in range(0, len(document), 7):
+        streamed.extend(parser.feed(document[start : start + 7]))
+
+    assert parser.close() == whole
+    assert tuple(streamed) == whole.items
+    assert whole.title in {"Notes", "Atom Notes"}
+
+
+def test_finished_items_leave_the_tree() -> None:
+    parser = rss.FeedParser()
+    parser.feed(_rss(50))
+
+    channel = parser._root.find("channel")
+    assert [child.tag for child in channel] == ["title", "link"]
+    assert len(parser.close().items) == 50
+
+
+def test_the_item_cap_stops_before_the_document_ends() -> None:
+    document: bytes = _rss(10)
+    parser = rss.FeedParser(max_items=3)
+    parser.feed(document[: document.index(b"<item><title>Post 4")])
+
+    assert parser.done
+    # Closing early does not demand the rest of the document.
+    assert [item.title for item in parser.close().items] == ["Post 0", "Post 1", "Post 2"]
+
+
+def test_malformed_feeds_raise_a_parse_error() -> None:
+    with pytest.raises(rss.FeedParseError):
+        rss.parse_feed(b"<html><body>not a feed</body></html>")
+    with pytest.raises(rss.FeedParseError):
+        rss.parse_feed(_rss(3)[:-20])
+
+
+async def test_a_fetch_stops_reading_at_the_item_cap(monkeypatch: pytest.MonkeyPatch) -> None:
+    document: bytes = _rss(40)
+    chunks_sent: list[int] = []
+
+    async def body():
+        for start in range(0, len(document), 256):
+            chunks_sent.append(start)
+            yield document[start : start + 256]
+
+    def handler(_request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, headers={"Content-Type": "application/rss+xml"}, content=body())
+
+    async def public_target(_feed_url: str) -> None:
+        return None
+
+    monkeypatch.setattr(
+        app.core.http_client,
+        "create_service_client",
+        lambda *_args, **_kwargs: httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+    monkeypatch.setattr(app.domains.graph.service, "assert_public_feed_target", public_target)
+
+    fetched = await app.domains.graph.service.fetch_feed("https://example.com/feed", max_items=5)
+
+    assert fetched.feed is not None and len(fetched.feed.items) == 5
+    assert len(chunks_sent) < len(document) // 256
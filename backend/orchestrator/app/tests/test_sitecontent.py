@@ -14,6 +14,8 @@ import pytest
 
 import app.api.v1.sitecontent as sitecontent_router
 import app.auth.dependencies
+import app.domains.sitecontent.service as sitecontent_service
+import app.domains.sitecontent.versions as sitecontent_versions
 
 STEWARD = app.auth.dependencies.OwnerContext(owner_id="owner_1", actor_id="owner_1", role="owner")
 MEMBER = app.auth.dependencies.OwnerContext(owner_id="member_1", actor_id="member_1", role="member")
@@ -132,3 +134,52 @@ def test_oversized_values_are_refused(as_steward: fastapi.testclient.TestClient)
     response = as_steward.put("/v1/site-content/home.lede", json={"value": "x" * 5_000})
 
     assert response.status_code == 422
+
+
+def test_published_copy_is_cached_and_revalidated_by_etag(
+    as_steward: fastapi.testclient.TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    as_steward.put("/v1/site-content/home.lede", json={"value": "cached", "publish": True})
+    first = as_steward.get("/v1/site-content")
+    reads: list[None] = []
+    original = sitecontent_service.published_blocks
+
+    async def counted(session):
+        reads.append(None)
+        return await original(session)
+
+    monkeypatch.setattr(sitecontent_service, "published_blocks", counted)
+
+    again = as_steward.get("/v1/site-content")
+    revalidated = as_steward.get(
+        "/v1/site-content", headers={"If-None-Match": first.headers["etag"]}
+    )
+    assert reads == []
+    assert again.content == first.content
+    assert revalidated.status_code == 304 and revalidated.content == b""
+
+    # Drafts are not public, so saving one keeps the cache.
+    as_steward.put("/v1/site-content/home.lede", json={"value": "drafted"})
+    as_steward.get("/v1/site-content")
+    assert reads == []
+
+    as_steward.post("/v1/site-content/home.lede/publish")
+    published = as_steward.get("/v1/site-content", headers={"If-None-Match": first.headers["etag"]})
+    assert published.status_code == 200
+    assert published.json() == {"blocks": {"home.lede": "drafted"}}
+    assert len(reads) == 1
+
+
+def test_a_version_from_another_instance_drops_the_cache(
+    as_steward: fastapi.testclient.TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(sitecontent_versions, "_versions", sitecontent_versions._Versions())  # noqa: SLF001
+    as_steward.get("/v1/site-content")
+    version = sitecontent_versions.current()
+
+    sitecontent_versions.observe(3)
+    assert sitecontent_versions.current() == version + 1
+    # A late or echoed message carries a number already seen.
+    sitecontent_versions.observe(2)
+    sitecontent_versions.observe(3)
+    assert sitecontent_versions.current() == version + 1
@@ -10,6 +10,8 @@ import typing
 
 import fastapi.testclient
 import pytest
+import sqlalchemy
+import sqlalchemy.orm
 
 import app.core.config
 import app.domains.support.models as models
@@ -319,3 +321,113 @@ def test_totals_expose_no_individual_supporters(
     client.post("/v1/support/webhook", json={})
     body = client.get("/v1/support/totals").text
     assert "email" not in body and "a@example.com" not in body
+
+
+def test_totals_follow_contributions_into_and_out_of_succeeded_without_a_scan(
+    client: fastapi.testclient.TestClient,
+    stub_stripe: _StubStripe,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    for provider_ref, amount in [("pi_kept", 500), ("pi_refunded", 2_500)]:
+        _verified(
+            {
+                "type": "payment_intent.succeeded",
+                "data": {"object": {"id": provider_ref, "amount_received": amount}},
+            },
+            monkeypatch,
+        )
+        client.post("/v1/support/webhook", json={})
+
+    async def no_scan(session: object) -> dict[str, int]:
+        raise AssertionError("totals must be read from the maintained row")
+
+    monkeypatch.setattr(support_service, "_ledger_totals", no_scan)
+    assert client.get("/v1/support/totals").json()["total_minor"] == 3_000
+
+    _verified(
+        {
+            "type": "charge.refunded",
+            "data": {"object": {"id": "ch_1", "payment_intent": "pi_refunded"}},
+        },
+        monkeypatch,
+    )
+    assert client.post("/v1/support/webhook", json={}).json() == {"applied": True}
+    assert client.get("/v1/support/totals").json() == {
+        "supporters": 1,
+        "total_minor": 500,
+        "currency": "usd",
+    }
+
+
+async def test_reconciliation_reports_and_corrects_drift(session_factory) -> None:
+    async with session_factory() as session:
+        session.add_all(
+            [
+                models.SupportContribution(
+                    provider_ref="pi_a", amount_minor=500, status="succeeded"
+                ),
+                models.SupportContribution(provider_ref="pi_b", amount_minor=900, status="failed"),
+                models.SupportTotals(id=models.TOTALS_ID, supporters=3, total_minor=7_000),
+            ]
+        )
+        await session.commit()
+
+    async with session_factory() as session:
+        drifted = await support_service.reconcile_totals(session)
+    async with session_factory() as session:
+        settled = await support_service.reconcile_totals(session)
+        totals = await support_service.totals(session)
+
+    assert drifted.drifted
+    assert drifted.stored == {"supporters": 3, "total_minor": 7_000}
+    assert drifted.ledger == {"supporters": 1, "total_minor": 500}
+    assert not settled.drifted
+    assert totals == {"supporters": 1, "total_minor": 500}
+
+
+async def test_events_lock_the_contribution_before_counting_its_transition(
+    session_factory,
+) -> None:
+    async with session_factory() as session:
+        session.add(
+            models.SupportContribution(
+                id="sup_locked", provider_ref="cs_locked", amount_minor=500, status="pending"
+            )
+        )
+        await session.commit()
+    locked: list[bool] = []
+
+    def record(state: sqlalchemy.orm.ORMExecuteState) -> None:
+        # Loads of the contribution itself; the ledger aggregate reads no rows to lock.
+        if state.is_select and state.statement.column_descriptions[0]["type"] is (
+            models.SupportContribution
+        ):
+            locked.append(state.statement._for_update_arg is not None)  # noqa: SLF001
+
+    sqlalchemy.event.listen(sqlalchemy.orm.Session, "do_orm_execute", record)
+    try:
+        async with session_factory() as session:
+            await support_service.apply_event(
+                session,
+                {
+                    "type": "checkout.session.completed",
+                    "data": {
+                        "object": {
+                            "id": "cs_locked",
+                            "payment_status": "paid",
+                            "metadata": {"support_id": "sup_locked"},
+                        }
+                    },
+                },
+            )
+            await support_service.apply_event(
+                session,
+                {
+                    "type": "payment_intent.succeeded",
+                    "data": {"object": {"id": "pi_unlinked", "amount_received": 700}},
+                },
+            )
+    finally:
+        sqlalchemy.event.remove(sqlalchemy.orm.Session, "do_orm_execute", record)
+
+    assert locked and all(locked)
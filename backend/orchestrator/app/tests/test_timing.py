@@ -0,0 +1,75 @@
+"""Stage timings say where a slow answer spent its time, and nothing else.
+
+They leave the process twice — as a response header and as a log line — so both
+are pinned to carry stage names and durations only, never the question asked.
+"""
+
+from __future__ import annotations
+
+import logging
+
+import fastapi.testclient
+import pytest
+
+import app.core.timing as timing
+
+
+def test_spans_outside_a_collector_record_nothing() -> None:
+    with timing.span("retrieval"):
+        pass
+
+    assert timing.current() is None
+
+
+def test_repeated_stages_are_summed_and_nested_stages_kept() -> None:
+    with timing.collect() as timings:
+        with timing.span("retrieval"):
+            with timing.span("embedding"):
+                pass
+            with timing.span("embedding"):
+                pass
+
+    assert set(timings.durations()) == {"retrieval", "embedding"}
+    assert timings.counts() == {"retrieval": 1, "embedding": 2}
+    assert timings.durations()["retrieval"] >= timings.durations()["embedding"]
+
+
+def test_header_value_is_a_valid_server_timing_list() -> None:
+    timings = timing.Timings()
+    timings.record("node_query", 1.234)
+    timings.record("model call", 20.0)
+
+    assert timings.header_value() == "node_query;dur=1.2, model_call;dur=20.0"
+
+
+def test_a_public_ask_reports_its_stages_without_content(
+    client: fastapi.testclient.TestClient, caplog: pytest.LogCaptureFixture
+) -> None:
+    question = "What does the unmistakable phrase zebra-quartz mean?"
+
+    with caplog.at_level(logging.INFO, logger="dot_orchestrator.timing"):
+        response = client.post(
+            "/v1/twin/public/ask",
+            json={"owner_id": "henok", "lens": "ground", "question": question},
+        )
+
+    assert response.status_code == 200
+    header = response.headers[timing.SERVER_TIMING_HEADER]
+    for stage in ("retrieval", "bind_tenant", "node_query", "chunk_query"):
+        assert f"{stage};dur=" in header
+    assert "zebra" not in header
+
+    record = next(record for record in caplog.records if record.msg == "request.timings")
+    assert record.route == "/v1/twin/public/ask"
+    assert set(record.timings_ms) >= {"retrieval", "node_query", "chunk_query"}
+    assert "zebra" not in repr(record.__dict__)
+
+
+def test_routes_without_stages_carry_no_header(client: fastapi.testclient.TestClient) -> None:
+    response = client.get("/healthz")
+
+    assert timing.SERVER_TIMING_HEADER not in response.headers
+
+
+def test_tracing_stays_off_unless_enabled() -> None:
+    assert timing.configure_tracing(False, "dot-orchestrator") is False
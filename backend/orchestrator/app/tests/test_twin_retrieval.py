@@ -7,7 +7,9 @@ document passage is citable by its owner and reachable by no one else.
 
 import app.auth.dependencies
 import app.db.models
+import app.domains.graph.adjacency as adjacency
 import app.domains.twin.retriever as retriever
+from app.domains.graph.bulk import GraphWriter
 
 ALICE = app.auth.dependencies.OwnerContext(owner_id="owner-alice", actor_id="owner-alice")
 BOB = app.auth.dependencies.OwnerContext(owner_id="owner-bob", actor_id="owner-bob")
@@ -167,3 +169,82 @@ async def test_an_empty_vault_and_empty_graph_retrieve_nothing(session_factory)
         passages = await retriever.retrieve_passages(session, ALICE, "owner-alice", "anything")
 
     assert passages == []
+
+
+async def _seed_topic_graph(session, *, topic_visibility: str = "public") -> dict[str, str]:
+    """Two posts match "pricing"; the topic they share and its other post do not."""
+
+    nodes = {
+        "first": ("post", "Pricing the first edition", "public"),
+        "second": ("post", "Pricing for libraries", "public"),
+        "topic": ("topic", "Publishing economics", topic_visibility),
+        "sibling": ("post", "Why print runs are small", "public"),
+        "stray": ("post", "Garden notes", "public"),
+    }
+    records = {
+        name: app.db.models.FootprintNode(
+            owner_id="owner-alice", kind=kind, label=label, visibility=visibility
+        )
+        for name, (kind, label, visibility) in nodes.items()
+    }
+    session.add_all(records.values())
+    await session.flush()
+    for source in ("first", "second", "sibling"):
+        session.add(
+            app.db.models.FootprintEdge(
+                owner_id="owner-alice",
+                source_node_id=records[source].id,
+                target_node_id=records["topic"].id,
+                relation="mentions",
+            )
+        )
+    await session.commit()
+    return {name: record.id for name, record in records.items()}
+
+
+async def test_expansion_reaches_the_topics_the_hits_share(session_factory) -> None:
+    async with session_factory() as session:
+        ids = await _seed_topic_graph(session)
+        found = await retriever.retrieve(session, ALICE, "owner-alice", "pricing")
+
+    found_ids = [node.id for node in found]
+    # The shared topic outranks its second-hop post; an unconnected node stays out.
+    assert set(found_ids[:2]) == {ids["first"], ids["second"]}
+    assert found_ids.index(ids["topic"]) < found_ids.index(ids["sibling"])
+    assert ids["stray"] not in found_ids
+
+
+async def test_expansion_never_walks_through_a_hidden_node(session_factory) -> None:
+    async with session_factory() as session:
+        ids = await _seed_topic_graph(session, topic_visibility="private")
+        found = await retriever.retrieve(session, BOB, "owner-alice", "pricing")
+
+    assert {node.id for node in found} == {ids["first"], ids["second"]}
+
+
+async def test_committed_graph_writes_invalidate_the_cached_adjacency(session_factory) -> None:
+    async with session_factory() as session:
+        ids = await _seed_topic_graph(session)
+        cached = await adjacency.load(session, "owner-alice")
+        assert await adjacency.load(session, "owner-alice") is cached
+
+        session.add(
+            app.db.models.FootprintEdge(
+                owner_id="owner-alice",
+                source_node_id=ids["stray"],
+                target_node_id=ids["topic"],
+                relation="mentions",
+            )
+        )
+        await session.flush()
+        await session.rollback()
+        assert await adjacency.load(session, "owner-alice") is cached
+
+        writer = GraphWriter("owner-alice")
+        writer.node(kind="topic", label="Gardens", platform="rss", external_id="t", source_ref={})
+        await writer.write(session)
+        await session.commit()
+        reloaded = await adjacency.load(session, "owner-alice")
+
+    assert reloaded is not cached
+    assert len(reloaded.neighbours[ids["topic"]]) == 3
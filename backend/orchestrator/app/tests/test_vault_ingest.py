@@ -6,8 +6,20 @@ it. These assert that uploading actually leaves readable, citable knowledge
 behind, and that it stays inside the uploader's tenant.
 """
 
+import collections.abc
+import hashlib
+import os
+import pathlib
+import typing
+import urllib.parse
+
 import fastapi.testclient
 import httpx
+import pytest
+
+import app.api.v1.vault
+import app.integrations.object_store
+import app.settings
 
 OWNER_HEADERS: dict[str, str] = {"X-Owner-Id": "owner_1"}
 OTHER_OWNER_HEADERS: dict[str, str] = {"X-Owner-Id": "owner_2"}
@@ -113,3 +125,62 @@ def test_a_plain_text_upload_is_chunked_the_same_way(
     node: dict = _upload(client, filename="notes.txt", content_type="text/plain")
     assert node["properties"]["ingest_status"] == "ready"
     assert node["properties"]["chunk_count"] >= 1
+
+
+def test_an_upload_is_streamed_capped_and_hashed_once(
+    client: fastapi.testclient.TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(app.api.v1.vault, "MAX_UPLOAD_BYTES", 1024)
+
+    def chunks(total: int) -> collections.abc.Iterator[bytes]:
+        # A generator body is sent chunked, with no Content-Length to refuse early.
+        for _ in range(total // 256):
+            yield b"x" * 256
+
+    oversized: httpx.Response = client.put(
+        "/v1/vault/upload/vault/owner_1/big.txt", headers=OWNER_HEADERS, content=chunks(2048)
+    )
+    assert oversized.status_code == 413
+    assert not list(pathlib.Path(os.environ["ORCHESTRATOR_LOCAL_OBJECT_STORE_ROOT"]).rglob("*big*"))
+
+    def unreadable(*_args: object, **_kwargs: object) -> typing.NoReturn:
+        raise AssertionError("ingest re-read an upload the API had already hashed")
+
+    monkeypatch.setattr(
+        app.integrations.object_store.FilesystemObjectStore, "get_buffer", unreadable
+    )
+    stored: httpx.Response = client.put(
+        "/v1/vault/upload/vault/owner_1/small.md", headers=OWNER_HEADERS, content=chunks(1024)
+    )
+    assert stored.status_code == 200
+    assert stored.json()["sha256"] == hashlib.sha256(b"x" * 1024).hexdigest()
+
+    registered: httpx.Response = client.post(
+        "/v1/vault/nodes",
+        headers=OWNER_HEADERS,
+        json={"key": "vault/owner_1/small.md", "filename": "small.md"},
+    )
+    assert registered.json()["properties"]["ingest_status"] == "ready"
+
+
+def test_on_s3_the_upload_url_is_a_presigned_put(
+    client: fastapi.testclient.TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("ORCHESTRATOR_OBJECT_STORE_BACKEND", "s3")
+    monkeypatch.setenv("ORCHESTRATOR_AWS_ACCESS_KEY_ID", "test-key")
+    monkeypatch.setenv("ORCHESTRATOR_AWS_SECRET_ACCESS_KEY", "test-secret")
+    app.settings.get_settings.cache_clear()
+
+    reserved: httpx.Response = client.post(
+        "/v1/vault/upload-url",
+        headers=OWNER_HEADERS,
+        json={"filename": "doctrine.md", "content_type": "text/markdown", "size": 120},
+    )
+
+    assert reserved.status_code == 200
+    url: str = reserved.json()["url"]
+    assert url.startswith("http://localhost:9000/")
+    assert reserved.json()["key"] in url
+    # The length is signed, so the bucket refuses a body over the declared size.
+    assert "content-length" in urllib.parse.unquote(url)
+    assert reserved.json()["headers"] == {"Content-Type": "text/markdown"}
@@ -0,0 +1,87 @@
+"""Workers keep one loop and one pool for their whole life.
+
+A loop per message strands pooled connections on loops that no longer exist.
+These pin that every submission lands on the same loop, that its sessions come
+from one engine, and that a queue never runs more at once than it is allowed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import pathlib
+import threading
+import time
+
+import sqlalchemy
+
+import app.workers.runtime as runtime
+
+
+def _runtime(tmp_path: pathlib.Path, **concurrency: int) -> runtime.WorkerRuntime:
+    return runtime.WorkerRuntime(f"sqlite+aiosqlite:///{tmp_path / 'worker.db'}", concurrency)
+
+
+def test_submissions_share_one_loop_and_one_engine(tmp_path: pathlib.Path) -> None:
+    worker = _runtime(tmp_path)
+
+    async def query() -> tuple[asyncio.AbstractEventLoop, int]:
+        async with worker.tenant_session("owner-a") as session:
+            value = (await session.execute(sqlalchemy.text("select 1"))).scalar_one()
+        return asyncio.get_running_loop(), value
+
+    try:
+        first_loop, first = worker.submit("footprint-imports", query)
+        engine = worker.engine
+        second_loop, second = worker.submit("footprint-imports", query)
+
+        assert first == second == 1
+        assert first_loop is second_loop is worker.loop
+        assert worker.engine is engine
+        assert engine.pool.checkedin() >= 1
+    finally:
+        worker.stop()
+
+    assert worker.loop is None
+
+
+def test_each_queue_is_held_to_its_concurrency(tmp_path: pathlib.Path) -> None:
+    worker = _runtime(tmp_path, **{"footprint-imports": 2})
+    lock = threading.Lock()
+    active = 0
+    peak = 0
+
+    async def work() -> None:
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        await asyncio.sleep(0.05)
+        with lock:
+            active -= 1
+
+    started = time.perf_counter()
+    try:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=6) as actors:
+            list(actors.map(lambda _: worker.submit("footprint-imports", work), range(6)))
+    finally:
+        worker.stop()
+
+    assert peak == 2
+    # Overlapped rather than serial: three rounds of two, not six in a row.
+    assert time.perf_counter() - started < 0.05 * 6
+
+
+def test_a_stopped_runtime_starts_again_on_demand(tmp_path: pathlib.Path) -> None:
+    worker = _runtime(tmp_path)
+
+    async def running() -> bool:
+        return asyncio.get_running_loop().is_running()
+
+    assert worker.submit("orchestrator-smoke", running)
+    worker.stop()
+    worker.stop()
+    assert worker.loop is None
+
+    assert worker.submit("orchestrator-smoke", running)
+    worker.stop()
@@ -2,7 +2,9 @@ import dramatiq
 from dramatiq.brokers.redis import RedisBroker
 
 from app.settings import get_settings
+from app.workers.runtime import WorkerRuntimeMiddleware, get_runtime
 
 settings = get_settings()
 redis_broker = RedisBroker(url=settings.redis_url)
+redis_broker.add_middleware(WorkerRuntimeMiddleware(get_runtime()))
 dramatiq.set_broker(redis_broker)
@@ -0,0 +1,178 @@
+"""A long-lived event loop for async work inside Dramatiq actors.
+
+Dramatiq runs actors on plain threads. Starting a fresh loop per message with
+`asyncio.run` rebuilds everything a loop owns each time, and pooled asyncpg
+connections opened on one loop cannot be reused from the next. Instead each
+worker process runs one loop on a daemon thread, and that loop owns its own
+engine and session factory. Actor threads submit coroutines to it and block on
+the result, so imports from several actor threads share one connection pool and
+overlap their network waits.
+
+A semaphore per queue caps how many of that queue's coroutines run at once,
+whatever the Dramatiq thread count. Sizes come from `WORKER_QUEUE_CONCURRENCY`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import collections.abc
+import contextlib
+import logging
+import threading
+import typing
+
+import dramatiq
+import sqlalchemy.ext.asyncio
+
+import app.core.tenancy
+import app.settings
+
+logger = logging.getLogger("dot_orchestrator.workers")
+
+_T = typing.TypeVar("_T")
+
+#: Applies to a queue missing from `WORKER_QUEUE_CONCURRENCY`.
+DEFAULT_QUEUE_CONCURRENCY = 1
+
+
+class WorkerRuntime:
+    """One event loop on a daemon thread, with the engine that belongs to it."""
+
+    def __init__(self, database_url: str, concurrency: collections.abc.Mapping[str, int]) -> None:
+        self._database_url: str = database_url
+        self._concurrency: dict[str, int] = dict(concurrency)
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._engine: sqlalchemy.ext.asyncio.AsyncEngine | None = None
+        self._sessions: (
+            sqlalchemy.ext.asyncio.async_sessionmaker[sqlalchemy.ext.asyncio.AsyncSession] | None
+        ) = None
+        self._gates: dict[str, asyncio.Semaphore] = {}
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop | None:
+        return self._loop
+
+    @property
+    def engine(self) -> sqlalchemy.ext.asyncio.AsyncEngine:
+        if self._engine is None:
+            raise RuntimeError("The worker runtime has not started.")
+        return self._engine
+
+    def start(self) -> None:
+        with self._lock:
+            if self._loop is not None:
+                return
+            loop: asyncio.AbstractEventLoop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def run() -> None:
+                asyncio.set_event_loop(loop)
+                loop.call_soon(ready.set)
+                loop.run_forever()
+                loop.close()
+
+            thread = threading.Thread(target=run, name="worker-event-loop", daemon=True)
+            thread.start()
+            ready.wait()
+            # Created here but only ever used from the loop thread, which is the
+            # only place its connections are opened.
+            self._engine = sqlalchemy.ext.asyncio.create_async_engine(
+                self._database_url, pool_pre_ping=True
+            )
+            self._sessions = sqlalchemy.ext.asyncio.async_sessionmaker(
+                self._engine, expire_on_commit=False
+            )
+            self._loop, self._thread = loop, thread
+        logger.info("worker.runtime_started")
+
+    def stop(self, timeout: float = 30.0) -> None:
+        with self._lock:
+            loop, thread, engine = self._loop, self._thread, self._engine
+            if loop is None or thread is None:
+                return
+            if engine is not None:
+                asyncio.run_coroutine_threadsafe(engine.dispose(), loop).result(timeout)
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout)
+            self._loop = self._thread = self._engine = self._sessions = None
+            self._gates.clear()
+        logger.info("worker.runtime_stopped")
+
+    def submit(
+        self,
+        queue_name: str,
+        work: collections.abc.Callable[[], collections.abc.Coroutine[typing.Any, typing.Any, _T]],
+        *,
+        timeout: float | None = None,
+    ) -> _T:
+        """Run `work()` on the runtime loop under the queue's limit; block for it."""
+
+        self.start()
+        assert self._loop is not None
+        future = asyncio.run_coroutine_threadsafe(self._gated(queue_name, work), self._loop)
+        try:
+            return future.result(timeout)
+        except BaseException:
+            # Timeouts here, and Dramatiq's time limit or shutdown interrupting
+            # this thread, must not leave the coroutine running unowned.
+            future.cancel()
+            raise
+
+    async def _gated(
+        self,
+        queue_name: str,
+        work: collections.abc.Callable[[], collections.abc.Coroutine[typing.Any, typing.Any, _T]],
+    ) -> _T:
+        gate: asyncio.Semaphore | None = self._gates.get(queue_name)
+        if gate is None:
+            # Only touched from the loop thread, so there is no creation race.
+            limit: int = self._concurrency.get(queue_name, DEFAULT_QUEUE_CONCURRENCY)
+            gate = self._gates[queue_name] = asyncio.Semaphore(max(1, limit))
+        async with gate:
+            return await work()
+
+    @property
+    def sessions(
+        self,
+    ) -> sqlalchemy.ext.asyncio.async_sessionmaker[sqlalchemy.ext.asyncio.AsyncSession]:
+        """Unbound sessions, for work that spans tenants and binds per owner itself."""
+
+        if self._sessions is None:
+            raise RuntimeError("The worker runtime has not started.")
+        return self._sessions
+
+    @contextlib.asynccontextmanager
+    async def tenant_session(
+        self, owner_id: str
+    ) -> collections.abc.AsyncGenerator[sqlalchemy.ext.asyncio.AsyncSession, None]:
+        """Tenant-bound session from this loop's pool (ADR-0011)."""
+
+        async with self.sessions() as session:
+            await app.core.tenancy.bind_tenant(session, owner_id)
+            yield session
+
+
+class WorkerRuntimeMiddleware(dramatiq.Middleware):
+    """Start the runtime when the worker boots and drain it on shutdown."""
+
+    def __init__(self, runtime: WorkerRuntime) -> None:
+        self.runtime: WorkerRuntime = runtime
+
+    def after_worker_boot(self, broker: dramatiq.Broker, worker: dramatiq.Worker) -> None:
+        self.runtime.start()
+
+    def after_worker_shutdown(self, broker: dramatiq.Broker, worker: dramatiq.Worker) -> None:
+        self.runtime.stop()
+
+
+_runtime: WorkerRuntime | None = None
+
+
+def get_runtime() -> WorkerRuntime:
+    global _runtime  # noqa: PLW0603
+    if _runtime is None:
+        settings = app.settings.get_settings()
+        _runtime = WorkerRuntime(settings.database_url, settings.WORKER_QUEUE_CONCURRENCY)
+    return _runtime
@@ -1,9 +1,10 @@
-import asyncio
-
 import app.auth.dependencies
-import app.db.session
 import app.domains.graph.service
+import app.domains.graph.sync
+import app.domains.publication.sitemap
+import app.domains.support.service
 import app.workers.broker
+import app.workers.runtime
 from app.db.models import FootprintImport
 
 
@@ -17,7 +18,8 @@ def smoke_workflow(message: str = "ok") -> dict[str, str]:
 async def _process_footprint_import(import_id: str, owner_id: str) -> dict[str, str]:
     owner = app.auth.dependencies.OwnerContext(owner_id=owner_id, actor_id="orchestrator-worker")
     # Workers are tenants too — bind before touching tenant tables (ADR-0011).
-    async with app.db.session.tenant_session(owner_id) as session:
+    runtime = app.workers.runtime.get_runtime()
+    async with runtime.tenant_session(owner_id) as session:
         footprint_import: FootprintImport = await app.domains.graph.service.process_import(
             session,
             owner,
@@ -30,4 +32,55 @@ async def _process_footprint_import(import_id: str, owner_id: str) -> dict[str,
 def process_footprint_import(import_id: str, owner_id: str) -> dict[str, str]:
     """Process a queued footprint import into graph nodes and edges."""
 
-    return asyncio.run(_process_footprint_import(import_id, owner_id))
+    return app.workers.runtime.get_runtime().submit(
+        "footprint-imports", lambda: _process_footprint_import(import_id, owner_id)
+    )
+
+
+def _enqueue_import(import_id: str, owner_id: str, delay_seconds: float) -> None:
+    process_footprint_import.send_with_options(
+        args=(import_id, owner_id), delay=int(delay_seconds * 1000)
+    )
+
+
+@app.workers.broker.dramatiq.actor(queue_name="feed-scheduler", max_retries=0)
+def schedule_feed_syncs() -> dict[str, int]:
+    """Enqueue imports for synced feeds that are due. Sent on a timer; see the Makefile."""
+
+    runtime = app.workers.runtime.get_runtime()
+    report: app.domains.graph.sync.SchedulingReport = runtime.submit(
+        "feed-scheduler",
+        lambda: app.domains.graph.sync.schedule_due_syncs(runtime.sessions, _enqueue_import),
+    )
+    return {
+        "enqueued": report.enqueued,
+        "deferred_hosts": len(report.deferred_hosts),
+        "dropped": report.dropped,
+    }
+
+
+async def _reconcile_support_totals() -> app.domains.support.service.TotalsReconciliation:
+    async with app.workers.runtime.get_runtime().sessions() as session:
+        return await app.domains.support.service.reconcile_totals(session)
+
+
+@app.workers.broker.dramatiq.actor(queue_name="support-maintenance", max_retries=0)
+def reconcile_support_totals() -> dict[str, int | bool]:
+    """Check the maintained support totals against the ledger. Sent on a timer; see the Makefile."""
+
+    report: app.domains.support.service.TotalsReconciliation = (
+        app.workers.runtime.get_runtime().submit("support-maintenance", _reconcile_support_totals)
+    )
+    return {"drifted": report.drifted, **report.ledger}
+
+
+@app.workers.broker.dramatiq.actor(queue_name="publication-maintenance", max_retries=0)
+def rebuild_sitemap(owner_ids: list[str] | None = None) -> dict[str, int]:
+    """Republish the stored sitemap for the given owners, or every known one. See the Makefile."""
+
+    runtime = app.workers.runtime.get_runtime()
+    published: int = runtime.submit(
+        "publication-maintenance",
+        lambda: app.domains.publication.sitemap.rebuild(runtime.sessions, owner_ids),
+    )
+    return {"owners": published}
@@ -0,0 +1,54 @@
+"""Feed sync schedules: when each synced feed is next due.
+
+Scheduling state for periodic footprint imports. It is not a tenant table and
+carries no RLS policy: the scheduler reads every row to fan syncs out fairly
+across hosts, and the rows hold ids, a host, and times only. Each sync then
+runs in its owner's bound transaction (ADR-0011).
+
+Revision ID: 0018_feed_sync_schedules
+Revises: 0017_reader_subscriptions
+"""
+
+from __future__ import annotations
+
+import alembic.op
+import sqlalchemy
+
+revision: str = "0018_feed_sync_schedules"
+down_revision: str | None = "0017_reader_subscriptions"
+branch_labels: str | None = None
+depends_on: str | None = None
+
+
+def upgrade() -> None:
+    alembic.op.create_table(
+        "feed_sync_schedules",
+        sqlalchemy.Column(
+            "account_id",
+            sqlalchemy.String(64),
+            sqlalchemy.ForeignKey("footprint_accounts.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sqlalchemy.Column("owner_id", sqlalchemy.String(128), nullable=False),
+        sqlalchemy.Column("host", sqlalchemy.String(255), nullable=False),
+        sqlalchemy.Column("interval_seconds", sqlalchemy.Integer, nullable=False),
+        sqlalchemy.Column("next_sync_at", sqlalchemy.DateTime(timezone=True), nullable=False),
+        sqlalchemy.Column("last_enqueued_at", sqlalchemy.DateTime(timezone=True)),
+        sqlalchemy.Column("last_lag_seconds", sqlalchemy.Float),
+        sqlalchemy.Column(
+            "created_at",
+            sqlalchemy.DateTime(timezone=True),
+            server_default=sqlalchemy.func.now(),
+            nullable=False,
+        ),
+        sqlalchemy.Column("updated_at", sqlalchemy.DateTime(timezone=True)),
+    )
+    # The scheduler's only query: rows due by now, oldest first.
+    alembic.op.create_index("ix_feed_sync_schedules_due", "feed_sync_schedules", ["next_sync_at"])
+    alembic.op.create_index("ix_feed_sync_schedules_host", "feed_sync_schedules", ["host"])
+
+
+def downgrade() -> None:
+    alembic.op.drop_index("ix_feed_sync_schedules_host", table_name="feed_sync_schedules")
+    alembic.op.drop_index("ix_feed_sync_schedules_due", table_name="feed_sync_schedules")
+    alembic.op.drop_table("feed_sync_schedules")
@@ -0,0 +1,30 @@
+"""Footprint nodes: index the snapshot's keyset order.
+
+Snapshot pages walk an owner's nodes by `(created_at, id)`, resuming after the
+last row of the previous page. This index serves each page as a range scan, so
+a late page costs the same as the first.
+
+Revision ID: 0019_footprint_node_keyset
+Revises: 0018_feed_sync_schedules
+"""
+
+from __future__ import annotations
+
+import alembic.op
+
+revision: str = "0019_footprint_node_keyset"
+down_revision: str | None = "0018_feed_sync_schedules"
+branch_labels: str | None = None
+depends_on: str | None = None
+
+
+def upgrade() -> None:
+    alembic.op.create_index(
+        "ix_footprint_nodes_owner_keyset",
+        "footprint_nodes",
+        ["owner_id", "created_at", "id"],
+    )
+
+
+def downgrade() -> None:
+    alembic.op.drop_index("ix_footprint_nodes_owner_keyset", table_name="footprint_nodes")
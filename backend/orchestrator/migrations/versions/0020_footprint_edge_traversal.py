@@ -0,0 +1,37 @@
+"""Footprint edges: index both ends of a traversal step.
+
+A neighbourhood walk expands a frontier of node ids one hop at a time, reading
+edges by `(owner_id, source_node_id)` to go out and `(owner_id, target_node_id)`
+to come back, optionally filtered by relation. These composites serve each step
+from the index alone.
+
+Revision ID: 0020_footprint_edge_traversal
+Revises: 0019_footprint_node_keyset
+"""
+
+from __future__ import annotations
+
+import alembic.op
+
+revision: str = "0020_footprint_edge_traversal"
+down_revision: str | None = "0019_footprint_node_keyset"
+branch_labels: str | None = None
+depends_on: str | None = None
+
+
+def upgrade() -> None:
+    alembic.op.create_index(
+        "ix_footprint_edges_owner_source_relation",
+        "footprint_edges",
+        ["owner_id", "source_node_id", "relation"],
+    )
+    alembic.op.create_index(
+        "ix_footprint_edges_owner_target_relation",
+        "footprint_edges",
+        ["owner_id", "target_node_id", "relation"],
+    )
+
+
+def downgrade() -> None:
+    alembic.op.drop_index("ix_footprint_edges_owner_target_relation", table_name="footprint_edges")
+    alembic.op.drop_index("ix_footprint_edges_owner_source_relation", table_name="footprint_edges")
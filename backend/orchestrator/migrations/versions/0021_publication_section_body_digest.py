@@ -0,0 +1,30 @@
+"""Publication sections: remember the SHA-256 of an uploaded draft body.
+
+Release bodies are stored by content hash. Knowing a draft's hash lets a release
+copy it into place inside the object store instead of reading it back to hash
+it. Sections whose body was never uploaded through the API keep a null digest
+and are hashed at release time, as before.
+
+Revision ID: 0021_publication_section_body_digest
+Revises: 0020_footprint_edge_traversal
+"""
+
+from __future__ import annotations
+
+import alembic.op
+import sqlalchemy as sa
+
+revision: str = "0021_publication_section_body_digest"
+down_revision: str | None = "0020_footprint_edge_traversal"
+branch_labels: str | None = None
+depends_on: str | None = None
+
+
+def upgrade() -> None:
+    alembic.op.add_column(
+        "publication_sections", sa.Column("body_sha256", sa.String(64), nullable=True)
+    )
+
+
+def downgrade() -> None:
+    alembic.op.drop_column("publication_sections", "body_sha256")
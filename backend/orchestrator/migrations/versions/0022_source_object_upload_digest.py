@@ -0,0 +1,30 @@
+"""Source objects: remember the SHA-256 of an upload streamed through the API.
+
+The upload endpoint hashes the body as it streams it to the object store, so
+ingest can use that digest instead of reading the file back to hash it.
+Presigned uploads never pass through the API and leave it null; those are
+hashed at ingest, as before.
+
+Revision ID: 0022_source_object_upload_digest
+Revises: 0021_publication_section_body_digest
+"""
+
+from __future__ import annotations
+
+import alembic.op
+import sqlalchemy as sa
+
+revision: str = "0022_source_object_upload_digest"
+down_revision: str | None = "0021_publication_section_body_digest"
+branch_labels: str | None = None
+depends_on: str | None = None
+
+
+def upgrade() -> None:
+    alembic.op.add_column(
+        "source_objects", sa.Column("upload_sha256", sa.String(64), nullable=True)
+    )
+
+
+def downgrade() -> None:
+    alembic.op.drop_column("source_objects", "upload_sha256")
@@ -0,0 +1,42 @@
+"""Support totals: the public figure as one maintained row instead of a scan.
+
+The row is seeded from the ledger here; afterwards webhook processing adjusts
+it in the same transaction as the contribution, and the reconcile job checks it.
+
+Revision ID: 0023_support_totals
+Revises: 0022_source_object_upload_digest
+"""
+
+from __future__ import annotations
+
+import alembic.op
+import sqlalchemy as sa
+
+revision: str = "0023_support_totals"
+down_revision: str | None = "0022_source_object_upload_digest"
+branch_labels: str | None = None
+depends_on: str | None = None
+
+
+def upgrade() -> None:
+    alembic.op.create_table(
+        "support_totals",
+        sa.Column("id", sa.String(16), primary_key=True),
+        sa.Column("supporters", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("total_minor", sa.BigInteger, nullable=False, server_default="0"),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+    )
+    alembic.op.execute(
+        "INSERT INTO support_totals (id, supporters, total_minor) "
+        "SELECT 'all', COUNT(id), COALESCE(SUM(amount_minor), 0) "
+        "FROM support_contributions WHERE status = 'succeeded'"
+    )
+
+
+def downgrade() -> None:
+    alembic.op.drop_table("support_totals")
@@ -0,0 +1,36 @@
+"""Sitemap entries: every owner's public reader URLs, outside RLS.
+
+The sitemap was merged in a JSON object that concurrent writers in different
+processes could overwrite. Entries now live in this table, replaced per owner
+under a Postgres advisory lock, and the stored documents are rendered from it.
+Like `feed_sync_schedules` it is not a tenant table and carries no RLS policy;
+it holds public URLs only. `make rebuild-sitemap` fills it after upgrading.
+
+Revision ID: 0024_sitemap_entries
+Revises: 0023_support_totals
+"""
+
+from __future__ import annotations
+
+import alembic.op
+import sqlalchemy as sa
+
+revision: str = "0024_sitemap_entries"
+down_revision: str | None = "0023_support_totals"
+branch_labels: str | None = None
+depends_on: str | None = None
+
+
+def upgrade() -> None:
+    alembic.op.create_table(
+        "sitemap_entries",
+        sa.Column("loc", sa.String(2048), primary_key=True),
+        sa.Column("owner_id", sa.String(128), nullable=False),
+        sa.Column("lastmod", sa.String(10), nullable=False, server_default=""),
+    )
+    alembic.op.create_index("ix_sitemap_entries_owner_id", "sitemap_entries", ["owner_id"])
+
+
+def downgrade() -> None:
+    alembic.op.drop_index("ix_sitemap_entries_owner_id", table_name="sitemap_entries")
+    alembic.op.drop_table("sitemap_entries")
@@ -0,0 +1,33 @@
+"""Feed hosts: fetch failures shared between workers and the scheduler.
+
+The scheduler deferred hosts by reading circuit breakers in its own process,
+while fetches ran in the workers', so it never saw them open. Workers now
+record consecutive failures per host here and the scheduler reads them. Like
+`feed_sync_schedules` it is not a tenant table and carries no RLS policy.
+
+Revision ID: 0025_feed_hosts
+Revises: 0024_sitemap_entries
+"""
+
+from __future__ import annotations
+
+import alembic.op
+import sqlalchemy as sa
+
+revision: str = "0025_feed_hosts"
+down_revision: str | None = "0024_sitemap_entries"
+branch_labels: str | None = None
+depends_on: str | None = None
+
+
+def upgrade() -> None:
+    alembic.op.create_table(
+        "feed_hosts",
+        sa.Column("host", sa.String(255), primary_key=True),
+        sa.Column("consecutive_failures", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("retry_after", sa.DateTime(timezone=True)),
+    )
+
+
+def downgrade() -> None:
+    alembic.op.drop_table("feed_hosts")
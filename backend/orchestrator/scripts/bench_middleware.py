@@ -0,0 +1,177 @@
+"""Measure what the middleware stack costs per request.
+
+Drives a bare Starlette app directly over ASGI — no sockets, no HTTP client —
+under three stacks: no middleware, the `BaseHTTPMiddleware` versions the
+service used to run, and the current pure-ASGI stack. The difference from the
+bare app is the per-request overhead of each stack.
+
+    python scripts/bench_middleware.py [--requests 5000] [--output bench-middleware.json]
+
+The legacy classes are reproduced here, not imported, so the comparison still
+runs after they left the tree.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import collections.abc
+import json
+import pathlib
+import statistics
+import sys
+import time
+import typing
+import uuid
+
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+from starlette.types import ASGIApp, Message
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))
+
+import app.core.errors
+import app.core.middleware
+import app.core.security
+
+STACKS: tuple[str, ...] = ("bare", "base_http", "pure_asgi")
+ROUTES: tuple[str, ...] = ("/json", "/stream")
+
+
+class _LegacyUnhandledException(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        try:
+            return await call_next(request)
+        except Exception:
+            return JSONResponse({"error": {"code": "INTERNAL_ERROR"}}, status_code=500)
+
+
+class _LegacySecurityHeaders(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        response: Response = await call_next(request)
+        for header, value in app.core.security._SECURITY_HEADERS.items():  # noqa: SLF001
+            response.headers[header] = value
+        return response
+
+
+class _LegacyRequestId(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        request_id = request.headers.get("X-Request-Id") or str(uuid.uuid4())
+        token = app.core.middleware.request_id_var.set(request_id)
+        try:
+            response: Response = await call_next(request)
+        finally:
+            app.core.middleware.request_id_var.reset(token)
+        response.headers["X-Request-Id"] = request_id
+        return response
+
+
+async def _json(_request: Request) -> Response:
+    return JSONResponse({"ok": True})
+
+
+async def _stream(_request: Request) -> Response:
+    async def events() -> collections.abc.AsyncIterator[str]:
+        for index in range(4):
+            yield f"data: {index}\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+def build(stack: str) -> ASGIApp:
+    """The same two routes under one of `STACKS`, innermost middleware first."""
+
+    middleware: list[type[typing.Any]] = {
+        "bare": [],
+        "base_http": [_LegacyUnhandledException, _LegacySecurityHeaders, _LegacyRequestId],
+        "pure_asgi": [
+            app.core.errors.UnhandledExceptionMiddleware,
+            app.core.security.SecurityHeadersMiddleware,
+            app.core.middleware.RequestIdMiddleware,
+        ],
+    }[stack]
+    return Starlette(
+        routes=[Route("/json", _json), Route("/stream", _stream)],
+        # Starlette lists outermost first; the service adds innermost first.
+        middleware=[Middleware(cls) for cls in reversed(middleware)],
+    )
+
+
+async def _request(asgi: ASGIApp, path: str) -> None:
+    scope: dict[str, typing.Any] = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+    delivered: bool = False
+
+    async def receive() -> Message:
+        nonlocal delivered
+        if not delivered:
+            delivered = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await asyncio.Event().wait()
+        return {"type": "http.disconnect"}  # pragma: no cover
+
+    async def send(_message: Message) -> None:
+        return None
+
+    await asyncio.wait_for(asgi(scope, receive, send), timeout=5)
+
+
+async def _measure(asgi: ASGIApp, path: str, requests: int) -> list[float]:
+    for _ in range(min(requests, 200)):  # warm-up
+        await _request(asgi, path)
+    samples: list[float] = []
+    for _ in range(requests):
+        started: float = time.perf_counter()
+        await _request(asgi, path)
+        samples.append((time.perf_counter() - started) * 1_000_000)
+    return samples
+
+
+async def run(requests: int = 5000) -> dict[str, typing.Any]:
+    """Median microseconds per request, and overhead over the bare app."""
+
+    report: dict[str, typing.Any] = {"requests": requests, "routes": {}}
+    for path in ROUTES:
+        medians: dict[str, float] = {}
+        for stack in STACKS:
+            medians[stack] = statistics.median(await _measure(build(stack), path, requests))
+        report["routes"][path] = {
+            stack: {
+                "median_us": round(medians[stack], 1),
+                "overhead_us": round(medians[stack] - medians["bare"], 1),
+            }
+            for stack in STACKS
+        }
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--output", default="bench-middleware.json")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args.requests))
+    pathlib.Path(args.output).write_text(json.dumps(result, indent=2) + "\n")
+    for route, stacks in result["routes"].items():
+        for stack, numbers in stacks.items():
+            print(
+                f"{route:8} {stack:10} {numbers['median_us']:8.1f} us"
+                f"  (+{numbers['overhead_us']:.1f} us)"
+            )
@@ -0,0 +1,494 @@
+"""Benchmark the twin ask pipeline end to end.
+
+Seeds one tenant with released canon, private vault documents, and footprint
+nodes, then drives `service.ask`, `service.ask_stream`, and
+`retriever.retrieve_passages` against local stand-ins for the model and the
+embedding endpoint. Nothing leaves the process, so a run measures this code and
+the database rather than a provider's latency on the day.
+
+    python scripts/bench_twin.py [--sections 40] [--documents 20] [--nodes 500]
+        [--iterations 50] [--concurrency 1,4,16] [--output bench-twin.json]
+        [--compare previous.json] [--database-url sqlite+aiosqlite://]
+
+The report is JSON keyed by operation and stage, so two runs from different
+commits can be diffed directly or with `--compare`. Stages are the spans the
+pipeline records through `app.core.timing`, so they match what production
+reports in `Server-Timing`; `retrieval` contains the query and embedding stages.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import collections
+import contextlib
+import dataclasses
+import datetime
+import hashlib
+import json
+import math
+import pathlib
+import platform
+import random
+import re
+import subprocess
+import sys
+import time
+import typing
+
+import sqlalchemy
+import sqlalchemy.ext.asyncio
+import sqlalchemy.pool
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))
+
+import app.auth.dependencies
+import app.core.timing
+import app.db.models
+import app.domains.canon.service as canon
+import app.domains.knowledge.chunk
+import app.domains.knowledge.embedding as embedding
+import app.domains.knowledge.service as knowledge
+import app.domains.twin.boundary as boundary
+import app.domains.twin.model as model
+import app.domains.twin.retriever as retriever
+import app.domains.twin.schemas as schemas
+import app.domains.twin.service as service
+
+OWNER_ID = "bench-owner"
+EDITION_SLUG = "bench-edition"
+EDITION_TITLE = "Benchmark Edition"
+#: Span names from `app.core.timing`, in pipeline order. `retrieval` contains
+#: the four after it.
+STAGES: tuple[str, ...] = (
+    "retrieval",
+    "bind_tenant",
+    "node_query",
+    "chunk_query",
+    "embedding",
+    "scholarship",
+    "model",
+    "boundary_parse",
+    "citation_anchors",
+)
+PERCENTILES: tuple[int, ...] = (50, 95, 99)
+
+#: Vocabulary close enough to the book that keyword and vector scoring both
+#: find something, without shipping any of its prose in the repository.
+_VOCABULARY: tuple[str, ...] = (
+    "canvas",
+    "painting",
+    "intent",
+    "fear",
+    "love",
+    "attention",
+    "membrane",
+    "organism",
+    "reality",
+    "frame",
+    "signal",
+    "record",
+    "field",
+    "focus",
+    "pattern",
+    "memory",
+    "choice",
+    "habit",
+    "limit",
+    "knowledge",
+)
+_QUESTIONS: tuple[str, ...] = (
+    "What is the Canvas?",
+    "How does fear shape attention?",
+    "Where does intent meet the membrane?",
+    "What is the limit of knowledge?",
+    "How do reality frames record a pattern?",
+    "What does the field hold when focus moves?",
+)
+_ENVELOPE = re.compile(
+    re.escape(boundary.UNTRUSTED_OPEN) + r"\n(.*?)\n" + re.escape(boundary.UNTRUSTED_CLOSE),
+    re.DOTALL,
+)
+
+
+@dataclasses.dataclass(frozen=True)
+class BenchConfig:
+    sections: int = 40
+    documents: int = 20
+    nodes: int = 500
+    iterations: int = 50
+    concurrency: tuple[int, ...] = (1, 4, 16)
+    model_latency_ms: float = 0.0
+    seed: int = 7
+
+
+class StandInEmbeddingClient:
+    """Deterministic hashed bag-of-words vectors. Similar text, similar vector."""
+
+    def __init__(self, dimensions: int = 64) -> None:
+        self._dimensions: int = dimensions
+
+    @property
+    def model(self) -> str:
+        return "bench-stand-in"
+
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        vectors: list[list[float]] = []
+        for text in texts:
+            vector: list[float] = [0.0] * self._dimensions
+            for term in retriever._terms(text):  # noqa: SLF001 - shared retrieval vocabulary
+                bucket: int = int.from_bytes(hashlib.blake2b(term.encode()).digest()[:4], "big")
+                vector[bucket % self._dimensions] += 1.0
+            vectors.append(embedding.normalize(vector))
+        return vectors
+
+
+class StandInModelClient:
+    """Answers from the envelope it was given and cites every passage in it.
+
+    Citing everything keeps each answer grounded (canon is always among the
+    cites when it was retrieved), so the benchmark exercises the full success
+    path — boundary parse, grounding check, and citation anchors — every time.
+    """
+
+    def __init__(self, latency_ms: float = 0.0) -> None:
+        self._latency: float = latency_ms / 1000.0
+
+    def _emission(self, user: str) -> str:
+        match = _ENVELOPE.search(user)
+        fragments: list[dict[str, typing.Any]] = json.loads(match.group(1)) if match else []
+        cites: list[str] = [fragment["node_id"] for fragment in fragments]
+        return json.dumps(
+            {"answer": "The released passages speak to this directly.", "cites": cites}
+        )
+
+    async def complete(self, *, system: str, user: str) -> str:
+        if self._latency:
+            await asyncio.sleep(self._latency)
+        return self._emission(user)
+
+    async def stream(
+        self, *, system: str, user: str
+    ) -> typing.AsyncGenerator[model.StreamChunk, None]:
+        raw: str = self._emission(user)
+        pieces: int = 8
+        step: int = max(1, math.ceil(len(raw) / pieces))
+        for index in range(0, len(raw), step):
+            if self._latency:
+                await asyncio.sleep(self._latency / pieces)
+            yield model.StreamChunk(text=raw[index : index + step])
+
+
+def _prose(rng: random.Random, paragraphs: int, heading: str | None = None) -> str:
+    parts: list[str] = [f"## {heading}"] if heading else []
+    for _ in range(paragraphs):
+        sentences: list[str] = []
+        for _ in range(rng.randint(3, 6)):
+            words: list[str] = rng.choices(_VOCABULARY, k=rng.randint(8, 16))
+            sentences.append(f"The {' '.join(words)} is what remains.")
+        parts.append(" ".join(sentences))
+    return "\n\n".join(parts)
+
+
+async def seed(
+    factory: sqlalchemy.ext.asyncio.async_sessionmaker[sqlalchemy.ext.asyncio.AsyncSession],
+    config: BenchConfig,
+    owner_id: str = OWNER_ID,
+) -> None:
+    """Create the tenant's canon, vault, and graph. Embeds with the stand-in."""
+
+    rng = random.Random(config.seed)
+    owner = app.auth.dependencies.OwnerContext(owner_id=owner_id, actor_id="bench")
+
+    async with factory() as session:
+        for index in range(config.sections):
+            title: str = f"{rng.choice(_VOCABULARY).title()} and {rng.choice(_VOCABULARY)}"
+            await canon.ingest_section(
+                session,
+                owner,
+                edition_slug=EDITION_SLUG,
+                edition_title=EDITION_TITLE,
+                section=canon.CanonSection(
+                    slug=f"section-{index + 1}",
+                    kind="chapter",
+                    number=index + 1,
+                    title=title,
+                    part="Part One",
+                    text=_prose(rng, rng.randint(6, 12), heading=title),
+                ),
+            )
+
+        for index in range(config.documents):
+            text: str = _prose(rng, rng.randint(4, 10))
+            source = app.db.models.SourceObject(
+                owner_id=owner_id,
+                filename=f"notes-{index + 1}.md",
+                object_store_key=f"vault/{owner_id}/notes-{index + 1}.md",
+                size_bytes=len(text.encode("utf-8")),
+                mime_type="text/markdown",
+                status="ready",
+            )
+            session.add(source)
+            await session.flush()
+            version = app.db.models.SourceVersion(
+                source_object_id=source.id,
+                version_num=1,
+                content_hash=hashlib.sha256(text.encode("utf-8")).hexdigest(),
+                status="ready",
+            )
+            session.add(version)
+            await session.flush()
+            records: list[app.db.models.KnowledgeChunk] = []
+            for chunk in app.domains.knowledge.chunk.chunk_text(text):
+                record = app.db.models.KnowledgeChunk(
+                    source_version_id=version.id,
+                    chunk_index=chunk.index,
+                    text=chunk.text,
+                    token_count=chunk.token_count,
+                )
+                session.add(record)
+                await session.flush()
+                records.append(record)
+                session.add(
+                    app.db.models.SourceAnchor(
+                        chunk_id=record.id,
+                        anchor_type="char_range",
+                        locator={"start": chunk.start, "end": chunk.end},
+                    )
+                )
+            await knowledge.embed_chunks(records)
+
+        now = datetime.datetime.now(datetime.UTC)
+        for index in range(config.nodes):
+            words: list[str] = rng.choices(_VOCABULARY, k=3)
+            session.add(
+                app.db.models.FootprintNode(
+                    owner_id=owner_id,
+                    kind=rng.choice(("post", "topic", "publication")),
+                    label=" ".join(words).title(),
+                    platform="bench",
+                    external_id=f"bench-{index}",
+                    properties={"summary": _prose(rng, 1)},
+                    visibility="public",
+                    last_seen_at=now - datetime.timedelta(minutes=index),
+                )
+            )
+        await session.commit()
+
+
+def summarize(samples: typing.Sequence[float]) -> dict[str, float | int]:
+    """Nearest-rank percentiles, in milliseconds."""
+
+    if not samples:
+        return {"count": 0}
+    ordered: list[float] = sorted(samples)
+    summary: dict[str, float | int] = {
+        "count": len(ordered),
+        "mean": round(sum(ordered) / len(ordered), 3),
+    }
+    for percentile in PERCENTILES:
+        rank: int = max(1, math.ceil(percentile / 100 * len(ordered)))
+        summary[f"p{percentile}"] = round(ordered[rank - 1], 3)
+    return summary
+
+
+@contextlib.contextmanager
+def _stand_ins(latency_ms: float) -> typing.Iterator[None]:
+    """Swap in the local model and embedder; restore the real ones afterwards."""
+
+    stand_in_embedder = StandInEmbeddingClient()
+    stand_in_model = StandInModelClient(latency_ms)
+    originals = (embedding.get_embedding_client, model.get_model_client)
+    embedding.get_embedding_client = lambda: stand_in_embedder
+    model.get_model_client = lambda: stand_in_model
+    try:
+        yield
+    finally:
+        embedding.get_embedding_client, model.get_model_client = originals
+
+
+async def _one(
+    operation: str,
+    factory: sqlalchemy.ext.asyncio.async_sessionmaker[sqlalchemy.ext.asyncio.AsyncSession],
+    owner: app.auth.dependencies.OwnerContext,
+    question: str,
+) -> bool:
+    """Run a single operation. Returns whether it produced grounded output."""
+
+    async with factory() as session:
+        if operation == "retrieve_passages":
+            passages = await retriever.retrieve_passages(session, owner, owner.owner_id, question)
+            return bool(passages)
+        request = schemas.TwinAskRequest(question=question, owner_id=owner.owner_id, lens="ground")
+        if operation == "ask":
+            response = await service.ask(session, owner, request, client=model.get_model_client())
+            return response.grounded
+        events = [event async for event in service.ask_stream(session, owner, request)]
+        return events[-1].get("event") == "done" and bool(events[-1].get("grounded"))
+
+
+async def run(
+    factory: sqlalchemy.ext.asyncio.async_sessionmaker[sqlalchemy.ext.asyncio.AsyncSession],
+    config: BenchConfig,
+    owner_id: str = OWNER_ID,
+) -> dict[str, typing.Any]:
+    """Seed, then measure latency per operation and stage, and throughput per level."""
+
+    owner = app.auth.dependencies.OwnerContext(owner_id=owner_id, actor_id="bench")
+    report: dict[str, typing.Any] = {"operations": {}, "throughput": {}}
+
+    with _stand_ins(config.model_latency_ms):
+        await seed(factory, config, owner_id)
+
+        for operation in ("retrieve_passages", "ask", "ask_stream"):
+            # Warm caches and connections so the first sample is not an outlier.
+            await _one(operation, factory, owner, _QUESTIONS[0])
+
+            latencies: list[float] = []
+            stages: dict[str, list[float]] = collections.defaultdict(list)
+            grounded: int = 0
+            for index in range(config.iterations):
+                # The same spans production requests report in Server-Timing.
+                with app.core.timing.collect() as timings:
+                    started: float = time.perf_counter()
+                    grounded += await _one(
+                        operation, factory, owner, _QUESTIONS[index % len(_QUESTIONS)]
+                    )
+                    latencies.append((time.perf_counter() - started) * 1000.0)
+                for stage, elapsed_ms in timings.durations().items():
+                    stages[stage].append(elapsed_ms)
+            report["operations"][operation] = {
+                "latency_ms": summarize(latencies),
+                "grounded": grounded,
+                "stages": {stage: summarize(stages[stage]) for stage in STAGES if stages[stage]},
+            }
+
+        for level in config.concurrency:
+            gate = asyncio.Semaphore(level)
+
+            async def bounded(index: int, gate: asyncio.Semaphore = gate) -> bool:
+                async with gate:
+                    return await _one("ask", factory, owner, _QUESTIONS[index % len(_QUESTIONS)])
+
+            started = time.perf_counter()
+            await asyncio.gather(*(bounded(index) for index in range(config.iterations)))
+            elapsed: float = time.perf_counter() - started
+            report["throughput"][str(level)] = {
+                "requests": config.iterations,
+                "seconds": round(elapsed, 4),
+                "requests_per_second": round(config.iterations / elapsed, 2) if elapsed else None,
+            }
+
+    report["meta"] = {
+        "commit": _git_commit(),
+        "recorded_at": datetime.datetime.now(datetime.UTC).isoformat(),
+        "python": platform.python_version(),
+        "config": dataclasses.asdict(config),
+    }
+    return report
+
+
+def _git_commit() -> str | None:
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=pathlib.Path(__file__).resolve().parent,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return completed.stdout.strip() or None
+
+
+def compare(previous: dict[str, typing.Any], current: dict[str, typing.Any]) -> list[str]:
+    """One line per operation and stage: p50 and p95 before, after, and change."""
+
+    lines: list[str] = []
+    for operation, result in current["operations"].items():
+        before: dict[str, typing.Any] = previous.get("operations", {}).get(operation, {})
+        rows: list[tuple[str, dict[str, typing.Any], dict[str, typing.Any]]] = [
+            (operation, before.get("latency_ms", {}), result["latency_ms"])
+        ]
+        rows.extend(
+            (f"{operation}.{stage}", before.get("stages", {}).get(stage, {}), summary)
+            for stage, summary in result["stages"].items()
+        )
+        for name, old, new in rows:
+            cells: list[str] = []
+            for key in ("p50", "p95"):
+                if key not in new:
+                    continue
+                if key in old and old[key]:
+                    change: float = (new[key] - old[key]) / old[key] * 100.0
+                    cells.append(f"{key} {old[key]:.2f} -> {new[key]:.2f} ms ({change:+.1f}%)")
+                else:
+                    cells.append(f"{key} {new[key]:.2f} ms")
+            lines.append(f"{name:<32} " + "  ".join(cells))
+    return lines
+
+
+async def main(config: BenchConfig, database_url: str) -> dict[str, typing.Any]:
+    engine: sqlalchemy.ext.asyncio.AsyncEngine
+    if database_url.startswith("sqlite"):
+        # One shared in-memory connection, as the test suite uses.
+        engine = sqlalchemy.ext.asyncio.create_async_engine(
+            database_url,
+            connect_args={"check_same_thread": False},
+            poolclass=sqlalchemy.pool.StaticPool,
+        )
+    else:
+        engine = sqlalchemy.ext.asyncio.create_async_engine(database_url, pool_pre_ping=True)
+    async with engine.begin() as connection:
+        await connection.run_sync(app.db.models.Base.metadata.create_all)
+    factory = sqlalchemy.ext.asyncio.async_sessionmaker(engine, expire_on_commit=False)
+    try:
+        return await run(factory, config)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sections", type=int, default=BenchConfig.sections)
+    parser.add_argument("--documents", type=int, default=BenchConfig.documents)
+    parser.add_argument("--nodes", type=int, default=BenchConfig.nodes)
+    parser.add_argument("--iterations", type=int, default=BenchConfig.iterations)
+    parser.add_argument("--concurrency", default=",".join(map(str, BenchConfig.concurrency)))
+    parser.add_argument("--model-latency-ms", type=float, default=BenchConfig.model_latency_ms)
+    parser.add_argument("--seed", type=int, default=BenchConfig.seed)
+    parser.add_argument(
+        "--database-url",
+        default="sqlite+aiosqlite://",
+        help="An empty database. Use a scratch Postgres to measure the production dialect.",
+    )
+    parser.add_argument("--output", type=pathlib.Path, default=pathlib.Path("bench-twin.json"))
+    parser.add_argument("--compare", type=pathlib.Path, default=None)
+    args = parser.parse_args()
+
+    bench_config = BenchConfig(
+        sections=args.sections,
+        documents=args.documents,
+        nodes=args.nodes,
+        iterations=args.iterations,
+        concurrency=tuple(int(level) for level in args.concurrency.split(",") if level),
+        model_latency_ms=args.model_latency_ms,
+        seed=args.seed,
+    )
+    result = asyncio.run(main(bench_config, args.database_url))
+    args.output.write_text(json.dumps(result, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    print(f"wrote {args.output}")
+    for operation, outcome in result["operations"].items():
+        latency = outcome["latency_ms"]
+        print(
+            f"  {operation:<18} p50 {latency['p50']:.2f} ms · p95 {latency['p95']:.2f} ms · "
+            f"p99 {latency['p99']:.2f} ms · grounded {outcome['grounded']}/{latency['count']}"
+        )
+    for level, outcome in result["throughput"].items():
+        print(f"  concurrency {level:>3}: {outcome['requests_per_second']} req/s")
+    if args.compare is not None:
+        print(f"\ncompared with {args.compare}")
+        previous_report = json.loads(args.compare.read_text(encoding="utf-8"))
+        for line in compare(previous_report, result):
+            print(f"  {line}")
@@ -85,7 +85,11 @@ export const VaultSurface: React.FC<VaultSurfaceProps> = ({
 
       // 1. Get presigned URL. The session identifies the owner; the upload is
       // written under that owner's prefix and nowhere else.
-      const urlRes = await api<{ url: string; key: string }>(
+      const urlRes = await api<{
+        url: string;
+        key: string;
+        headers?: Record<string, string>;
+      }>(
         "/v1/vault/upload-url",
         {
           method: "POST",
@@ -101,15 +105,20 @@ export const VaultSurface: React.FC<VaultSurfaceProps> = ({
         throw new Error("Failed to get upload URL");
       const urlData = urlRes.data;
 
-      // 2. PUT file to object store proxy
-      const putRes = await fetch(`${ORCHESTRATOR_BASE}${urlData.url}`, {
-        method: "PUT",
-        credentials: "include",
-        headers: {
-          "Content-Type": "application/octet-stream",
+      // 2. PUT the file: straight to the bucket when the URL is presigned,
+      // otherwise streamed through the orchestrator's upload proxy.
+      const presigned = /^https?:\/\//.test(urlData.url);
+      const putRes = await fetch(
+        presigned ? urlData.url : `${ORCHESTRATOR_BASE}${urlData.url}`,
+        {
+          method: "PUT",
+          credentials: presigned ? "omit" : "include",
+          headers: urlData.headers ?? {
+            "Content-Type": "application/octet-stream",
+          },
+          body: fileRec.file,
         },
-        body: fileRec.file,
-      });
+      );
 
       if (!putRes.ok) throw new Error("Failed to upload file");
 
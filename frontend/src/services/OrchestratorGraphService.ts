@@ -59,6 +59,8 @@ export interface FootprintGraphSnapshot {
   accounts: FootprintAccountRead[];
   nodes: FootprintNodeRead[];
   edges: FootprintEdgeRead[];
+  /** Pass back as `cursor` for the next page; null on the last page. */
+  next_cursor: string | null;
 }
 
 export interface FootprintAccountCreate {
@@ -114,6 +116,7 @@ export async function fetchFootprintGraphSnapshot(
     platform?: string;
     kind?: string;
     relation?: string;
+    cursor?: string;
     signal?: AbortSignal;
   } = {},
 ): Promise<FootprintGraphSnapshot> {
@@ -121,6 +124,7 @@ export async function fetchFootprintGraphSnapshot(
   if (options.platform) url.searchParams.set("platform", options.platform);
   if (options.kind) url.searchParams.set("kind", options.kind);
   if (options.relation) url.searchParams.set("relation", options.relation);
+  if (options.cursor) url.searchParams.set("cursor", options.cursor);
 
   const response = await authedFetch(url.toString(), {
     ownerId: options.ownerId,